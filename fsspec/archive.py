@@ -1,7 +1,8 @@
 import operator
+from concurrent.futures import ThreadPoolExecutor
 
 from fsspec import AbstractFileSystem
-from fsspec.utils import tokenize
+from fsspec.utils import merge_offset_ranges, tokenize
 
 
 class AbstractArchiveFileSystem(AbstractFileSystem):
@@ -12,8 +13,21 @@ class AbstractArchiveFileSystem(AbstractFileSystem):
     :class:`~fsspec.implementations.zip.ZipFileSystem`,
     :class:`~fsspec.implementations.libarchive.LibArchiveFileSystem` and
     :class:`~fsspec.implementations.tar.TarFileSystem`.
+
+    When the archive is a file of another filesystem, ``cat`` of several
+    members fetches those whose byte ranges are known from the index with one
+    ``cat_ranges`` call on that filesystem, merging nearby ranges, and
+    decompresses them in a thread pool. Other members are read one at a time
+    through the archive.
     """
 
+    # largest gap between member ranges to read through, when merging them
+    merge_max_gap = 2**16
+    # largest merged range
+    merge_max_block = 2**25
+    # threads decompressing members, None for the ThreadPoolExecutor default
+    extract_workers = None
+
     def __str__(self):
         return f"<Archive-like object {type(self).__name__} at {id(self)}>"
 
@@ -22,6 +36,69 @@ class AbstractArchiveFileSystem(AbstractFileSystem):
     def ukey(self, path):
         return tokenize(path, self.fo, self.protocol)
 
+    def _member_ranges(self, paths):
+        """Byte ranges of members in the archive file, for bulk reading
+
+        Returns {path: (start, end)} for those of ``paths`` which can be read
+        from ``self.of`` by range and passed to ``_decode_member``. The default
+        is none of them.
+        """
+        return {}
+
+    def _decode_member(self, path, data):
+        """Contents of member ``path``, given the bytes of its range"""
+        return data
+
+    def cat(self, path, recursive=False, on_error="raise", **kwargs):
+        paths = self.expand_path(path, recursive=recursive)
+        ranges = self._member_ranges(paths) if len(paths) > 1 else {}
+        if not ranges:
+            return super().cat(path, recursive=recursive, on_error=on_error, **kwargs)
+
+        names = list(ranges)
+        starts = [ranges[name][0] for name in names]
+        ends = [ranges[name][1] for name in names]
+        archives, starts, ends, index = merge_offset_ranges(
+            [self.of.path] * len(names),
+            starts,
+            ends,
+            max_gap=self.merge_max_gap,
+            max_block=self.merge_max_block,
+            return_index=True,
+        )
+        blocks = self.of.fs.cat_ranges(archives, starts, ends, on_error="return")
+
+        def extract(name, where):
+            block, offset = where
+            data = blocks[block]
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                start, end = ranges[name]
+                return self._decode_member(name, data[offset : offset + end - start])
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(self.extract_workers) as pool:
+            extracted = dict(zip(names, pool.map(extract, names, index)))
+
+        out = {}
+        for path in paths:
+            if path in extracted:
+                data = extracted[path]
+            else:
+                try:
+                    data = self.cat_file(path, **kwargs)
+                except Exception as e:
+                    data = e
+            if isinstance(data, Exception):
+                if on_error == "raise":
+                    raise data
+                if on_error == "omit":
+                    continue
+            out[path] = data
+        return out
+
     def _all_dirnames(self, paths):
         """Returns *all* directory names for each path in paths, including intermediate
         ones.
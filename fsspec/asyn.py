@@ -1,5 +1,6 @@
 import asyncio
 import asyncio.events
+import errno
 import functools
 import inspect
 import io
@@ -15,7 +16,7 @@ from .callbacks import DEFAULT_CALLBACK
 from .exceptions import FSTimeoutError
 from .implementations.local import LocalFileSystem, make_path_posix, trailing_sep
 from .spec import AbstractBufferedFile, AbstractFileSystem
-from .utils import glob_translate, is_exception, other_paths
+from .utils import glob_dir_filter, glob_translate, is_exception, other_paths
 
 private = re.compile("_[^_]")
 iothread = [None]  # dedicated fsspec IO thread
@@ -192,6 +193,11 @@ def _get_batch_size(nofiles=False):
     else:
         if "gather_batch_size" in conf:
             return conf["gather_batch_size"]
+    return _default_batch_size(nofiles)
+
+
+def _default_batch_size(nofiles=False):
+    """Batch size when not set in the config"""
     if nofiles:
         return _NOFILES_DEFAULT_BATCH_SIZE
     if resource is None:
@@ -208,6 +214,88 @@ def _get_batch_size(nofiles=False):
         return soft_limit // 8
 
 
+def _is_throttle_error(exc):
+    """Whether an exception suggests the remote is overloaded or rate-limiting"""
+    if isinstance(exc, (asyncio.TimeoutError, FSTimeoutError)):
+        return True
+    if isinstance(exc, OSError) and exc.errno in (errno.EMFILE, errno.EAGAIN):
+        return True
+    status = getattr(exc, "status", None) or getattr(exc, "code", None)
+    return status in (429, 503)
+
+
+class _AdaptiveLimit:
+    """AIMD controller for the number of coroutines in flight
+
+    Starts small and doubles the limit after each window of completions
+    (``limit`` of them) while throughput keeps improving; after the first
+    congestion signal, growth becomes additive (+1 per window). The limit
+    is halved, at most once per window, when a coroutine times out or fails
+    with a throttling error, or when mean latency over a window exceeds
+    ``latency_factor`` times the best seen so far.
+
+    Parameters
+    ----------
+    maximum: int
+        Upper bound on the limit
+    initial: int
+        Starting limit
+    latency_factor: float
+        Tolerated rise in mean latency before backing off
+    """
+
+    def __init__(self, maximum, initial=8, latency_factor=2.0):
+        self.maximum = max(1, maximum)
+        self.limit = min(initial, self.maximum)
+        self.latency_factor = latency_factor
+        self.slow_start = True
+        self.best_latency = None
+        self.last_throughput = 0.0
+        self._reset_window(asyncio.get_running_loop().time())
+
+    def _reset_window(self, now):
+        self.window_start = now
+        self.window_count = 0
+        self.window_latency = 0.0
+        self.backed_off = False
+
+    def record(self, latency, exc=None):
+        """Account for one finished coroutine, adjusting ``limit``"""
+        now = asyncio.get_running_loop().time()
+        if exc is not None and _is_throttle_error(exc):
+            self._decrease(now)
+            return
+        self.window_count += 1
+        self.window_latency += latency
+        if self.window_count < self.limit:
+            return
+        mean_latency = self.window_latency / self.window_count
+        throughput = self.window_count / max(now - self.window_start, 1e-9)
+        if self.best_latency is None or mean_latency < self.best_latency:
+            self.best_latency = mean_latency
+        if mean_latency > self.best_latency * self.latency_factor:
+            self._decrease(now)
+            return
+        if throughput > self.last_throughput:
+            if self.slow_start:
+                self.limit = min(self.limit * 2, self.maximum)
+            else:
+                self.limit = min(self.limit + 1, self.maximum)
+        else:
+            self.slow_start = False
+        self.last_throughput = throughput
+        self._reset_window(now)
+
+    def _decrease(self, now):
+        if self.backed_off:
+            return
+        self.slow_start = False
+        self.limit = max(1, self.limit // 2)
+        self.last_throughput = 0.0
+        self._reset_window(now)
+        self.backed_off = True
+
+
 def running_async() -> bool:
     """Being executed by an event loop?"""
     try:
@@ -230,10 +318,12 @@ async def _run_coros_in_chunks(
     Parameters
     ----------
     coros: list of coroutines to run
-    batch_size: int or None
+    batch_size: int, "adaptive" or None
         Number of coroutines to submit/wait on simultaneously.
         If -1, then it will not be any throttling. If
-        None, it will be inferred from _get_batch_size()
+        None, it will be inferred from _get_batch_size(). If "adaptive",
+        the number in flight is tuned as coroutines complete (see
+        ``_AdaptiveLimit``), up to the limit given by _get_batch_size().
     callback: fsspec.callbacks.Callback instance
         Gets a relative_update when each coroutine completes
     timeout: number or None
@@ -250,19 +340,33 @@ async def _run_coros_in_chunks(
     if batch_size is None:
         batch_size = _get_batch_size(nofiles=nofiles)
 
-    if batch_size == -1:
+    controller = None
+    if batch_size == "adaptive":
+        maximum = _get_batch_size(nofiles=nofiles)
+        if maximum == "adaptive":
+            # configured as adaptive: bounded as if not configured
+            maximum = _default_batch_size(nofiles=nofiles)
+        if maximum == -1:
+            maximum = len(coros)
+        controller = _AdaptiveLimit(maximum)
+    elif batch_size == -1:
         batch_size = len(coros)
     elif batch_size <= 0:
         raise ValueError
 
     async def _run_coro(coro, i):
+        start = asyncio.get_running_loop().time()
+        exc = None
         try:
             return await asyncio.wait_for(coro, timeout=timeout), i
         except Exception as e:
+            exc = e
             if not return_exceptions:
                 raise
             return e, i
         finally:
+            if controller is not None:
+                controller.record(asyncio.get_running_loop().time() - start, exc)
             callback.relative_update(1)
 
     i = 0
@@ -271,6 +375,8 @@ async def _run_coros_in_chunks(
     pending = set()
 
     while pending or i < n:
+        if controller is not None:
+            batch_size = controller.limit
         while len(pending) < batch_size and i < n:
             pending.add(asyncio.ensure_future(_run_coro(coros[i], i)))
             i += 1
@@ -755,6 +861,8 @@ class AsyncFileSystem(AbstractFileSystem):
         files = {}
 
         detail = kwargs.pop("detail", False)
+        # for blocking filesystems only; not passed on to _ls
+        kwargs.pop("workers", None)
         try:
             listing = await self._ls(path, detail=True, **kwargs)
         except (FileNotFoundError, OSError) as e:
@@ -818,22 +926,13 @@ class AsyncFileSystem(AbstractFileSystem):
 
         import re
 
-        seps = (os.path.sep, os.path.altsep) if os.path.altsep else (os.path.sep,)
-        ends_with_sep = path.endswith(seps)  # _strip_protocol strips trailing slash
-        path = self._strip_protocol(path)
-        append_slash_to_dirname = ends_with_sep or path.endswith(
-            tuple(sep + "**" for sep in seps)
-        )
-        idx_star = path.find("*") if path.find("*") >= 0 else len(path)
-        idx_qmark = path.find("?") if path.find("?") >= 0 else len(path)
-        idx_brace = path.find("[") if path.find("[") >= 0 else len(path)
-
-        min_idx = min(idx_star, idx_qmark, idx_brace)
-
         detail = kwargs.pop("detail", False)
         withdirs = kwargs.pop("withdirs", True)
+        path, pattern, root, depth, append_slash_to_dirname = self._glob_plan(
+            path, maxdepth
+        )
 
-        if not has_magic(path):
+        if root is None:
             if await self._exists(path, **kwargs):
                 if not detail:
                     return [path]
@@ -844,39 +943,34 @@ class AsyncFileSystem(AbstractFileSystem):
                     return []  # glob of non-existent returns empty
                 else:
                     return {}
-        elif "/" in path[:min_idx]:
-            first_wildcard_idx = min_idx
-            min_idx = path[:min_idx].rindex("/")
-            root = path[
-                : min_idx + 1
-            ]  # everything up to the last / before the first wildcard
-            prefix = path[
-                min_idx + 1 : first_wildcard_idx
-            ]  # stem between last "/" and first wildcard
-            depth = path[min_idx + 1 :].count("/") + 1
-        else:
-            root = ""
-            prefix = path[:min_idx]  # stem up to the first wildcard
-            depth = path[min_idx + 1 :].count("/") + 1
-
-        if "**" in path:
-            if maxdepth is not None:
-                idx_double_stars = path.find("**")
-                depth_double_stars = path[idx_double_stars:].count("/") + 1
-                depth = depth - depth_double_stars + maxdepth
-            else:
-                depth = None
+
+        # stem between the root and the first wildcard
+        rest = path[len(root) :]
+        prefix = rest[: min(i for i in map(rest.find, "*?[") if i >= 0)]
 
         # Pass the filename stem as prefix= so backends that support it such as
         # gcsfs, s3fs and adlfs can filter server-side up to the first wildcard.
         if prefix:
             kwargs["prefix"] = prefix
-        allpaths = await self._find(
-            root, maxdepth=depth, withdirs=withdirs, detail=True, **kwargs
-        )
+        if type(self)._find is AsyncFileSystem._find:
+            # _find walks the tree; skip directories which cannot match
+            allpaths = {
+                p: info
+                async for p, info in self._iter_find_async(
+                    root,
+                    depth,
+                    withdirs,
+                    True,
+                    may_contain=glob_dir_filter(pattern),
+                    **kwargs,
+                )
+            }
+        else:
+            allpaths = await self._find(
+                root, maxdepth=depth, withdirs=withdirs, detail=True, **kwargs
+            )
 
-        pattern = glob_translate(path + ("/" if ends_with_sep else ""))
-        pattern = re.compile(pattern)
+        pattern = re.compile(glob_translate(pattern))
 
         out = {
             p: info
@@ -893,6 +987,33 @@ class AsyncFileSystem(AbstractFileSystem):
         else:
             return list(out)
 
+    async def _iglob(self, path, maxdepth=None, **kwargs):
+        """Async iterator version of ``iglob``"""
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+
+        import re
+
+        detail = kwargs.pop("detail", False)
+        withdirs = kwargs.pop("withdirs", True)
+        path, pattern, root, depth, append_slash = self._glob_plan(path, maxdepth)
+        if root is None:
+            if await self._exists(path, **kwargs):
+                yield (path, await self._info(path, **kwargs)) if detail else path
+            return
+
+        match = re.compile(glob_translate(pattern)).match
+        async for p, info in self._iter_find_async(
+            root,
+            depth,
+            withdirs,
+            True,
+            may_contain=glob_dir_filter(pattern),
+            **kwargs,
+        ):
+            if match(p + "/" if append_slash and info["type"] == "directory" else p):
+                yield (p, info) if detail else p
+
     async def _du(self, path, total=True, maxdepth=None, **kwargs):
         sizes = {}
         # async for?
@@ -929,6 +1050,39 @@ class AsyncFileSystem(AbstractFileSystem):
         else:
             return {name: out[name] for name in names}
 
+    async def _ifind(self, path, maxdepth=None, withdirs=False, **kwargs):
+        """Async iterator version of ``ifind``"""
+        detail = kwargs.pop("detail", False)
+        async for out in self._iter_find_async(
+            path, maxdepth, withdirs, detail, **kwargs
+        ):
+            yield out
+
+    async def _iter_find_async(
+        self, path, maxdepth, withdirs, detail, may_contain=None, **kwargs
+    ):
+        path = self._strip_protocol(path)
+        found = False
+        if withdirs and path != "" and await self._isdir(path):
+            found = True
+            yield (path, await self._info(path)) if detail else path
+
+        async for _, dirs, files in self._walk(path, maxdepth, detail=True, **kwargs):
+            entries = list(files.values())
+            if withdirs:
+                entries.extend(dirs.values())
+            if may_contain is not None:
+                for name, info in list(dirs.items()):
+                    if not may_contain(info["name"]):
+                        del dirs[name]
+            for info in entries:
+                found = True
+                yield (info["name"], info) if detail else info["name"]
+        if not found and await self._isfile(path):
+            # walk works on directories, but find should also return [path]
+            # when path happens to be a file
+            yield (path, {}) if detail else path
+
     async def _expand_path(
         self, path, recursive=False, maxdepth=None, assume_literal=False
     ):
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
 import collections
-import functools
+import itertools
 import logging
 import math
 import os
 import threading
 from collections import OrderedDict
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator
 from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import groupby
 from operator import itemgetter
@@ -31,6 +31,14 @@ Fetcher = Callable[[int, int], bytes]  # Maps (start, end) to bytes
 MultiFetcher = Callable[[list[int, int]], bytes]  # Maps [(start, end)] to bytes
 
 
+def _copy_into(out: memoryview, data: Any, start: int, end: int) -> int:
+    """Copy ``data[start:end]`` to the start of ``out`` without slicing ``data``"""
+    with memoryview(data) as view:
+        part = view[start:end]
+        out[: part.nbytes] = part
+        return part.nbytes
+
+
 class BaseCache:
     """Pass-though cache: doesn't keep anything, calls every time
 
@@ -68,6 +76,105 @@ class BaseCache:
             return b""
         return self.fetcher(start, stop)
 
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        """Copy the bytes from ``start`` to ``end`` into ``out``
+
+        ``out`` is a writable, unsigned byte memoryview of at least
+        ``end - start`` bytes. Returns the number of bytes written, which is
+        fewer than requested at the end of the file. Caches which hold the
+        data override this to copy straight from their storage, rather than
+        making an intermediate bytes object.
+        """
+        data = self._fetch(start, end)
+        out[: len(data)] = data
+        return len(data)
+
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        """Get several byte ranges at once
+
+        Overlapping and adjacent ranges are merged, and everything is fetched
+        with one call to ``multi_fetcher``, which may process the ranges
+        concurrently. The merged ranges are then offered to ``_keep``, for
+        later reads. Caches which hold blocks override this to fetch only
+        the blocks they are missing, and to keep them for later reads.
+        """
+        from .utils import merge_offset_ranges
+
+        ranges = [self._clamp(start, end) for start, end in ranges]
+        wanted = [(start, end) for start, end in ranges if start < end]
+        if not wanted:
+            return [b"" for _ in ranges]
+        _, starts, ends, index = merge_offset_ranges(
+            [""] * len(wanted),
+            [start for start, _ in wanted],
+            [end for _, end in wanted],
+            return_index=True,
+        )
+        self.miss_count += len(starts)
+        self.total_requested_bytes += sum(e - s for s, e in zip(starts, ends))
+        data = multi_fetcher(list(zip(starts, ends)))
+        self._keep(list(zip(starts, ends)), data)
+        parts = iter(index)
+        out = []
+        for start, end in ranges:
+            if start < end:
+                block, offset = next(parts)
+                out.append(data[block][offset : offset + end - start])
+            else:
+                out.append(b"")
+        return out
+
+    def _keep(self, spans: list[tuple[int, int]], data: list[bytes]) -> None:
+        """Store what ``_fetch_ranges`` fetched, as far as this cache can
+
+        ``spans`` are sorted and do not overlap. This pass-through cache
+        keeps nothing, so later reads of the same bytes fetch them again.
+        """
+
+    def _clamp(self, start: int | None, end: int | None) -> tuple[int, int]:
+        start = 0 if start is None else max(start, 0)
+        end = self.size if end is None else min(end, self.size)
+        return start, end
+
+    def _fetch_block_runs(
+        self, blocks: Iterable[int], multi_fetcher: MultiFetcher
+    ) -> list[tuple[tuple[int, ...], int, bytes]]:
+        """Fetch the given block numbers, with one range per run of
+        consecutive blocks, all in one call to ``multi_fetcher``
+
+        Returns, for each run, the block numbers, the offset of the start of
+        the run and the data.
+        """
+        runs = [
+            tuple(map(itemgetter(1), run))
+            for _, run in groupby(enumerate(sorted(blocks)), key=lambda x: x[0] - x[1])
+        ]
+        if not runs:
+            return []
+        spans = [
+            (run[0] * self.blocksize, min((run[-1] + 1) * self.blocksize, self.size))
+            for run in runs
+        ]
+        self.miss_count += sum(len(run) for run in runs)
+        self.total_requested_bytes += sum(end - start for start, end in spans)
+        data = multi_fetcher(spans)
+        return [(run, start, d) for run, (start, _), d in zip(runs, spans, data)]
+
+    def _blocks_for(self, ranges: list[tuple[int, int]]) -> set[int]:
+        """Numbers of the blocks a block-based ``_fetch`` uses for these ranges
+
+        As in ``_fetch``, this includes the block starting at ``end``.
+        """
+        out: set[int] = set()
+        for start, end in ranges:
+            start, end = self._clamp(start, end)
+            if start < end:
+                last = min(end // self.blocksize, (self.size - 1) // self.blocksize)
+                out.update(range(start // self.blocksize, last + 1))
+        return out
+
     def _reset_stats(self) -> None:
         """Reset hit and miss counts for a more ganular report e.g. by file."""
         self.hit_count = 0
@@ -170,6 +277,18 @@ class MMapCache(BaseCache):
             end = self.size
         if start >= self.size or start >= end:
             return b""
+        self._fetch_blocks(start, end)
+        return self.cache[start:end]
+
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        start, end = self._clamp(start, end)
+        if start >= end:
+            return 0
+        self._fetch_blocks(start, end)
+        return _copy_into(out, self.cache, start, end)
+
+    def _fetch_blocks(self, start: int, end: int) -> None:
+        """Make sure all the blocks for the given range are in the cache"""
         start_block = start // self.blocksize
         end_block = end // self.blocksize
         block_range = range(start_block, end_block + 1)
@@ -209,7 +328,7 @@ class MMapCache(BaseCache):
             self.miss_count += len(_blocks)
 
         if not ranges:
-            return self.cache[start:end]
+            return
 
         if self.multi_fetcher:
             logger.debug(f"MMap get blocks {ranges}")
@@ -222,7 +341,17 @@ class MMapCache(BaseCache):
                 logger.debug(f"MMap get block ({sstart}-{send}")
                 self.cache[sstart:send] = self.fetcher(sstart, send)
 
-        return self.cache[start:end]
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        ranges = [self._clamp(start, end) for start, end in ranges]
+        need = self._blocks_for(ranges) - self.blocks
+        for run, start, data in self._fetch_block_runs(
+            need, self.multi_fetcher or multi_fetcher
+        ):
+            self.cache[start : start + len(data)] = data
+            self.blocks.update(run)
+        return [self._fetch(start, end) for start, end in ranges]
 
     def __getstate__(self) -> dict[str, Any]:
         state = self.__dict__.copy()
@@ -281,6 +410,13 @@ class ReadAheadCache(BaseCache):
         self.end = self.start + len(self.cache)
         return part + self.cache[:l]
 
+    def _keep(self, spans: list[tuple[int, int]], data: list[bytes]) -> None:
+        # only one contiguous block is held: the last, as reading is
+        # expected to carry on from there
+        self.cache = data[-1]
+        self.start = spans[-1][0]
+        self.end = self.start + len(self.cache)
+
 
 class FirstChunkCache(BaseCache):
     """Caches the first block of a file only
@@ -329,6 +465,31 @@ class FirstChunkCache(BaseCache):
             self.total_requested_bytes += end - start
             return self.fetcher(start, end)
 
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        ranges = [self._clamp(start, end) for start, end in ranges]
+        if self.cache is None:
+            if any(start < min(end, self.blocksize) for start, end in ranges):
+                # the whole first block is fetched with the rest, and kept
+                out = super()._fetch_ranges(
+                    [(0, self.blocksize), *ranges], multi_fetcher
+                )
+                self.cache = out.pop(0)
+                return out
+            return super()._fetch_ranges(ranges, multi_fetcher)
+        inside = [end <= self.blocksize for _, end in ranges]
+        self.hit_count += sum(inside)
+        rest = iter(
+            super()._fetch_ranges(
+                [r for r, i in zip(ranges, inside) if not i], multi_fetcher
+            )
+        )
+        return [
+            self.cache[start:end] if i else next(rest)
+            for (start, end), i in zip(ranges, inside)
+        ]
+
 
 class BlockCache(BaseCache):
     """
@@ -361,7 +522,7 @@ class BlockCache(BaseCache):
         super().__init__(blocksize, fetcher, size)
         self.nblocks = math.ceil(size / blocksize)
         self.maxblocks = maxblocks
-        self._fetch_block_cached = functools.lru_cache(maxblocks)(self._fetch_block)
+        self._fetch_block_cached = UpdatableLRU(self._fetch_block, maxblocks)
 
     def cache_info(self):
         """
@@ -381,9 +542,12 @@ class BlockCache(BaseCache):
 
     def __setstate__(self, state: dict[str, Any]) -> None:
         self.__dict__.update(state)
-        self._fetch_block_cached = functools.lru_cache(state["maxblocks"])(
-            self._fetch_block
-        )
+        self._fetch_block_cached = UpdatableLRU(self._fetch_block, state["maxblocks"])
+
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        return _fetch_block_runs_into_lru(self, ranges, multi_fetcher)
 
     def _fetch(self, start: int | None, end: int | None) -> bytes:
         if start is None:
@@ -397,6 +561,28 @@ class BlockCache(BaseCache):
             start, end, start // self.blocksize, (end - 1) // self.blocksize
         )
 
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        start, end = self._clamp(start, end)
+        if start >= end:
+            return 0
+        n = 0
+        blocks = self._blocks(start // self.blocksize, (end - 1) // self.blocksize)
+        for block, offset in blocks:
+            n += _copy_into(out[n:], block, start + n - offset, end - offset)
+        return n
+
+    def _blocks(
+        self, start_block_number: int, end_block_number: int
+    ) -> Iterator[tuple[bytes, int]]:
+        """The given blocks, inclusive, with their offsets in the file
+
+        Shared by ``_fetch`` and ``_fetch_into``, so that both count one hit per
+        read and one miss per block fetched.
+        """
+        self.hit_count += 1
+        for block_number in range(start_block_number, end_block_number + 1):
+            yield self._fetch_block_cached(block_number), block_number * self.blocksize
+
     def _fetch_block(self, block_number: int) -> bytes:
         """
         Fetch the block of data for `block_number`.
@@ -428,34 +614,15 @@ class BlockCache(BaseCache):
         start_block_number, end_block_number : int
             The start and end block numbers.
         """
-        start_pos = start % self.blocksize
-        end_pos = end % self.blocksize
-        if end_pos == 0:
-            end_pos = self.blocksize
-
-        self.hit_count += 1
-        if start_block_number == end_block_number:
-            block: bytes = self._fetch_block_cached(start_block_number)
-            return block[start_pos:end_pos]
-
-        else:
-            # read from the initial
-            out = [self._fetch_block_cached(start_block_number)[start_pos:]]
-
-            # intermediate blocks
-            # Note: it'd be nice to combine these into one big request. However
-            # that doesn't play nicely with our LRU cache.
-            out.extend(
-                map(
-                    self._fetch_block_cached,
-                    range(start_block_number + 1, end_block_number),
-                )
-            )
-
-            # final block
-            out.append(self._fetch_block_cached(end_block_number)[:end_pos])
-
-            return b"".join(out)
+        # Note: it'd be nice to combine the blocks into one big request.
+        # However that doesn't play nicely with our LRU cache.
+        out = [
+            block[max(start - offset, 0) : end - offset]
+            for block, offset in self._blocks(start_block_number, end_block_number)
+        ]
+        if len(out) == 1:
+            return out[0]
+        return b"".join(out)
 
 
 class BytesCache(BaseCache):
@@ -555,6 +722,25 @@ class BytesCache(BaseCache):
                 self.cache = self.cache[self.blocksize * num :]
         return out
 
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        end = min(end, self.size)
+        if (
+            self.start is not None
+            and self.end is not None
+            and self.start <= start < end <= self.end
+        ):
+            # cache hit: copy straight out of the buffer
+            self.hit_count += 1
+            return _copy_into(out, self.cache, start - self.start, end - self.start)
+        return super()._fetch_into(start, end, out)
+
+    def _keep(self, spans: list[tuple[int, int]], data: list[bytes]) -> None:
+        # only one contiguous buffer is held: the last, as reading is
+        # expected to carry on from there
+        self.cache = data[-1]
+        self.start = spans[-1][0]
+        self.end = self.start + len(self.cache)
+
     def __len__(self) -> int:
         return len(self.cache)
 
@@ -582,6 +768,15 @@ class AllBytes(BaseCache):
         self.hit_count += 1
         return self.data[start:stop]
 
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        self.hit_count += 1
+        return _copy_into(out, self.data, start, end)
+
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        return [self._fetch(start, end) for start, end in ranges]
+
 
 class KnownPartsOfAFile(BaseCache):
     """
@@ -700,6 +895,23 @@ class KnownPartsOfAFile(BaseCache):
             return out
         raise ValueError
 
+    def _fetch_into(self, start: int, end: int, out: memoryview) -> int:
+        for loc0, loc1 in self.data:
+            if loc0 <= start < loc1 and end <= loc1:
+                # entirely within one block: copy from it directly
+                self.total_requested_bytes += end - start
+                self.hit_count += 1
+                return _copy_into(
+                    out, self.data[(loc0, loc1)], start - loc0, end - loc0
+                )
+        return super()._fetch_into(start, end, out)
+
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        # all data is known up front; there is nothing to fetch
+        return [self._fetch(start, end) for start, end in ranges]
+
 
 class UpdatableLRU(Generic[P, T]):
     """
@@ -761,6 +973,45 @@ class UpdatableLRU(Generic[P, T]):
             )
 
 
+def _fetch_block_runs_into_lru(
+    cache: BlockCache | BackgroundBlockCache,
+    ranges: list[tuple[int, int]],
+    multi_fetcher: MultiFetcher,
+) -> list[bytes]:
+    """``_fetch_ranges`` for a block cache with an LRU of blocks
+
+    The blocks not already held are fetched in one call and added to the LRU.
+    If more blocks are needed than it can hold, only the last ``maxblocks``
+    stay there, but all are used for these ranges.
+    """
+    lru = cache._fetch_block_cached
+    blocks = {}
+    need = []
+    for block in sorted(cache._blocks_for(ranges)):
+        if lru.is_key_cached(block):
+            cache.hit_count += 1
+            blocks[block] = lru(block)
+        else:
+            need.append(block)
+    for run, start, data in cache._fetch_block_runs(need, multi_fetcher):
+        for block in run:
+            offset = block * cache.blocksize - start
+            blocks[block] = data[offset : offset + cache.blocksize]
+            lru.add_key(blocks[block], block)
+    out = []
+    for start, end in ranges:
+        start, end = cache._clamp(start, end)
+        parts = []
+        if start < end:
+            for block in range(
+                start // cache.blocksize, (end - 1) // cache.blocksize + 1
+            ):
+                offset = block * cache.blocksize
+                parts.append(blocks[block][max(start - offset, 0) : end - offset])
+        out.append(b"".join(parts))
+    return out
+
+
 class BackgroundBlockCache(BaseCache):
     """
     Cache holding memory as a set of blocks with pre-loading of
@@ -849,6 +1100,11 @@ class BackgroundBlockCache(BaseCache):
         self._fetch_future_lock = threading.Lock()
         self._closed = False
 
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        return _fetch_block_runs_into_lru(self, ranges, multi_fetcher)
+
     def _fetch(self, start: int | None, end: int | None) -> bytes:
         if start is None:
             start = 0
@@ -986,6 +1242,239 @@ class BackgroundBlockCache(BaseCache):
             return b"".join(out)
 
 
+class SharedBlockStore:
+    """Memory-bounded, thread-safe LRU store of blocks, shared between caches
+
+    Used by ``SharedBlockCache``. Concurrent requests for a block which is
+    not yet stored result in a single fetch, whose result (or exception) is
+    handed to all of the requesters.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Total size of blocks to keep; the least recently used are dropped
+        beyond this.
+    """
+
+    class CacheInfo(NamedTuple):
+        hits: int
+        misses: int
+        maxbytes: int
+        currbytes: int
+        currsize: int
+
+    def __init__(self, max_bytes: int = 256 * 2**20) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._blocks: OrderedDict[Any, bytes] = collections.OrderedDict()
+        self._pending: dict[Any, Future[bytes]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Any, fetch: Callable[[], bytes]) -> tuple[bytes, bool]:
+        """Return the block for ``key``, calling ``fetch`` if it is not known
+
+        The second output is False if ``fetch`` was called by this request.
+        """
+        with self._lock:
+            if key in self._blocks:
+                self._blocks.move_to_end(key)
+                self._hits += 1
+                return self._blocks[key], True
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = Future()
+                self._misses += 1
+                owner = True
+            else:
+                self._hits += 1
+                owner = False
+        if not owner:
+            return future.result(), True
+
+        try:
+            data = fetch()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._pending[key]
+            self._add(key, data)
+        future.set_result(data)
+        return data, False
+
+    def __contains__(self, key: Any) -> bool:
+        with self._lock:
+            return key in self._blocks
+
+    def put(self, key: Any, data: bytes) -> None:
+        """Store a block fetched elsewhere"""
+        with self._lock:
+            self._add(key, data)
+
+    def _add(self, key: Any, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._blocks.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(old)
+        self._blocks[key] = data
+        self.nbytes += len(data)
+        while self.nbytes > self.max_bytes:
+            _, old = self._blocks.popitem(last=False)
+            self.nbytes -= len(old)
+
+    def clear(self) -> None:
+        """Drop all stored blocks"""
+        with self._lock:
+            self._blocks.clear()
+            self.nbytes = 0
+
+    def cache_info(self) -> SharedBlockStore.CacheInfo:
+        with self._lock:
+            return self.CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxbytes=self.max_bytes,
+                currbytes=self.nbytes,
+                currsize=len(self._blocks),
+            )
+
+
+# process-wide store used by SharedBlockCache unless another is given
+shared_block_store = SharedBlockStore()
+_shared_keys = itertools.count()
+
+
+class SharedBlockCache(BaseCache):
+    """
+    Cache holding blocks in a process-wide store, shared between files.
+
+    Like ``BlockCache``, requests are only ever made ``blocksize`` at a
+    time, but the blocks are kept in ``shared_block_store`` (or the given
+    ``store``), so that every file handle opened on the same remote object,
+    from any thread, reuses them; simultaneous requests for the same block
+    are only fetched once. Memory is bounded by the store's ``max_bytes``
+    rather than per file.
+
+    Parameters
+    ----------
+    blocksize : int
+        The number of bytes to store in each block.
+    fetcher : Callable
+    size : int
+        The total size of the file being cached.
+    key : hashable, optional
+        Identifies the remote object. By default, if the fetcher is a method
+        of a file with ``fs`` and ``path`` attributes (such as
+        ``AbstractBufferedFile``), the filesystem's token, the path and the
+        file's details (or else its size) are used. Otherwise, blocks are not
+        shared with any other cache instance.
+    store : SharedBlockStore, optional
+        Where to keep blocks, if not the process-wide default.
+    """
+
+    name: ClassVar[str] = "shared"
+
+    def __init__(
+        self,
+        blocksize: int,
+        fetcher: Fetcher,
+        size: int,
+        key: Any = None,
+        store: SharedBlockStore | None = None,
+    ) -> None:
+        super().__init__(blocksize, fetcher, size)
+        self.nblocks = math.ceil(size / blocksize)
+        self.key = self._default_key(fetcher, size) if key is None else key
+        self.store = store
+
+    @staticmethod
+    def _default_key(fetcher: Fetcher, size: int) -> Any:
+        from .utils import tokenize
+
+        f = getattr(fetcher, "__self__", None)
+        fs, path = getattr(f, "fs", None), getattr(f, "path", None)
+        if fs is None or path is None:
+            return ("unshared", next(_shared_keys))
+        details = getattr(f, "_details", None)
+        version = size if details is None else tokenize(details)
+        return fs._fs_token, path, version
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        if state["store"] is shared_block_store:
+            state["store"] = None
+        return state
+
+    def cache_info(self) -> SharedBlockStore.CacheInfo:
+        """Statistics of the shared store (not only of this file)"""
+        return (self.store or shared_block_store).cache_info()
+
+    def _fetch(
+        self,
+        start: int | None,
+        end: int | None,
+        fetched: dict[int, bytes] | None = None,
+    ) -> bytes:
+        if start is None:
+            start = 0
+        if end is None or end > self.size:
+            end = self.size
+        if start >= self.size or start >= end:
+            return b""
+        first, last = start // self.blocksize, (end - 1) // self.blocksize
+        fetched = fetched or {}
+        out = [
+            fetched[i] if i in fetched else self._fetch_block(i)
+            for i in range(first, last + 1)
+        ]
+        offset = first * self.blocksize
+        if len(out) == 1:
+            return out[0][start - offset : end - offset]
+        out[0] = out[0][start - offset :]
+        out[-1] = out[-1][: end - last * self.blocksize]
+        return b"".join(out)
+
+    def _fetch_block(self, block_number: int) -> bytes:
+        start = block_number * self.blocksize
+        end = min(start + self.blocksize, self.size)
+
+        def fetch():
+            logger.info("SharedBlockCache fetching block %d", block_number)
+            return self.fetcher(start, end)
+
+        store = self.store or shared_block_store
+        data, hit = store.get((self.key, self.blocksize, block_number), fetch)
+        if hit:
+            self.hit_count += 1
+        else:
+            self.miss_count += 1
+            self.total_requested_bytes += end - start
+        return data
+
+    def _fetch_ranges(
+        self, ranges: list[tuple[int, int]], multi_fetcher: MultiFetcher
+    ) -> list[bytes]:
+        store = self.store or shared_block_store
+        need = [
+            block
+            for block in self._blocks_for(ranges)
+            if (self.key, self.blocksize, block) not in store
+        ]
+        # keep the new blocks here too, in case the store cannot hold them all
+        fetched = {}
+        for run, start, data in self._fetch_block_runs(need, multi_fetcher):
+            for block in run:
+                offset = block * self.blocksize - start
+                fetched[block] = data[offset : offset + self.blocksize]
+                store.put((self.key, self.blocksize, block), fetched[block])
+        return [self._fetch(start, end, fetched) for start, end in ranges]
+
+
 caches: dict[str | None, type[BaseCache]] = {
     # one custom case
     None: BaseCache,
@@ -1021,5 +1510,6 @@ for c in (
     AllBytes,
     KnownPartsOfAFile,
     BackgroundBlockCache,
+    SharedBlockCache,
 ):
     register_cache(c)
@@ -1,6 +1,52 @@
+import bisect
+import sys
 import time
+from collections import OrderedDict
 from collections.abc import MutableMapping
-from functools import lru_cache
+
+
+def _entry_size(entry):
+    """Rough memory footprint of one listing entry, in bytes"""
+    return sys.getsizeof(entry) + sum(
+        sys.getsizeof(v) for v in entry.values() if not isinstance(v, (bool, int))
+    )
+
+
+class _CompactListing:
+    """A listing stored as tuples of values, sharing tuples of field names
+
+    Entries with the same set of keys, usually all of them, share one tuple
+    of field names, so the per-entry cost is one tuple rather than a dict.
+    """
+
+    __slots__ = ("rows", "size")
+
+    def __init__(self, listing):
+        fields = {}
+        rows = []
+        size = sys.getsizeof(self)
+        for entry in listing:
+            keys = tuple(entry)
+            if keys not in fields:
+                fields[keys] = keys
+                size += sys.getsizeof(keys)
+            row = (fields[keys], *entry.values())
+            rows.append(row)
+            size += sys.getsizeof(row) + sum(
+                sys.getsizeof(v) for v in row[1:] if not isinstance(v, (bool, int))
+            )
+        self.rows = rows
+        self.size = size + sys.getsizeof(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @staticmethod
+    def entry(row):
+        return dict(zip(row[0], row[1:]))
+
+    def entries(self):
+        return [dict(zip(row[0], row[1:])) for row in self.rows]
 
 
 class DirCache(MutableMapping):
@@ -20,8 +66,14 @@ class DirCache(MutableMapping):
          "path1": [...]
         }
 
-    Parameters to this class control listing expiry or indeed turn
-    caching off
+    Parameters to this class control listing expiry, how many listings or
+    how much memory may be used, or indeed turn caching off
+
+    The paths are also kept sorted, so that all listings at or below a path
+    can be found (and invalidated) together, and each listing is indexed by
+    name when first searched, so that looking up one entry of a large
+    directory does not scan it. A listing changed in place must be stored
+    again for ``lookup`` to see the change.
     """
 
     def __init__(
@@ -29,6 +81,8 @@ class DirCache(MutableMapping):
         use_listings_cache=True,
         listings_expiry_time=None,
         max_paths=None,
+        max_listings_size=None,
+        compact_listings=False,
         **kwargs,
     ):
         """
@@ -42,49 +96,206 @@ class DirCache(MutableMapping):
             Time in seconds that a listing is considered valid. If None,
             listings do not expire.
         max_paths: int (optional)
-            The number of most recent listings that are considered valid; 'recent'
-            refers to when the entry was set.
+            The number of most recently used listings to keep; 'used' means
+            set or read.
+        max_listings_size: int (optional)
+            Approximate number of bytes of memory that listings may take up,
+            after which the least recently used are dropped. A listing
+            bigger than this on its own is not stored at all.
+        compact_listings: bool
+            If True, store each listing as tuples rather than dicts, which
+            saves most of the per-entry overhead, but means that every read
+            builds new dicts, and that changing the returned list in place
+            does not change the cache.
         """
-        self._cache = {}
+        self._cache = OrderedDict()  # least recently used first
         self._times = {}
-        if max_paths:
-            self._q = lru_cache(max_paths + 1)(lambda key: self._cache.pop(key, None))
+        self._sizes = {}
+        self._total = 0
+        self._keys = []  # sorted
+        self._index = {}  # path -> (listing, {name: [entries]})
         self.use_listings_cache = use_listings_cache
         self.listings_expiry_time = listings_expiry_time
         self.max_paths = max_paths
+        self.max_listings_size = max_listings_size
+        self.compact_listings = compact_listings
+
+    def _expired(self, key):
+        return (
+            self.listings_expiry_time is not None
+            and self._times.get(key, 0) - time.time() < -self.listings_expiry_time
+        )
+
+    def _get(self, key):
+        """The listing of ``key`` as stored, marking it as recently used"""
+        if self._expired(key):
+            self._drop(key)
+        value = self._cache[key]  # maybe raises KeyError
+        self._cache.move_to_end(key)
+        return value
+
+    def _drop(self, key):
+        if self._cache.pop(key, None) is None:
+            return
+        self._times.pop(key, None)
+        self._index.pop(key, None)
+        self._total -= self._sizes.pop(key, 0)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
 
     def __getitem__(self, item):
-        if self.listings_expiry_time is not None:
-            if self._times.get(item, 0) - time.time() < -self.listings_expiry_time:
-                del self._cache[item]
-        if self.max_paths:
-            self._q(item)
-        return self._cache[item]  # maybe raises KeyError
+        value = self._get(item)
+        if isinstance(value, _CompactListing):
+            return value.entries()
+        return value
 
     def clear(self):
         self._cache.clear()
+        self._times.clear()
+        self._sizes.clear()
+        self._total = 0
+        self._keys.clear()
+        self._index.clear()
+
+    @property
+    def nbytes(self):
+        """Approximate memory taken up by the stored listings
+
+        Only measured if ``max_listings_size`` or ``compact_listings`` is set.
+        """
+        return self._total
 
     def __len__(self):
         return len(self._cache)
 
     def __contains__(self, item):
-        try:
-            self[item]
-            return True
-        except KeyError:
-            return False
+        # does not count as a use
+        return item in self._cache and not self._expired(item)
 
     def __setitem__(self, key, value):
         if not self.use_listings_cache:
             return
-        if self.max_paths:
-            self._q(key)
+        if self.compact_listings:
+            value = _CompactListing(value)
+            size = value.size
+        elif self.max_listings_size is not None:
+            size = sys.getsizeof(value) + sum(_entry_size(e) for e in value)
+        else:
+            size = 0
+        self._drop(key)
+        if self.max_listings_size is not None and size > self.max_listings_size:
+            return
         self._cache[key] = value
+        self._sizes[key] = size
+        self._total += size
+        bisect.insort(self._keys, key)
         if self.listings_expiry_time is not None:
             self._times[key] = time.time()
+        self._evict()
+
+    def _evict(self):
+        while (self.max_paths and len(self._cache) > self.max_paths) or (
+            self.max_listings_size is not None and self._total > self.max_listings_size
+        ):
+            self._drop(next(iter(self._cache)))
 
     def __delitem__(self, key):
-        del self._cache[key]
+        if key not in self._cache:
+            raise KeyError(key)
+        self._drop(key)
+
+    def lookup(self, parent, path):
+        """Entries for ``path`` in the cached listing of directory ``parent``
+
+        As well as an exact match of name, a directory called
+        ``path.rstrip("/")`` matches.
+
+        Raises KeyError if there is no valid listing for ``parent``, and
+        FileNotFoundError if there is but ``path`` is not in it.
+        """
+        listing = self._get(parent)
+        index = self._index.get(parent)
+        if index is None or index[0] is not listing:
+            # storing a listing drops its index, so this one is current
+            names = {}
+            if isinstance(listing, _CompactListing):
+                # index the rows, and only make dicts of those asked for
+                for row in listing.rows:
+                    names.setdefault(row[1 + row[0].index("name")], []).append(row)
+            else:
+                for entry in listing:
+                    names.setdefault(entry["name"], []).append(entry)
+            index = self._index[parent] = (listing, names)
+        names = index[1]
+        out = names.get(path)
+        if not out:
+            out = names.get(path.rstrip("/"), [])
+            if isinstance(listing, _CompactListing):
+                out = [listing.entry(row) for row in out]
+            out = [e for e in out if e["type"] == "directory"]
+            if not out:
+                raise FileNotFoundError(path)
+            return out
+        if isinstance(listing, _CompactListing):
+            out = [listing.entry(row) for row in out]
+        return out
+
+    def invalidate(self, path=None):
+        """Drop the listings of ``path`` and everything below it
+
+        If ``path`` is None, drop all listings.
+        """
+        if path is None:
+            self.clear()
+            return
+        path = path.rstrip("/")
+        if not path:
+            # everything is below the root
+            self.clear()
+            return
+        keys = self._keys
+        # the path itself, and then the contiguous range of keys starting
+        # with path + "/" (but not, e.g., "path-other", which sorts between)
+        lo, hi = (bisect.bisect_left(keys, path + c) for c in "/0")
+        for key in [path] + keys[lo:hi]:
+            self._drop(key)
+
+    def update_tree(self, path, entries, parent):
+        """Store the listings of ``path`` and all directories below it
+
+        ``entries`` is the complete, recursive listing of details below
+        ``path``, such as the values of ``find(path, withdirs=True,
+        detail=True)``, and ``parent`` gives the parent of a path, such as a
+        filesystem's ``_parent``. Every directory, including ones found to
+        be empty, gets its own listing, so that later ``ls`` and ``info``
+        calls within the tree can be answered from cache.
+        """
+        path = path.rstrip("/")
+        entries = list(entries)
+        listings = {path: []}
+        for entry in entries:
+            name = entry["name"].rstrip("/")
+            if name == path:
+                continue
+            if entry["type"] == "directory":
+                listings.setdefault(name, [])
+            listings.setdefault(parent(name).rstrip("/"), []).append(entry)
+        # directories only implied by deeper paths
+        dirs = {e["name"].rstrip("/") for e in entries if e["type"] == "directory"}
+        for name in list(listings):
+            while name != path and name not in dirs:
+                dirs.add(name)
+                up = parent(name).rstrip("/")
+                if up == name:
+                    # not below path after all
+                    break
+                listings.setdefault(up, []).append(
+                    {"name": name, "type": "directory", "size": 0}
+                )
+                name = up
+        for key, listing in listings.items():
+            self[key] = listing
 
     def __iter__(self):
         entries = list(self._cache)
@@ -94,5 +305,11 @@ class DirCache(MutableMapping):
     def __reduce__(self):
         return (
             DirCache,
-            (self.use_listings_cache, self.listings_expiry_time, self.max_paths),
+            (
+                self.use_listings_cache,
+                self.listings_expiry_time,
+                self.max_paths,
+                self.max_listings_size,
+                self.compact_listings,
+            ),
         )
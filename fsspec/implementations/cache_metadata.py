@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import contextlib
 import os
+import pathlib
+import sqlite3
 import time
 from typing import TYPE_CHECKING
 
@@ -45,6 +48,8 @@ class CacheMetadata:
 
         self._storage = storage
         self.cached_files: list[Detail] = [{}]
+        # paths popped from the writable cache since the last save
+        self._removed: set[str] = set()
 
     def _load(self, fn: str) -> Detail:
         """Low-level function to load metadata from specific file"""
@@ -169,6 +174,7 @@ class CacheMetadata:
         _, fn = details
         if fn.startswith(self._storage[-1]):
             self.cached_files[-1].pop(path)
+            self._removed.add(path)
             self.save()
         else:
             raise PermissionError(
@@ -184,6 +190,8 @@ class CacheMetadata:
 
             if os.path.exists(fn):
                 cached_files = self._load(fn)
+                for k in self._removed:
+                    cached_files.pop(k, None)
                 for k, c in cached_files.items():
                     if k in cache:
                         if c["blocks"] is True or cache[k]["blocks"] is True:
@@ -197,6 +205,8 @@ class CacheMetadata:
                             blocks.update(c["blocks"])
                             c["blocks"] = blocks
                         c["time"] = max(c["time"], cache[k]["time"])
+                        if "accessed" in cache[k]:
+                            c["accessed"] = max(_accessed(c), cache[k]["accessed"])
                         c["uid"] = cache[k]["uid"]
 
                 # Files can be added to cache after it was written once
@@ -211,7 +221,247 @@ class CacheMetadata:
                     c["blocks"] = list(c["blocks"])
             self._save(cache, fn)
             self.cached_files[-1] = cached_files
+        self._removed.clear()
 
     def update_file(self, path: str, detail: Detail) -> None:
         """Update metadata for specific file in memory, do not save"""
         self.cached_files[-1][path] = detail
+
+    def touch_file(self, path: str) -> None:
+        """Record an access of a file in the writable cache, do not save"""
+        detail = self.cached_files[-1].get(path)
+        if detail is not None:
+            detail["accessed"] = time.time()
+
+    def _stored_size(self, detail: Detail) -> int:
+        """Estimate bytes held locally for a file in the writable cache"""
+        size = detail.get("size")
+        if size is None:
+            fn = os.path.join(self._storage[-1], detail["fn"])
+            size = os.path.getsize(fn) if os.path.exists(fn) else 0
+            if detail["blocks"] is True:
+                detail["size"] = size
+        if detail["blocks"] is True:
+            return size
+        return min(size, len(detail["blocks"]) * detail.get("blocksize", 0))
+
+    def usage(self) -> list[tuple[str, int]]:
+        """Files in the writable cache with their estimated local size,
+        least recently accessed first"""
+        entries = sorted(self.cached_files[-1].items(), key=lambda x: _accessed(x[1]))
+        return [(path, self._stored_size(detail)) for path, detail in entries]
+
+    def pop_files(self, paths: list[str]) -> list[str]:
+        """Remove metadata of several files in the writable cache, and save.
+
+        Returns the filenames of the cached files, which the caller is
+        responsible for deleting.
+        """
+        fns = []
+        for path in paths:
+            detail = self.cached_files[-1].pop(path, None)
+            if detail is not None:
+                fns.append(os.path.join(self._storage[-1], detail["fn"]))
+                self._removed.add(path)
+        if fns:
+            self.save()
+        return fns
+
+
+def _accessed(detail: Detail) -> float:
+    return detail.get("accessed", detail["time"])
+
+
+class SQLiteCacheMetadata(CacheMetadata):
+    """Cache metadata stored in an SQLite database per storage directory.
+
+    Rather than loading and rewriting every entry, lookups query the
+    database by path and ``save`` upserts only the entries this instance
+    has seen, inside a single transaction. SQLite's locking makes this safe
+    for several processes sharing one cache directory, and the database
+    is never left half-written.
+
+    ``cached_files`` holds only the entries looked up or updated since the
+    last ``load``.
+    """
+
+    def __init__(self, storage: list[str], timeout: float = 30):
+        """
+
+        Parameters
+        ----------
+        storage: list[str]
+            Directories containing cached files, must be at least one. Metadata
+            is stored in the last of these directories by convention.
+        timeout: float
+            Seconds to wait for another process to release a lock on the
+            database.
+        """
+        super().__init__(storage)
+        self.timeout = timeout
+
+    def _connect(self, fn: str, writable: bool) -> sqlite3.Connection:
+        if writable:
+            conn = sqlite3.connect(fn, timeout=self.timeout, isolation_level=None)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, fn TEXT, "
+                "time REAL, accessed REAL, nbytes INTEGER, detail TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS files_time ON files (time)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS files_accessed ON files (accessed)"
+            )
+        else:
+            uri = pathlib.Path(fn).absolute().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, timeout=self.timeout, uri=True)
+        return conn
+
+    @staticmethod
+    def _decode(row: str) -> Detail:
+        detail = json.loads(row)
+        if isinstance(detail.get("blocks"), list):
+            detail["blocks"] = set(detail["blocks"])
+        return detail
+
+    @staticmethod
+    def _encode(detail: Detail) -> str:
+        if isinstance(detail["blocks"], set):
+            detail = dict(detail, blocks=list(detail["blocks"]))
+        return json.dumps(detail)
+
+    def _scan_locations(
+        self, writable_only: bool = False
+    ) -> Iterator[tuple[str, str, bool]]:
+        for fn, storage, writable in super()._scan_locations(writable_only):
+            yield fn + ".db", storage, writable
+
+    def _lookup(self, fn: str, path: str) -> Detail | None:
+        if not os.path.exists(fn):
+            return None
+        with contextlib.closing(self._connect(fn, writable=False)) as conn:
+            row = conn.execute(
+                "SELECT detail FROM files WHERE path = ?", (path,)
+            ).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def check_file(
+        self, path: str, cfs: CachingFileSystem | None
+    ) -> Literal[False] | tuple[Detail, str]:
+        for (fn, _, _), cache in zip(self._scan_locations(), self.cached_files):
+            if path not in cache:
+                detail = self._lookup(fn, path)
+                if detail is not None:
+                    cache[path] = detail
+        return super().check_file(path, cfs)
+
+    def clear_expired(self, expiry_time: int) -> tuple[list[str], bool]:
+        fn, storage, _ = next(self._scan_locations(writable_only=True))
+        cutoff = time.time() - expiry_time
+        with contextlib.closing(self._connect(fn, writable=True)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT path, fn FROM files WHERE time < ?", (cutoff,)
+            ).fetchall()
+            for path, name in rows:
+                if not name:
+                    conn.execute("ROLLBACK")
+                    raise RuntimeError(
+                        f"Cache metadata does not contain 'fn' for {path}"
+                    )
+            conn.execute("DELETE FROM files WHERE time < ?", (cutoff,))
+            (remaining,) = conn.execute("SELECT COUNT(*) FROM files").fetchone()
+            conn.execute("COMMIT")
+        for path, _ in rows:
+            self.cached_files[-1].pop(path, None)
+        expired_files = [os.path.join(storage, name) for _, name in rows]
+        return expired_files, remaining == 0
+
+    def load(self) -> None:
+        """Forget entries held in memory; they are re-read from disk on demand"""
+        self.cached_files = [{} for _ in self._storage]
+
+    def pop_file(self, path: str) -> str | None:
+        details = self.check_file(path, None)
+        if not details:
+            return None
+        _, fn = details
+        if not fn.startswith(self._storage[-1]):
+            raise PermissionError(
+                "Can only delete cached file in last, writable cache location"
+            )
+        self.cached_files[-1].pop(path)
+        db, _, _ = next(self._scan_locations(writable_only=True))
+        with contextlib.closing(self._connect(db, writable=True)) as conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        return fn
+
+    def usage(self) -> list[tuple[str, int]]:
+        fn, _, _ = next(self._scan_locations(writable_only=True))
+        if not os.path.exists(fn):
+            return []
+        with contextlib.closing(self._connect(fn, writable=True)) as conn:
+            return conn.execute(
+                "SELECT path, nbytes FROM files ORDER BY accessed"
+            ).fetchall()
+
+    def pop_files(self, paths: list[str]) -> list[str]:
+        db, storage, _ = next(self._scan_locations(writable_only=True))
+        fns = []
+        with contextlib.closing(self._connect(db, writable=True)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for path in paths:
+                self.cached_files[-1].pop(path, None)
+                row = conn.execute(
+                    "SELECT fn FROM files WHERE path = ?", (path,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM files WHERE path = ?", (path,))
+                    fns.append(os.path.join(storage, row[0]))
+            conn.execute("COMMIT")
+        return fns
+
+    def save(self) -> None:
+        """Upsert in-memory entries, merging with what is already stored"""
+        fn, _, _ = next(self._scan_locations(writable_only=True))
+        cache = self.cached_files[-1]
+        if not cache:
+            return
+        with contextlib.closing(self._connect(fn, writable=True)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for path, detail in cache.items():
+                    row = conn.execute(
+                        "SELECT detail FROM files WHERE path = ?", (path,)
+                    ).fetchone()
+                    if row is not None:
+                        stored = self._decode(row[0])
+                        if stored["blocks"] is True or detail["blocks"] is True:
+                            detail["blocks"] = True
+                        else:
+                            # update in place: the set is shared with MMapCache
+                            detail["blocks"].update(stored["blocks"])
+                        detail["time"] = max(detail["time"], stored["time"])
+                        detail["accessed"] = max(_accessed(detail), _accessed(stored))
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files "
+                        "(path, fn, time, accessed, nbytes, detail) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            path,
+                            detail["fn"],
+                            detail["time"],
+                            _accessed(detail),
+                            self._stored_size(detail),
+                            self._encode(detail),
+                        ),
+                    )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+
+metadata_backends: dict[str, type[CacheMetadata]] = {
+    "json": CacheMetadata,
+    "sqlite": SQLiteCacheMetadata,
+}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import contextlib
 import inspect
 import logging
 import os
 import tempfile
 import time
 import weakref
+from collections import Counter
 from collections.abc import Callable
 from shutil import rmtree
 from typing import TYPE_CHECKING, Any, ClassVar
@@ -16,7 +18,7 @@ from fsspec.compression import compr
 from fsspec.core import BaseCache, MMapCache
 from fsspec.exceptions import BlocksizeMismatchError
 from fsspec.implementations.cache_mapper import create_cache_mapper
-from fsspec.implementations.cache_metadata import CacheMetadata
+from fsspec.implementations.cache_metadata import metadata_backends
 from fsspec.implementations.chained import ChainedFileSystem
 from fsspec.implementations.local import LocalFileSystem
 from fsspec.spec import AbstractBufferedFile
@@ -77,6 +79,9 @@ class CachingFileSystem(ChainedFileSystem):
         compression=None,
         cache_mapper: AbstractCacheMapper | None = None,
         cache_storage_mode=None,
+        cache_metadata="json",
+        max_cache_size=None,
+        max_entries=None,
         **kwargs,
     ):
         """
@@ -126,6 +131,25 @@ class CachingFileSystem(ChainedFileSystem):
             behaviour. Pass an octal mode such as ``0o700`` to keep the cache
             directory, and so the cached data files within it, readable by the
             owner only.
+        cache_metadata: str
+            How the metadata of cached files is stored, one of the keys of
+            ``fsspec.implementations.cache_metadata.metadata_backends``.
+            "json" (the default) keeps everything in one JSON file, which is
+            rewritten on every save; "sqlite" keeps an SQLite database, which
+            is looked up and updated per entry and is safe for concurrent use
+            by several processes.
+        max_cache_size: int (optional)
+            Limit, in bytes, on the data held in the writable cache location.
+            Whenever the cache is saved, the least recently accessed files are
+            removed until within the limit. Files open for reading through
+            this instance, and those fetched by a ``cat`` in progress, are
+            never removed; they are considered again once done with, so the
+            cache may exceed the limit meanwhile. Partially cached files
+            count for the blocks they hold. Not applied by ``simplecache``,
+            which keeps no metadata.
+        max_entries: int (optional)
+            Limit on the number of files held in the writable cache location,
+            enforced in the same way as ``max_cache_size``.
         """
         super().__init__(**kwargs)
         if fs is None and target_protocol is None:
@@ -153,6 +177,12 @@ class CachingFileSystem(ChainedFileSystem):
         self.check_files = check_files
         self.expiry = expiry_time
         self.compression = compression
+        self.cache_metadata = cache_metadata
+        self.max_cache_size = max_cache_size
+        self.max_entries = max_entries
+        # paths of files currently open through this instance, protected
+        # from eviction
+        self._open_paths = Counter()
 
         # Size of cache in bytes. If None then the size is unknown and will be
         # recalculated the next time cache_size() is called. On writes to the
@@ -176,7 +206,7 @@ class CachingFileSystem(ChainedFileSystem):
             if isinstance(target_protocol, str)
             else (fs.protocol if isinstance(fs.protocol, str) else fs.protocol[0])
         )
-        self._metadata = CacheMetadata(self.storage)
+        self._metadata = metadata_backends[cache_metadata](self.storage)
         self.load_cache()
         self.fs = fs if fs is not None else filesystem(target_protocol, **self.kwargs)
 
@@ -223,9 +253,72 @@ class CachingFileSystem(ChainedFileSystem):
         """Save set of stored blocks from file"""
         self._mkcache()
         self._metadata.save()
+        self._evict()
         self.last_cache = time.time()
         self._cache_size = None
 
+    def _evict(self):
+        """Remove least recently accessed files until within the size and
+        entry limits"""
+        if self.max_cache_size is None and self.max_entries is None:
+            return
+        usage = self._metadata.usage()
+        total = sum(nbytes for _, nbytes in usage)
+        count = len(usage)
+        victims = []
+        for path, nbytes in usage:
+            if (self.max_cache_size is None or total <= self.max_cache_size) and (
+                self.max_entries is None or count <= self.max_entries
+            ):
+                break
+            if self._open_paths[path]:
+                continue
+            victims.append(path)
+            total -= nbytes
+            count -= 1
+        for fn in self._metadata.pop_files(victims):
+            logger.debug("Evicting %s from cache", fn)
+            try:
+                os.remove(fn)
+            except OSError:
+                # already gone, or still open elsewhere (Windows)
+                pass
+
+    @contextlib.contextmanager
+    def _pinned(self, paths):
+        """Protect paths from eviction while in use by the current call"""
+        self._open_paths.update(paths)
+        try:
+            yield
+        finally:
+            self._release(paths)
+
+    def _release(self, paths):
+        for path in paths:
+            self._open_paths[path] -= 1
+            if self._open_paths[path] <= 0:
+                del self._open_paths[path]
+
+    def _track_open(self, f, path):
+        """Protect path from eviction until the local file f is closed"""
+        if self.max_cache_size is None and self.max_entries is None:
+            return f
+        self._open_paths[path] += 1
+        close = f.close
+
+        def _close():
+            if f.closed:
+                return
+            close()
+            self._release([path])
+            try:
+                self._evict()
+            except OSError:
+                logger.debug("Cache eviction failed while closing file")
+
+        f.close = _close
+        return f
+
     def _check_cache(self):
         """Reload caches if time elapsed or any disappeared"""
         self._mkcache()
@@ -241,7 +334,11 @@ class CachingFileSystem(ChainedFileSystem):
         """Is path in cache and still valid"""
         path = self._strip_protocol(path)
         self._check_cache()
-        return self._metadata.check_file(path, self)
+        out = self._metadata.check_file(path, self)
+        if out and (self.max_cache_size is not None or self.max_entries is not None):
+            # access times are only needed to choose what to evict
+            self._metadata.touch_file(path)
+        return out
 
     def clear_cache(self):
         """Remove all files and metadata from the cache
@@ -337,7 +434,7 @@ class CachingFileSystem(ChainedFileSystem):
             if blocks is True:
                 # stored file is complete
                 logger.debug("Opening local copy of %s", path)
-                return open(fn, mode)
+                return self._track_open(open(fn, mode), path)
             # TODO: action where partial file exists in read-only cache
             logger.debug("Opening partially cached copy of %s", path)
         else:
@@ -408,6 +505,7 @@ class CachingFileSystem(ChainedFileSystem):
         )
         close = f.close
         f.close = lambda: self.close_and_update(f, close)
+        self._open_paths[path] += 1
         self.save_cache()
         return f
 
@@ -425,6 +523,7 @@ class CachingFileSystem(ChainedFileSystem):
             return
         path = self._strip_protocol(f.path)
         self._metadata.on_close_cached_file(f, path)
+        self._release([path])
         try:
             logger.debug("going to save")
             self.save_cache()
@@ -467,6 +566,10 @@ class CachingFileSystem(ChainedFileSystem):
             "isdir",
             "_check_file",
             "_check_cache",
+            "_evict",
+            "_pinned",
+            "_release",
+            "_track_open",
             "_makedirs",
             "_mkcache",
             "clear_cache",
@@ -540,6 +643,9 @@ class CachingFileSystem(ChainedFileSystem):
             and self.check_files == other.check_files
             and self.expiry == other.expiry
             and self.compression == other.compression
+            and self.cache_metadata == other.cache_metadata
+            and self.max_cache_size == other.max_cache_size
+            and self.max_entries == other.max_entries
             and self._mapper == other._mapper
             and self.target_protocol == other.target_protocol
         )
@@ -553,6 +659,9 @@ class CachingFileSystem(ChainedFileSystem):
             ^ hash(self.check_files)
             ^ hash(self.expiry)
             ^ hash(self.compression)
+            ^ hash(self.cache_metadata)
+            ^ hash(self.max_cache_size)
+            ^ hash(self.max_entries)
             ^ hash(self._mapper)
             ^ hash(self.target_protocol)
         )
@@ -617,15 +726,19 @@ class WholeFileCacheFileSystem(CachingFileSystem):
             ]
             for path, detail in zip(downpath, newdetail):
                 self._metadata.update_file(path, detail)
-            self.save_cache()
+            with self._pinned(paths):
+                # keep all until opened below
+                self.save_cache()
 
         def firstpart(fn):
             # helper to adapt both whole-file and simple-cache
             return fn[1] if isinstance(fn, tuple) else fn
 
         return [
-            open(firstpart(fn0) if fn0 else fn1, mode=open_files.mode)
-            for fn0, fn1 in zip(details, downfn0)
+            self._track_open(
+                open(firstpart(fn0) if fn0 else fn1, mode=open_files.mode), path
+            )
+            for path, fn0, fn1 in zip(paths, details, downfn0)
         ]
 
     def commit_many(self, open_files):
@@ -685,15 +798,18 @@ class WholeFileCacheFileSystem(CachingFileSystem):
                     out[p] = e
                 paths.remove(p)
 
-        if getpaths:
-            self.fs.get(getpaths, storepaths)
-            self.save_cache()
-
-        callback.set_size(len(paths))
-        for p, fn in zip(paths, fns):
-            with open(fn, "rb") as f:
-                out[p] = f.read()
-            callback.relative_update(1)
+        # keep all until read, then evict if over the limits
+        with self._pinned(paths):
+            if getpaths:
+                self.fs.get(getpaths, storepaths)
+                self.save_cache()
+
+            callback.set_size(len(paths))
+            for p, fn in zip(paths, fns):
+                with open(fn, "rb") as f:
+                    out[p] = f.read()
+                callback.relative_update(1)
+        self._evict()
         if isinstance(path, str) and len(paths) == 1 and recursive is False:
             out = out[paths[0]]
         return out
@@ -728,7 +844,9 @@ class WholeFileCacheFileSystem(CachingFileSystem):
         if "r" in mode or "a" in mode:
             if not self._check_file(path):
                 if self.fs.exists(path):
-                    self._get_cached_file_before_open(path, **kwargs)
+                    with self._pinned([path]):
+                        # keep until opened below
+                        self._get_cached_file_before_open(path, **kwargs)
                 elif "r" in mode:
                     raise FileNotFoundError(path)
 
@@ -751,7 +869,7 @@ class WholeFileCacheFileSystem(CachingFileSystem):
             # `original`.
             f = open(fn, mode)
             f.original = detail.get("original")
-            return f
+            return self._track_open(f, path)
 
         hash = self._mapper(path)
         fn = os.path.join(self.storage[-1], hash)
@@ -963,7 +1081,7 @@ class SimpleCacheFileSystem(WholeFileCacheFileSystem):
         fn = self._check_file(path)
         # Just reading does not need special file handling
         if "r" in mode and "+" not in mode:
-            return open(fn, mode)
+            return self._track_open(open(fn, mode), path)
 
         fn = os.path.join(self.storage[-1], sha)
         user_specified_kwargs = {
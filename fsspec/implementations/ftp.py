@@ -303,10 +303,8 @@ class FTPFileSystem(AbstractFileSystem):
         self.ftp.close()
 
     def invalidate_cache(self, path=None):
-        if path is None:
-            self.dircache.clear()
-        else:
-            self.dircache.pop(path, None)
+        # the listing of path and of any directories below it
+        self.dircache.invalidate(path)
         super().invalidate_cache(path)
 
 
@@ -165,26 +165,7 @@ class GithubFileSystem(AbstractFileSystem):
                         return path
                 _sha = out["sha"]
         if path not in self.dircache or sha not in [self.root, None]:
-            r = requests.get(
-                self.url.format(org=self.org, repo=self.repo, sha=_sha),
-                timeout=self.timeout,
-                **self.kw,
-            )
-            if r.status_code == 404:
-                raise FileNotFoundError(path)
-            r.raise_for_status()
-            types = {"blob": "file", "tree": "directory"}
-            out = [
-                {
-                    "name": path + "/" + f["path"] if path else f["path"],
-                    "mode": f["mode"],
-                    "type": types[f["type"]],
-                    "size": f.get("size", 0),
-                    "sha": f["sha"],
-                }
-                for f in r.json()["tree"]
-                if f["type"] in types
-            ]
+            out = self._tree(path, _sha)["tree"]
             if sha in [self.root, None]:
                 self.dircache[path] = out
         else:
@@ -194,6 +175,78 @@ class GithubFileSystem(AbstractFileSystem):
         else:
             return sorted([f["name"] for f in out])
 
+    def _tree(self, path, sha, recursive=False):
+        """Fetch the git tree object ``sha`` found at ``path``
+
+        The "tree" of the returned dict holds the details of its members, or of
+        everything below it if ``recursive``, in which case github may also
+        report the list as "truncated".
+        """
+        r = requests.get(
+            self.url.format(org=self.org, repo=self.repo, sha=sha),
+            params={"recursive": 1} if recursive else None,
+            timeout=self.timeout,
+            **self.kw,
+        )
+        if r.status_code == 404:
+            raise FileNotFoundError(path)
+        r.raise_for_status()
+        out = r.json()
+        types = {"blob": "file", "tree": "directory"}
+        out["tree"] = [
+            {
+                "name": path + "/" + f["path"] if path else f["path"],
+                "mode": f["mode"],
+                "type": types[f["type"]],
+                "size": f.get("size", 0),
+                "sha": f["sha"],
+            }
+            for f in out["tree"]
+            if f["type"] in types
+        ]
+        return out
+
+    def find(self, path, maxdepth=None, withdirs=False, detail=False, **kwargs):
+        """List all files below path, with one request for the whole tree
+
+        The complete listing is also stored as the cached listing of every
+        directory below ``path``, so that later ``ls``, ``info`` and ``walk``
+        calls there make no requests. If github truncates the listing, or for
+        another ``sha``, this lists one directory at a time instead.
+        """
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+        path = self._strip_protocol(path).rstrip("/")
+        listing = None
+        if kwargs.get("sha") in [self.root, None]:
+            try:
+                info = self.info(path) if path else {"type": "directory"}
+            except FileNotFoundError:
+                info = {"type": None}
+            if info["type"] == "directory":
+                tree = info["sha"] if path else self.root
+                listing = self._tree(path, tree, recursive=True)
+        if listing is None or listing.get("truncated"):
+            return super().find(
+                path, maxdepth=maxdepth, withdirs=withdirs, detail=detail, **kwargs
+            )
+        entries = listing["tree"]
+        self.dircache.update_tree(path, entries, self._parent)
+
+        out = {}
+        if withdirs and path:
+            out[path] = self.info(path)
+        depth = path.count("/") + 1 if path else 0
+        for entry in entries:
+            if maxdepth is not None and entry["name"].count("/") - depth >= maxdepth:
+                continue
+            if withdirs or entry["type"] != "directory":
+                out[entry["name"]] = entry
+        names = sorted(out)
+        if not detail:
+            return names
+        return {name: out[name] for name in names}
+
     def invalidate_cache(self, path=None):
         self.dircache.clear()
 
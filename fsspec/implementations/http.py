@@ -1,21 +1,38 @@
 import asyncio
+import atexit
+import bisect
+import codecs
 import io
+import json
 import logging
+import os
 import re
+import time
 import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
+from datetime import datetime
 from urllib.parse import urlparse
 
 import aiohttp
 import yarl
 
-from fsspec.asyn import AbstractAsyncStreamedFile, AsyncFileSystem, sync, sync_wrapper
+from fsspec.asyn import (
+    AbstractAsyncStreamedFile,
+    AsyncFileSystem,
+    _run_coros_in_chunks,
+    sync,
+    sync_wrapper,
+)
 from fsspec.callbacks import DEFAULT_CALLBACK
 from fsspec.exceptions import FSTimeoutError
 from fsspec.spec import AbstractBufferedFile
 from fsspec.utils import (
     DEFAULT_BLOCK_SIZE,
     glob_translate,
+    is_exception,
     isfilelike,
     nullcontext,
     tokenize,
@@ -26,6 +43,15 @@ from ..caching import AllBytes
 # https://stackoverflow.com/a/15926317/3821154
 ex = re.compile(r"""<(a|A)\s+(?:[^>]*?\s+)?(href|HREF)=["'](?P<url>[^"']+)""")
 ex2 = re.compile(r"""(?P<url>http[s]?://[-a-zA-Z0-9@:%_+.~#?&/=]+)""")
+content_range = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)", re.IGNORECASE)
+multipart_boundary = re.compile(r"""boundary=(?:"([^"]+)"|([^\s;]+))""")
+# the modified time and size following a link in Apache and nginx autoindex pages
+autoindex_details = re.compile(
+    r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}(?::\d{2})?"  # Apache: 2021-12-31 23:59
+    r"|\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}(?::\d{2})?)"  # nginx: 31-Dec-2021 23:59
+    r"\s+(-|\d+(?:\.\d+)?[KMGTP]?)(?![\w.])"
+)
+tags = re.compile(r"<[^>]*>")
 logger = logging.getLogger("fsspec.http")
 
 
@@ -33,6 +59,18 @@ async def get_client(**kwargs):
     return aiohttp.ClientSession(**kwargs)
 
 
+# loop -> {token: session}, for instances with shared_session=True
+_shared_sessions = weakref.WeakKeyDictionary()
+
+
+@atexit.register
+def _close_shared_sessions():
+    for loop, sessions in list(_shared_sessions.items()):
+        for session in sessions.values():
+            if not getattr(session, "closed", False):
+                HTTPFileSystem.close_session(loop, session)
+
+
 class HTTPFileSystem(AsyncFileSystem):
     """
     Simple File-System for fetching data via HTTP(S)
@@ -48,6 +86,8 @@ class HTTPFileSystem(AsyncFileSystem):
 
     protocol = ("http", "https")
     sep = "/"
+    # keeps the Range header well below common server limits
+    max_ranges_per_request = 100
 
     def __init__(
         self,
@@ -62,6 +102,13 @@ class HTTPFileSystem(AsyncFileSystem):
         client_kwargs=None,
         get_client=get_client,
         encoded=False,
+        connector_kwargs=None,
+        shared_session=False,
+        multi_range=False,
+        use_info_cache=False,
+        info_expiry_time=None,
+        max_info_paths=10_000,
+        listing_details=False,
         **storage_options,
     ):
         """
@@ -87,6 +134,44 @@ class HTTPFileSystem(AsyncFileSystem):
             A callable, which takes keyword arguments and constructs
             an aiohttp.ClientSession. Its state will be managed by
             the HTTPFileSystem class.
+        connector_kwargs: dict
+            Passed to aiohttp.TCPConnector, which then becomes the connection
+            pool of the session, e.g., ``limit`` (total connections, default
+            100), ``limit_per_host`` (default no limit), ``keepalive_timeout``
+            (seconds an idle connection is kept open) and ``ttl_dns_cache``
+            (seconds that DNS lookups are cached, default 10). Ignored if
+            ``client_kwargs`` already contains a ``connector``.
+        shared_session: bool
+            If True, the session is shared with every other instance using
+            the same event loop, ``get_client``, ``client_kwargs`` and
+            ``connector_kwargs``, so that short-lived instances, or those
+            differing only in request options, reuse warm connections. Such a
+            session is closed at interpreter exit rather than with the
+            instance.
+        multi_range: bool
+            If True, ``cat_ranges`` asks for all the ranges of each URL in
+            one request (up to ``max_ranges_per_request`` at a time), which
+            the server may answer with a multipart/byteranges body. Servers
+            that return the whole file or a single range instead are also
+            handled, with any ranges left over fetched one by one.
+        use_info_cache: bool
+            If True, the results of ``info()`` are kept, per URL, so that
+            calls such as ``size``, ``exists`` and ``open`` on the same URL
+            make only one request. Calls with extra request arguments bypass
+            this cache.
+        info_expiry_time: int or float (optional)
+            Seconds for which a cached ``info()`` is used as is. After that,
+            an entry with an ETag is revalidated with a conditional HEAD
+            request, and kept if the server answers 304 Not Modified.
+            If None, entries do not expire.
+        max_info_paths: int (optional)
+            The number of URLs whose ``info()`` is kept; the least recently
+            used entries are dropped beyond this. If None, there is no limit.
+        listing_details: bool
+            If True, ``ls`` also reads the modification time and size shown
+            next to each link in Apache- and nginx-style autoindex pages, as
+            "mtime" (a datetime, in the server's local time) and "size".
+            Sizes given in rounded units, like "1.2K", are not used.
         storage_options: key-value
             Any other parameters passed on to requests
         cache_type, cache_options: defaults used in open()
@@ -100,6 +185,14 @@ class HTTPFileSystem(AsyncFileSystem):
         self.client_kwargs = client_kwargs or {}
         self.get_client = get_client
         self.encoded = encoded
+        self.connector_kwargs = connector_kwargs or {}
+        self.shared_session = shared_session
+        self.multi_range = multi_range
+        self.use_info_cache = use_info_cache
+        self.info_expiry_time = info_expiry_time
+        self.max_info_paths = max_info_paths
+        self._info_cache = OrderedDict()  # url -> (time, info)
+        self.listing_details = listing_details
         self.kwargs = storage_options
         self._session = None
 
@@ -111,6 +204,8 @@ class HTTPFileSystem(AsyncFileSystem):
         self.use_listings_cache = request_options.pop("use_listings_cache", False)
         request_options.pop("listings_expiry_time", None)
         request_options.pop("max_paths", None)
+        request_options.pop("max_listings_size", None)
+        request_options.pop("compact_listings", None)
         request_options.pop("skip_instance_cache", None)
         self.kwargs = request_options
 
@@ -134,9 +229,30 @@ class HTTPFileSystem(AsyncFileSystem):
             # close after loop is dead
             connector._close()
 
+    async def _new_session(self):
+        kw = self.client_kwargs
+        if self.connector_kwargs and "connector" not in kw:
+            # the connector must be made within the running loop
+            kw = dict(kw, connector=aiohttp.TCPConnector(**self.connector_kwargs))
+        return await self.get_client(loop=self.loop, **kw)
+
     async def set_session(self):
-        if self._session is None:
-            self._session = await self.get_client(loop=self.loop, **self.client_kwargs)
+        if self._session is not None and not (
+            self.shared_session and getattr(self._session, "closed", False)
+        ):
+            return self._session
+        if self.shared_session:
+            # self.loop is None for asynchronous instances made outside a loop
+            loop = asyncio.get_running_loop()
+            sessions = _shared_sessions.setdefault(loop, {})
+            token = tokenize(self.get_client, self.client_kwargs, self.connector_kwargs)
+            session = sessions.get(token)
+            if session is None or getattr(session, "closed", False):
+                # closed at exit, if still open, by _close_shared_sessions
+                session = sessions[token] = await self._new_session()
+            self._session = session
+        else:
+            self._session = await self._new_session()
             if not self.asynchronous:
                 weakref.finalize(self, self.close_session, self.loop, self._session)
         return self._session
@@ -155,65 +271,99 @@ class HTTPFileSystem(AsyncFileSystem):
         return ""
 
     async def _ls_real(self, url, detail=True, **kwargs):
-        # ignoring URL-encoded arguments
-        kw = self.kwargs.copy()
-        kw.update(kwargs)
         logger.debug(url)
-        session = await self.set_session()
-        async with session.get(self.encode_url(url), **self.kwargs) as r:
-            self._raise_not_found_for_status(r, url)
-
-            if "Content-Type" in r.headers:
-                mimetype = r.headers["Content-Type"].partition(";")[0]
-            else:
-                mimetype = None
-
-            if mimetype in ("text/html", None):
-                try:
-                    text = await r.text(errors="ignore")
-                    if self.simple_links:
-                        links = ex2.findall(text) + [u[2] for u in ex.findall(text)]
-                    else:
-                        links = [u[2] for u in ex.findall(text)]
-                except UnicodeDecodeError:
-                    links = []  # binary, not HTML
-            else:
-                links = []
-
-        out = set()
+        out = {}
         parts = urlparse(url)
-        for l in links:
-            if isinstance(l, tuple):
-                l = l[1]
+        async for l, details in self._iter_links(url):
             if l.startswith("/") and len(l) > 1:
                 # absolute URL on this server
                 l = f"{parts.scheme}://{parts.netloc}{l}"
             if l.startswith("http"):
                 if self.same_schema and l.startswith(url.rstrip("/") + "/"):
-                    out.add(l)
+                    pass
                 elif l.replace("https", "http").startswith(
                     url.replace("https", "http").rstrip("/") + "/"
                 ):
                     # allowed to cross http <-> https
-                    out.add(l)
+                    pass
+                else:
+                    continue
+            elif l in ["..", "../"]:
+                # Ignore FTP-like "parent"
+                continue
             else:
-                if l not in ["..", "../"]:
-                    # Ignore FTP-like "parent"
-                    out.add("/".join([url.rstrip("/"), l.lstrip("/")]))
+                l = "/".join([url.rstrip("/"), l.lstrip("/")])
+            if details or l not in out:
+                out[l] = details
         if not out and url.endswith("/"):
-            out = await self._ls_real(url.rstrip("/"), detail=False)
+            return await self._ls_real(url.rstrip("/"), detail=detail)
         if detail:
             return [
                 {
                     "name": u,
                     "size": None,
                     "type": "directory" if u.endswith("/") else "file",
+                    **(details or {}),
                 }
-                for u in out
+                for u, details in out.items()
             ]
         else:
             return sorted(out)
 
+    async def _iter_links(self, url, chunk_size=2**16):
+        """Yield (link, details) for each link of an HTML page, as it arrives
+
+        The body is decoded and scanned a chunk at a time, a line at a time,
+        except that a tag is never split. ``details`` is a dict of what could
+        be read following the link, if ``listing_details`` is True, else None.
+        """
+        session = await self.set_session()
+        # ignoring URL-encoded arguments
+        async with session.get(self.encode_url(url), **self.kwargs) as r:
+            self._raise_not_found_for_status(r, url)
+
+            if "Content-Type" in r.headers:
+                mimetype = r.headers["Content-Type"].partition(";")[0]
+            else:
+                mimetype = None
+            if mimetype not in ("text/html", None):
+                return
+            try:
+                decoder = codecs.getincrementaldecoder(r.charset or "utf-8")
+            except LookupError:
+                decoder = codecs.getincrementaldecoder("utf-8")
+            decoder = decoder(errors="ignore")
+
+            buf = ""
+            eof = False
+            while not eof:
+                chunk = await r.content.read(chunk_size)
+                eof = not chunk
+                buf += decoder.decode(chunk, final=eof)
+                if eof:
+                    end = len(buf)
+                else:
+                    end = buf.rfind("\n") + 1
+                    start_tag = buf.rfind("<", 0, end)
+                    if start_tag > buf.rfind(">", 0, end):
+                        # do not cut a tag in half
+                        end = start_tag
+                    if end <= 0:
+                        continue
+                text, buf = buf[:end], buf[end:]
+                if self.simple_links:
+                    for m in ex2.finditer(text):
+                        yield m["url"], None
+                anchors = list(ex.finditer(text))
+                for m, after in zip(anchors, anchors[1:] + [None]):
+                    details = None
+                    if self.listing_details:
+                        stop = len(text) if after is None else after.start()
+                        newline = text.find("\n", m.end(), stop)
+                        tail = text[m.end() : stop if newline < 0 else newline]
+                        details = _autoindex_details(tags.sub(" ", tail))
+                    yield m["url"], details
+
     async def _ls(self, url, detail=True, **kwargs):
         if self.use_listings_cache and url in self.dircache:
             out = self.dircache[url]
@@ -250,12 +400,155 @@ class HTTPFileSystem(AsyncFileSystem):
             self._raise_not_found_for_status(r, url)
         return out
 
+    async def _cat_ranges(
+        self,
+        paths,
+        starts,
+        ends,
+        max_gap=None,
+        batch_size=None,
+        on_error="return",
+        multi_range=None,
+        **kwargs,
+    ):
+        if multi_range is None:
+            multi_range = self.multi_range
+        if not multi_range or max_gap is not None or not isinstance(paths, list):
+            return await super()._cat_ranges(
+                paths,
+                starts,
+                ends,
+                max_gap=max_gap,
+                batch_size=batch_size,
+                on_error=on_error,
+                **kwargs,
+            )
+        if not isinstance(starts, Iterable):
+            starts = [starts] * len(paths)
+        if not isinstance(ends, Iterable):
+            ends = [ends] * len(paths)
+        if len(starts) != len(paths) or len(ends) != len(paths):
+            raise ValueError
+
+        # only explicit, non-empty ranges are packed; the rest go one by one
+        out = [b""] * len(paths)
+        by_url = {}
+        singles = []
+        for i, (p, s, e) in enumerate(zip(paths, starts, ends)):
+            if s is None or e is None or s < 0 or e < 0:
+                singles.append(i)
+            elif e > s:
+                by_url.setdefault(p, []).append(i)
+        groups = []
+        for inds in by_url.values():
+            # a lone range also goes this way, so that a server answering
+            # 200 with the whole file has its body cut to the range
+            n = self.max_ranges_per_request
+            groups.extend(inds[j : j + n] for j in range(0, len(inds), n))
+        coros = [
+            self._cat_multi_range(
+                paths[g[0]], [(starts[i], ends[i]) for i in g], **kwargs
+            )
+            for g in groups
+        ] + [
+            self._cat_file(paths[i], start=starts[i], end=ends[i], **kwargs)
+            for i in singles
+        ]
+        results = await _run_coros_in_chunks(
+            coros,
+            batch_size=batch_size or self.batch_size,
+            nofiles=True,
+            return_exceptions=True,
+        )
+        for g, res in zip(groups, results):
+            for k, i in enumerate(g):
+                out[i] = res if is_exception(res) else res[k]
+        for i, res in zip(singles, results[len(groups) :]):
+            out[i] = res
+        if on_error != "return":
+            ex = next(filter(is_exception, out), None)
+            if ex is not None:
+                raise ex
+        return out
+
+    async def _cat_multi_range(self, url, ranges, **kwargs):
+        """Fetch several (start, end) ranges of one URL in a single request"""
+        kw = self.kwargs.copy()
+        kw.update(kwargs)
+        headers = kw.pop("headers", {}).copy()
+        headers["Range"] = "bytes=" + ",".join(f"{s}-{e - 1}" for s, e in ranges)
+        kw["headers"] = headers
+        session = await self.set_session()
+        async with session.get(self.encode_url(url), **kw) as r:
+            self._raise_not_found_for_status(r, url)
+            body = await r.read()
+            if r.status != 206:
+                # server ignored Range and sent the whole file
+                return [body[s:e] for s, e in ranges]
+            ctype = r.headers.get("Content-Type", "")
+            m = multipart_boundary.search(ctype)
+            if ctype.startswith("multipart/byteranges") and m:
+                parts = _parse_byteranges(body, m[1] or m[2])
+            else:
+                m = content_range.search(r.headers.get("Content-Range", ""))
+                # without Content-Range, there is no knowing what was sent
+                parts = [(int(m[1]), body, m[3] == str(int(m[2]) + 1))] if m else []
+        out = _slice_parts(parts, ranges)
+        missing = [i for i, o in enumerate(out) if o is None]
+        if missing:
+            # e.g., server honoured only the first range
+            logger.debug("Fetching %s uncovered ranges of %s", len(missing), url)
+            more = await asyncio.gather(
+                *[
+                    self._cat_file(url, start=ranges[i][0], end=ranges[i][1], **kwargs)
+                    for i in missing
+                ]
+            )
+            for i, o in zip(missing, more):
+                out[i] = o
+        return out
+
     async def _get_file(
-        self, rpath, lpath, chunk_size=5 * 2**20, callback=DEFAULT_CALLBACK, **kwargs
+        self,
+        rpath,
+        lpath,
+        chunk_size=5 * 2**20,
+        callback=DEFAULT_CALLBACK,
+        download_concurrency=1,
+        **kwargs,
     ):
+        """Copy a single remote file to local
+
+        If ``download_concurrency`` is more than 1, and the server reports a
+        size bigger than ``chunk_size``, segments of that size are fetched
+        by range requests, that many at once, and written in place into the
+        local file. Completed segments are recorded next to the local file,
+        in ``lpath + ".fsspec-parts"``, so that a failed download can be
+        resumed by calling again with the same arguments.
+        """
         kw = self.kwargs.copy()
         kw.update(kwargs)
         logger.debug(rpath)
+        if download_concurrency > 1 and hasattr(os, "pwrite") and not isfilelike(lpath):
+            info = await self._info(rpath, **kwargs)
+            size = info["size"]
+            if size is not None and size > chunk_size and info.get("partial", True):
+                try:
+                    return await self._get_file_parallel(
+                        rpath,
+                        lpath,
+                        info,
+                        chunk_size,
+                        callback,
+                        download_concurrency,
+                        kw,
+                    )
+                except _RangesNotSupported:
+                    # the whole file is streamed below instead
+                    logger.debug("Range requests refused for %s", rpath)
+                    await asyncio.to_thread(os.remove, lpath + ".fsspec-parts")
+                    # forget progress counted for parts of a previous attempt
+                    callback.absolute_update(0)
         session = await self.set_session()
         async with session.get(self.encode_url(rpath), **kw) as r:
             try:
@@ -280,6 +573,123 @@ class HTTPFileSystem(AsyncFileSystem):
                 if not isfilelike(lpath):
                     outfile.close()
 
+    async def _get_file_parallel(
+        self, rpath, lpath, info, chunk_size, callback, concurrency, kw
+    ):
+        size = info["size"]
+        progress_path = lpath + ".fsspec-parts"
+        state = {
+            "url": rpath,
+            "size": size,
+            "chunk_size": chunk_size,
+            "ukey": [info.get(k) for k in ("ETag", "Last-Modified")],
+        }
+
+        def load():
+            if not (os.path.exists(lpath) and os.path.getsize(lpath) == size):
+                return []
+            try:
+                with open(progress_path) as f:
+                    saved = json.load(f)
+                if {k: v for k, v in saved.items() if k != "done"} == state:
+                    return saved["done"]
+            except (OSError, ValueError, KeyError):
+                pass
+            return []
+
+        done = set(await asyncio.to_thread(load))
+        last_record = 0
+        loop = asyncio.get_running_loop()
+        # local file operations run in threads, off the event loop; records
+        # in one thread, so that they are written in order
+        writers = ThreadPoolExecutor(concurrency)
+        recorder = ThreadPoolExecutor(1)
+
+        def write_record(done):
+            with open(progress_path + ".tmp", "w") as f:
+                json.dump(dict(state, done=done), f)
+            os.replace(progress_path + ".tmp", progress_path)
+
+        async def record(force=False):
+            # rewritten at most once a second while parts complete, and
+            # always if the download fails
+            nonlocal last_record
+            now = time.monotonic()
+            if not force and now - last_record < 1:
+                return
+            last_record = now
+            await loop.run_in_executor(recorder, write_record, sorted(done))
+
+        def open_local():
+            fd = os.open(lpath, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0))
+            try:
+                os.ftruncate(fd, size)
+            except BaseException:
+                os.close(fd)
+                raise
+            return fd
+
+        def close_local():
+            # writes of cancelled parts may still be running
+            writers.shutdown()
+            recorder.shutdown()
+            if fd is not None:
+                os.close(fd)
+
+        callback.set_size(size)
+        callback.relative_update(
+            sum(min(chunk_size, size - part * chunk_size) for part in done)
+        )
+        session = await self.set_session()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(part):
+            start = part * chunk_size
+            end = min(start + chunk_size, size)
+            headers = kw.get("headers", {}).copy()
+            headers["Range"] = f"bytes={start}-{end - 1}"
+            async with semaphore:
+                async with session.get(
+                    self.encode_url(rpath), **dict(kw, headers=headers)
+                ) as r:
+                    self._raise_not_found_for_status(r, rpath)
+                    if r.status != 206:
+                        raise _RangesNotSupported
+                    offset = start
+                    while offset < end:
+                        chunk = await r.content.read(min(2**20, end - offset))
+                        if not chunk:
+                            raise OSError(f"Download of {rpath} ended at {offset}")
+                        await loop.run_in_executor(
+                            writers, os.pwrite, fd, chunk, offset
+                        )
+                        offset += len(chunk)
+                        callback.relative_update(len(chunk))
+            done.add(part)
+            await record()
+
+        fd = None
+        tasks = []
+        try:
+            await record(force=True)
+            fd = await loop.run_in_executor(writers, open_local)
+            nparts = -(-size // chunk_size)
+            tasks = [
+                asyncio.ensure_future(fetch(part))
+                for part in range(nparts)
+                if part not in done
+            ]
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await record(force=True)
+            raise
+        finally:
+            await asyncio.to_thread(close_local)
+        await asyncio.to_thread(os.remove, progress_path)
+
     async def _put_file(
         self,
         lpath,
@@ -329,8 +739,11 @@ class HTTPFileSystem(AsyncFileSystem):
         meth = getattr(session, method)
         async with meth(self.encode_url(rpath), data=gen_chunks(), **kw) as resp:
             self._raise_not_found_for_status(resp, rpath)
+        self.invalidate_cache(rpath)
 
     async def _exists(self, path, strict=False, **kwargs):
+        if not kwargs and await self._cached_info(path) is not None:
+            return True
         kw = self.kwargs.copy()
         kw.update(kwargs)
         try:
@@ -438,8 +851,16 @@ class HTTPFileSystem(AsyncFileSystem):
         which case size will be given as None (and certain operations on the
         corresponding file will not work).
         """
+        cache = self.use_info_cache and not kwargs
+        if cache:
+            info = await self._cached_info(url)
+            if info is not None:
+                return info.copy()
         info = {}
         session = await self.set_session()
+        kw = {**self.kwargs, **kwargs}
+        if "headers" in self.kwargs and "headers" in kwargs:
+            kw["headers"] = {**self.kwargs["headers"], **kwargs["headers"]}
 
         for policy in ["head", "get"]:
             try:
@@ -448,8 +869,7 @@ class HTTPFileSystem(AsyncFileSystem):
                         self.encode_url(url),
                         size_policy=policy,
                         session=session,
-                        **self.kwargs,
-                        **kwargs,
+                        **kw,
                     )
                 )
                 if info.get("size") is not None:
@@ -460,7 +880,78 @@ class HTTPFileSystem(AsyncFileSystem):
                     raise FileNotFoundError(url) from exc
                 logger.debug("", exc_info=exc)
 
-        return {"name": url, "size": None, **info, "type": "file"}
+        info = {"name": url, "size": None, **info, "type": "file"}
+        if cache:
+            self._store_info(url, info)
+        return info.copy()
+
+    def _store_info(self, url, info):
+        self._info_cache[url] = (time.monotonic(), info)
+        self._info_cache.move_to_end(url)
+        while self.max_info_paths and len(self._info_cache) > self.max_info_paths:
+            self._info_cache.popitem(last=False)
+
+    async def _cached_info(self, url):
+        """The cached info of ``url``, if still valid, or None"""
+        if not self.use_info_cache or url not in self._info_cache:
+            return None
+        self._info_cache.move_to_end(url)
+        t, info = self._info_cache[url]
+        if self.info_expiry_time is None or (
+            time.monotonic() - t < self.info_expiry_time
+        ):
+            return info
+        if "ETag" in info and await self._not_modified(url, info["ETag"]):
+            self._store_info(url, info)
+            return info
+        # may already be gone, removed by others while awaiting the server
+        self._info_cache.pop(url, None)
+        return None
+
+    async def _not_modified(self, url, etag):
+        kw = self.kwargs.copy()
+        kw.setdefault("allow_redirects", True)
+        headers = kw.pop("headers", {}).copy()
+        headers["If-None-Match"] = etag
+        session = await self.set_session()
+        try:
+            async with session.head(self.encode_url(url), headers=headers, **kw) as r:
+                return r.status == 304
+        except aiohttp.ClientError:
+            return False
+
+    async def _infos(self, paths, batch_size=None, on_error="raise", **kwargs):
+        """Info of many URLs, fetched at most ``batch_size`` at a time
+
+        Repeated URLs are only requested once. With ``on_error="return"``,
+        any exception is placed in the output list instead of being raised.
+        """
+        unique = list(dict.fromkeys(paths))
+        out = await _run_coros_in_chunks(
+            [self._info(p, **kwargs) for p in unique],
+            batch_size=batch_size or self.batch_size,
+            nofiles=True,
+            return_exceptions=True,
+        )
+        if on_error != "return":
+            ex = next(filter(is_exception, out), None)
+            if ex is not None:
+                raise ex
+        out = dict(zip(unique, out))
+        return [out[p] for p in paths]
+
+    infos = sync_wrapper(_infos)
+
+    async def _sizes(self, paths, batch_size=None):
+        infos = await self._infos(paths, batch_size=batch_size)
+        return [info.get("size") for info in infos]
+
+    def invalidate_cache(self, path=None):
+        if path is None:
+            self._info_cache.clear()
+        else:
+            self._info_cache.pop(path, None)
+        super().invalidate_cache(path)
 
     async def _glob(self, path, maxdepth=None, **kwargs):
         """
@@ -742,6 +1233,14 @@ class HTTPFile(AbstractBufferedFile):
 
     _fetch_range = sync_wrapper(async_fetch_range)
 
+    async def async_fetch_ranges(self, ranges):
+        """Download several blocks of data concurrently"""
+        return await asyncio.gather(
+            *[self.async_fetch_range(start, end) for start, end in ranges]
+        )
+
+    _fetch_ranges = sync_wrapper(async_fetch_ranges)
+
 
 magic_check = re.compile("([*[])")
 
@@ -824,6 +1323,10 @@ class AsyncStreamFile(AbstractAsyncStreamedFile):
         await super().close()
 
 
+class _RangesNotSupported(Exception):
+    pass
+
+
 async def get_range(session, url, start, end, file=None, **kwargs):
     # explicit get a range when we know it must be safe
     kwargs = kwargs.copy()
@@ -841,6 +1344,76 @@ async def get_range(session, url, start, end, file=None, **kwargs):
         return out
 
 
+def _autoindex_details(text):
+    """The mtime and size in the text following a link in an autoindex page"""
+    m = autoindex_details.search(text)
+    if m is None:
+        return None
+    stamp = m[1]
+    if stamp[4] == "-":
+        fmt = "%Y-%m-%d %H:%M"
+    else:
+        fmt = "%d-%b-%Y %H:%M"
+    if stamp.count(":") == 2:
+        fmt += ":%S"
+    try:
+        details = {"mtime": datetime.strptime(stamp, fmt)}
+    except ValueError:
+        return None
+    if m[2].isdigit():
+        details["size"] = int(m[2])
+    return details
+
+
+def _parse_byteranges(body, boundary):
+    """Split a multipart/byteranges body into [(start, data, to_eof), ...]
+
+    Each part's length is taken from its Content-Range, so the data itself is
+    never scanned for the boundary.
+    """
+    delim = b"--" + boundary.encode()
+    parts = []
+    pos = body.find(delim)
+    while pos >= 0:
+        pos += len(delim)
+        if body[pos : pos + 2] == b"--":
+            break  # closing delimiter
+        head_end = body.find(b"\r\n\r\n", pos)
+        if head_end < 0:
+            break
+        m = content_range.search(body[pos:head_end].decode("latin-1"))
+        if m is None:
+            raise ValueError("multipart/byteranges part without Content-Range")
+        start, end = int(m[1]), int(m[2]) + 1
+        data_start = head_end + 4
+        parts.append(
+            (start, body[data_start : data_start + end - start], m[3] == str(end))
+        )
+        pos = body.find(delim, data_start + end - start)
+    return parts
+
+
+def _slice_parts(parts, ranges):
+    """Cut each (start, end) range out of the returned parts
+
+    Gives None for ranges not wholly within one part. A part reaching the end
+    of the file also covers ranges that go past it, which come back short.
+    """
+    parts = sorted(parts, key=lambda p: p[0])
+    part_starts = [p[0] for p in parts]
+    out = []
+    for s, e in ranges:
+        i = bisect.bisect_right(part_starts, s) - 1
+        if i >= 0:
+            start, data, to_eof = parts[i]
+            stop = start + len(data)
+            if stop >= e or (to_eof and s <= stop):
+                out.append(data[s - start : e - start])
+                continue
+        out.append(None)
+    return out
+
+
 async def _file_info(url, session, size_policy="head", **kwargs):
     """Call HEAD on the server to get details about the file (size/checksum etc.)
 
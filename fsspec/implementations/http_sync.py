@@ -263,6 +263,8 @@ class HTTPFileSystem(AbstractFileSystem):
         self.use_listings_cache = request_options.pop("use_listings_cache", False)
         request_options.pop("listings_expiry_time", None)
         request_options.pop("max_paths", None)
+        request_options.pop("max_listings_size", None)
+        request_options.pop("compact_listings", None)
         request_options.pop("skip_instance_cache", None)
         self.kwargs = request_options
 
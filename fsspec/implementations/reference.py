@@ -890,7 +890,14 @@ class ReferenceFileSystem(AsyncFileSystem):
             if remote in data:
                 fs.pipe_file(local, data[remote])
 
-    def cat(self, path, recursive=False, on_error="raise", **kwargs):
+    def cat(self, path, recursive=False, on_error="raise", zero_copy=False, **kwargs):
+        """Fetch the contents of one or more references
+
+        Byte ranges in the same target are merged (see ``max_gap`` and
+        ``max_block``) and fetched concurrently. If ``zero_copy`` is True,
+        values taken from fetched targets are returned as memoryviews on the
+        fetched buffers, rather than copied to new bytes.
+        """
         if isinstance(path, str) and recursive:
             raise NotImplementedError
         if isinstance(path, list) and (recursive or any("*" in p for p in path)):
@@ -947,31 +954,39 @@ class ReferenceFileSystem(AsyncFileSystem):
                     paths2.append(p)
 
             # merge and fetch consolidated ranges
-            new_paths, new_starts, new_ends = merge_offset_ranges(
+            new_paths, new_starts, new_ends, index = merge_offset_ranges(
                 list(urls2),
                 list(starts2),
                 list(ends2),
                 sort=True,
                 max_gap=self.max_gap,
                 max_block=self.max_block,
+                return_index=True,
             )
             bytes_out = fs.cat_ranges(new_paths, new_starts, new_ends)
 
-            # unbundle from merged bytes - simple approach
+            # unbundle from merged bytes, going straight to each reference's block
+            whole_blocks = {}
+            for u, s, e, p, (block, offset) in zip(
+                urls2, starts2, ends2, paths2, index
+            ):
+                b = bytes_out[block]
+                if s is None:
+                    whole_blocks[u] = block
+                if isinstance(b, Exception):
+                    out[p] = b
+                    continue
+                if zero_copy:
+                    b = memoryview(b)
+                out[p] = b[offset : None if e is None else offset + e - (s or 0)]
             for u, s, e, p in zip(urls, starts, ends, valid_paths):
-                if p in out:
-                    continue  # was bytes, already handled
-                for np, ns, ne, b in zip(new_paths, new_starts, new_ends, bytes_out):
-                    if np == u and (ns is None or ne is None):
-                        if isinstance(b, Exception):
-                            out[p] = b
-                        else:
-                            out[p] = b[s:e]
-                    elif np == u and s >= ns and e <= ne:
-                        if isinstance(b, Exception):
-                            out[p] = b
-                        else:
-                            out[p] = b[s - ns : (e - ne) or None]
+                if p in out or u not in whole_blocks:
+                    continue
+                b = bytes_out[whole_blocks[u]]
+                if isinstance(b, Exception):
+                    out[p] = b
+                else:
+                    out[p] = (memoryview(b) if zero_copy else b)[s:e]
 
         for k, v in out.copy().items():
             # these were valid references, but fetch failed, so transform exc
@@ -1,6 +1,13 @@
+import bisect
+import io
+import json
 import logging
+import os
 import re
+import sys
 import tarfile
+import tempfile
+import zlib
 
 import fsspec
 from fsspec.archive import AbstractArchiveFileSystem
@@ -9,14 +16,206 @@ from fsspec.utils import infer_compression
 
 typemap = {b"0": "file", b"5": "directory"}
 
+# TarInfo attributes kept in a saved index, besides the type
+tarinfo_fields = (
+    "name",
+    "mode",
+    "uid",
+    "gid",
+    "size",
+    "mtime",
+    "chksum",
+    "linkname",
+    "uname",
+    "gname",
+    "devmajor",
+    "devminor",
+    "offset",
+    "offset_data",
+    "sparse",
+    "pax_headers",
+)
+
 logger = logging.getLogger("tar")
 
 
+def _decompressor(compression):
+    if compression == "gzip":
+        return zlib.decompressobj(wbits=31)
+    try:
+        if sys.version_info >= (3, 14):
+            from compression import zstd
+        else:
+            from backports import zstd
+        return zstd.ZstdDecompressor()
+    except ImportError:
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+class CheckpointedFile(io.RawIOBase):
+    """Seekable, decompressed view of a gzip or zstd stream
+
+    Seeking restarts decompression from the nearest checkpoint before the
+    target, rather than from the start of the stream. Checkpoints are
+    (compressed offset, decompressed offset, state), where state is None at
+    the start of a gzip member or zstd frame, since decompression can begin
+    afresh there, or else a copy of the zlib decompressor. Only the former
+    can be saved, as ``saved_checkpoints``, and passed to a later instance.
+    They are taken as the stream is read, at least ``spacing`` bytes apart.
+
+    Each zlib state holds its 32 KiB window and more, about 45 KiB, so at most
+    ``max_states`` are kept. When that many are held, every other one is
+    dropped, and later ones are taken twice as far apart.
+    """
+
+    blocksize = 2**16
+    spacing = 2**22
+    max_states = 256
+
+    def __init__(self, fo, compression, checkpoints=(), spacing=None):
+        if compression not in ("gzip", "zstd"):
+            raise ValueError(f"Cannot checkpoint {compression} streams")
+        self.fo = fo
+        self.compression = compression
+        self.spacing = spacing or self.spacing
+        self._state_spacing = self.spacing
+        self.checkpoints = [(0, 0, None)]
+        self._offsets = [0]  # decompressed offsets of checkpoints
+        for cloc, uloc in checkpoints:
+            self._add_checkpoint(cloc, uloc, None, force=True)
+        self.loc = 0
+        self._restart(self.checkpoints[0])
+
+    @property
+    def saved_checkpoints(self):
+        return [[c, u] for c, u, state in self.checkpoints[1:] if state is None]
+
+    def _add_checkpoint(self, cloc, uloc, state, force=False):
+        i = bisect.bisect_right(self._offsets, uloc)
+        if self._offsets[i - 1] == uloc:
+            return
+        if not force:
+            if state is None:
+                # member/frame starts, which can be saved, are spaced only
+                # relative to each other
+                near = [u for _, u, st in self.checkpoints if st is None]
+                spacing = self.spacing
+            else:
+                near = self._offsets
+                spacing = self._state_spacing
+            k = bisect.bisect_right(near, uloc)
+            if any(abs(u - uloc) < spacing for u in near[max(k - 1, 0) : k + 1]):
+                return
+        if state is not None:
+            states = [
+                k for k, (_, _, st) in enumerate(self.checkpoints) if st is not None
+            ]
+            if len(states) >= self.max_states:
+                for k in reversed(states[1::2]):
+                    del self.checkpoints[k]
+                    del self._offsets[k]
+                self._state_spacing *= 2
+                return self._add_checkpoint(cloc, uloc, state)
+            state = state.copy()
+        self.checkpoints.insert(i, (cloc, uloc, state))
+        self._offsets.insert(i, uloc)
+
+    def _restart(self, checkpoint):
+        self._cloc, self._uloc, state = checkpoint
+        if state is None:
+            self._dec = _decompressor(self.compression)
+        else:
+            self._dec = state.copy()  # keep the checkpoint reusable
+        self._buf = bytearray()  # decompressed, starting at self._uloc
+
+    def _read_block(self):
+        self.fo.seek(self._cloc)
+        data = self.fo.read(self.blocksize)
+        self._cloc += len(data)
+        return data
+
+    def _decode_more(self):
+        """Decompress the next block onto the buffer; False at end of stream"""
+        end = self._uloc + len(self._buf)
+        if self._dec.eof:
+            # next gzip member or zstd frame
+            data = self._dec.unused_data
+            start = self._cloc - len(data)
+            data = data or self._read_block()
+            if not data:
+                return False
+            self._dec = _decompressor(self.compression)
+            self._add_checkpoint(start, end, None)
+        else:
+            data = self._read_block()
+            if not data:
+                return False
+        self._buf += self._dec.decompress(data)
+        if hasattr(self._dec, "copy") and not self._dec.eof:
+            # all input consumed, so the state matches self._cloc
+            self._add_checkpoint(self._cloc, self._uloc + len(self._buf), self._dec)
+        return True
+
+    def _seek_decoder(self, loc):
+        """Make the buffer start at ``loc``, or be empty if that is past the end"""
+        i = bisect.bisect_right(self._offsets, loc) - 1
+        if loc < self._uloc or self._offsets[i] > self._uloc + len(self._buf):
+            self._restart(self.checkpoints[i])
+        while self._uloc + len(self._buf) < loc:
+            self._uloc += len(self._buf)
+            self._buf.clear()
+            if not self._decode_more():
+                return
+        del self._buf[: loc - self._uloc]
+        self._uloc = loc
+
+    def read(self, size=-1):
+        self._seek_decoder(self.loc)
+        while size is None or size < 0 or len(self._buf) < size:
+            if not self._decode_more():
+                break
+        out = bytes(self._buf if size is None or size < 0 else self._buf[:size])
+        del self._buf[: len(out)]
+        self._uloc += len(out)
+        self.loc += len(out)
+        return out
+
+    def readinto(self, b):
+        out = self.read(len(b))
+        b[: len(out)] = out
+        return len(out)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, loc, whence=0):
+        if whence == 1:
+            loc += self.loc
+        elif whence != 0:
+            raise ValueError("Cannot seek from the end of a compressed stream")
+        if loc < 0:
+            raise ValueError("Seek before start of file")
+        self.loc = loc
+        return loc
+
+    def tell(self):
+        return self.loc
+
+
 class TarFileSystem(AbstractArchiveFileSystem):
     """Compressed Tar archives as a file-system (read-only)
 
     Supports the following formats:
     tar.gz, tar.bz2, tar.xz
+
+    Listing a tar archive means reading every member header, which for a
+    remote or compressed archive is a read of the whole file. Pass
+    ``index_store`` to save the result, and load it instead next time.
     """
 
     root_marker = ""
@@ -30,14 +229,40 @@ class TarFileSystem(AbstractArchiveFileSystem):
         target_options=None,
         target_protocol=None,
         compression=None,
+        seek_index=False,
         **kwargs,
     ):
+        """
+        Parameters
+        ----------
+        fo: str or file-like
+            The archive: a URL, opened with ``target_protocol`` and
+            ``target_options``, or an open file.
+        index_store: str or True (optional)
+            Where to save the member index after listing the archive, and load
+            it from next time, unless the archive has changed since. A URL for
+            a JSON file, or True for a file in the temporary directory named by
+            the archive's ``ukey``. Not used if the archive has no ``ukey``,
+            e.g., when ``fo`` is an open file.
+        compression: str (optional)
+            As in ``fsspec.compression.compr``; inferred from the file name if
+            not given.
+        seek_index: bool
+            If True, and the compression is gzip or zstd, decompression state is
+            checkpointed as the archive is read, so that opening a member only
+            decompresses from the nearest checkpoint before it (see
+            ``CheckpointedFile``). The starts of gzip members and zstd frames
+            are also saved with the ``index_store``; archives compressed in
+            independent blocks (e.g., with bgzip or pzstd) can then be read at
+            random from the first open.
+        """
         super().__init__(**kwargs)
         target_options = target_options or {}
 
         if isinstance(fo, str):
             self.of = fsspec.open(fo, protocol=target_protocol, **target_options)
             fo = self.of.open()  # keep the reference
+        self._ukey = self._archive_ukey(fo)
 
         # Try to infer compression.
         if compression is None:
@@ -78,8 +303,12 @@ class TarFileSystem(AbstractArchiveFileSystem):
         if compression is not None:
             # TODO: tarfile already implements compression with modes like "'r:gz'",
             #  but then would seek to offset in the file work?
-            fo = compr[compression](fo)
+            if seek_index and compression in ("gzip", "zstd"):
+                fo = CheckpointedFile(fo, compression)
+            else:
+                fo = compr[compression](fo)
 
+        self.compression = compression
         self._fo_ref = fo
         self.fo = fo  # the whole instance is a context
         self.tar = tarfile.TarFile(fileobj=self.fo)
@@ -89,10 +318,90 @@ class TarFileSystem(AbstractArchiveFileSystem):
         self.index = None
         self._index()
 
+    def _archive_ukey(self, fo):
+        """Identity of the archive's current version, if it can be found"""
+        of = getattr(self, "of", fo)
+        fs, path = getattr(of, "fs", None), getattr(of, "path", None)
+        if fs is None or path is None:
+            return None
+        try:
+            return fs.ukey(path)
+        except Exception as ex:
+            logger.debug(f"No ukey for {path}: {ex}")
+            return None
+
+    def _index_path(self):
+        if self._ukey is None:
+            # nothing to tell whether a saved index is of this archive
+            return None
+        if self.index_store is True:
+            return os.path.join(
+                tempfile.gettempdir(), "fsspec-tar-index", f"{self._ukey}.json"
+            )
+        return self.index_store
+
+    def _load_index(self):
+        """Members from the saved index, or None if missing or out of date"""
+        path = self._index_path()
+        if path is None:
+            return None
+        try:
+            with fsspec.open(path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as ex:
+            logger.debug(f"No tar index loaded from {path}: {ex}")
+            return None
+        if saved.get("version") != 1 or saved.get("ukey") != self._ukey:
+            return None
+        members = []
+        for record in saved["members"]:
+            ti = tarfile.TarInfo()
+            for field in tarinfo_fields:
+                setattr(ti, field, record[field])
+            ti.type = record["type"].encode("latin-1")
+            if ti.sparse is not None:
+                ti.sparse = [tuple(block) for block in ti.sparse]
+            members.append(ti)
+        if isinstance(self.fo, CheckpointedFile):
+            for cloc, uloc in saved.get("checkpoints", []):
+                self.fo._add_checkpoint(cloc, uloc, None, force=True)
+        return members
+
+    def _save_index(self, members):
+        path = self._index_path()
+        if path is None:
+            return
+        records = []
+        for ti in members:
+            record = {field: getattr(ti, field) for field in tarinfo_fields}
+            record["type"] = ti.type.decode("latin-1")
+            records.append(record)
+        saved = {"version": 1, "ukey": self._ukey, "members": records}
+        if isinstance(self.fo, CheckpointedFile):
+            saved["checkpoints"] = self.fo.saved_checkpoints
+        try:
+            if self.index_store is True:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            with fsspec.open(path, "w") as f:
+                json.dump(saved, f)
+        except OSError as ex:
+            logger.warning(f"Unable to save tar index to {path}: {ex}")
+
     def _index(self):
-        # TODO: load and set saved index, if exists
+        members = self._load_index() if self.index_store else None
+        # TarFile's private flag for having read all headers, present in
+        # CPython 3.10 to 3.13 at least
+        if members is not None and hasattr(self.tar, "_loaded"):
+            # as if TarFile had read them all itself, so it never does
+            self.tar.members = members
+            self.tar._loaded = True
+        else:
+            members = self.tar.getmembers()  # reads every header
+            if self.index_store:
+                self._save_index(members)
         out = {}
-        for ti in self.tar:
+        self._contiguous = set()  # names of members stored in one piece
+        for ti in members:
             info = ti.get_info()
             info["type"] = typemap.get(info["type"], "file")
             orig_name = info["name"].rstrip("/")
@@ -100,9 +409,10 @@ class TarFileSystem(AbstractArchiveFileSystem):
             name = re.sub("/+", "/", orig_name)
             info["name"] = name
             out[name] = (info, ti.offset_data, orig_name)
+            if ti.isreg() and ti.sparse is None:
+                self._contiguous.add(name)
 
         self.index = out
-        # TODO: save index to self.index_store here, if set
 
     def _get_dirs(self):
         if self.dir_cache is not None:
@@ -117,6 +427,16 @@ class TarFileSystem(AbstractArchiveFileSystem):
             {info["name"]: info for info, _, _ in self.index.values()}
         )
 
+    def _member_ranges(self, paths):
+        if self.compression is not None or not hasattr(self, "of"):
+            return {}
+        out = {}
+        for path in paths:
+            if path in self._contiguous:
+                info, offset, _ = self.index[path]
+                out[path] = (offset, offset + info["size"])
+        return out
+
     def _open(self, path, mode="rb", **kwargs):
         if mode != "rb":
             raise ValueError("Read-only filesystem implementation")
@@ -2,6 +2,7 @@ import json
 import os
 import shutil
 import tempfile
+import time
 
 import pytest
 
@@ -538,6 +539,150 @@ def test_blockcache_multiinstance(ftp_writable):
     assert list(fs2._metadata.cached_files[-1]) == ["/one", "/two"]
 
 
+def test_sqlite_metadata(ftp_writable, tmp_path):
+    host, port, user, pw = ftp_writable
+    fs = FTPFileSystem(host, port, user, pw)
+    for fn in ("/one", "/two"):
+        with fs.open(fn, "wb") as f:
+            f.write(b"test" * 40)
+    storage = str(tmp_path / "cache")
+    kwargs = {
+        "target_protocol": "ftp",
+        "target_options": {
+            "host": host,
+            "port": port,
+            "username": user,
+            "password": pw,
+        },
+        "cache_storage": storage,
+        "cache_metadata": "sqlite",
+        "skip_instance_cache": True,
+    }
+
+    fs = fsspec.filesystem("blockcache", **kwargs)
+    with fs.open("/one", block_size=20) as f:
+        assert f.read(1) == b"t"
+    assert os.path.exists(os.path.join(storage, "cache.db"))
+    assert not os.path.exists(os.path.join(storage, "cache"))
+
+    fs2 = fsspec.filesystem("blockcache", **kwargs)
+    assert fs2._metadata.cached_files == [{}]  # nothing read up front
+    with fs2.open("/one", block_size=20) as f:
+        f.seek(100)
+        assert f.read(1) == b"t"
+    with fs2.open("/two", block_size=20) as f:
+        assert f.read() == b"test" * 40
+    assert fs2._metadata.cached_files[-1]["/two"]["blocks"] is True
+
+    fs.load_cache()
+    detail, _ = fs._check_file("/one")
+    assert detail["blocks"] == {0, 5}
+    assert fs._check_file("/two")[0]["blocks"] is True
+
+    fs.pop_from_cache("/one")
+    fs2.load_cache()
+    assert not fs2._check_file("/one")
+
+    time.sleep(0.01)
+    fs.clear_expired_cache(expiry_time=0.001)
+    fs2.load_cache()
+    assert not fs2._check_file("/two")
+
+
+@pytest.mark.parametrize("cache_metadata", ["json", "sqlite"])
+def test_filecache_eviction(tmp_path, cache_metadata):
+    source = tmp_path / "source"
+    source.mkdir()
+    paths = []
+    for name in "abcd":
+        (source / name).write_bytes(name.encode() * 100)
+        paths.append(make_path_posix(str(source / name)))
+    a, b, c, d = paths
+    fs = fsspec.filesystem(
+        "filecache",
+        target_protocol="file",
+        cache_storage=str(tmp_path / "cache"),
+        cache_metadata=cache_metadata,
+        max_entries=2,
+        max_cache_size=250,
+    )
+
+    def cached():
+        return {p for p in paths if fs._check_file(p)}
+
+    assert fs.cat(a) == b"a" * 100
+    time.sleep(0.01)
+    assert fs.cat(b) == b"b" * 100
+    assert cached() == {a, b}
+    time.sleep(0.01)
+    assert fs.cat(a) == b"a" * 100  # a now more recent than b
+    fs.save_cache()
+    time.sleep(0.01)
+    assert fs.cat(c) == b"c" * 100
+    assert cached() == {a, c}
+    assert len(os.listdir(tmp_path / "cache")) == 3  # two files and metadata
+
+    fs.max_entries = None
+    fs.max_cache_size = 150
+    time.sleep(0.01)
+    assert fs.cat(d) == b"d" * 100
+    assert cached() == {d}
+
+
+@pytest.mark.parametrize("cache_metadata", ["json", "sqlite"])
+@pytest.mark.parametrize("limit", [{"max_entries": 1}, {"max_cache_size": 10}])
+def test_filecache_eviction_keeps_in_use(tmp_path, cache_metadata, limit):
+    source = tmp_path / "source"
+    source.mkdir()
+    a, b = (make_path_posix(str(source / name)) for name in "ab")
+    (source / "a").write_bytes(b"a" * 100)
+    (source / "b").write_bytes(b"b" * 100)
+    fs = fsspec.filesystem(
+        "filecache",
+        target_protocol="file",
+        cache_storage=str(tmp_path / "cache"),
+        cache_metadata=cache_metadata,
+        skip_instance_cache=True,
+        **limit,
+    )
+    # fetched by this call, so not evicted before being read
+    assert fs.cat([a, b]) == {a: b"a" * 100, b: b"b" * 100}
+
+    with fs.open(a) as f:
+        with fs.open(b) as f2:
+            assert f2.read() == b"b" * 100
+        assert f.read() == b"a" * 100
+        assert fs._check_file(a)
+    assert len(fs._metadata.usage()) <= limit.get("max_entries", 0)
+    assert not fs._open_paths
+
+
+def test_blockcache_eviction_skips_open(ftp_writable, tmp_path):
+    host, port, user, pw = ftp_writable
+    fs = FTPFileSystem(host, port, user, pw)
+    for fn in ("/one", "/two"):
+        with fs.open(fn, "wb") as f:
+            f.write(b"test" * 40)
+    fs = fsspec.filesystem(
+        "blockcache",
+        target_protocol="ftp",
+        target_options={"host": host, "port": port, "username": user, "password": pw},
+        cache_storage=str(tmp_path / "cache"),
+        max_entries=1,
+    )
+    f = fs.open("/one", block_size=20)
+    assert f.read(1) == b"t"
+    with fs.open("/two", block_size=20) as f2:
+        assert f2.read(1) == b"t"
+        assert list(fs._metadata.cached_files[-1]) == ["/one", "/two"]
+    # "/one" is open, so is kept even though it is least recently used
+    assert list(fs._metadata.cached_files[-1]) == ["/one"]
+    f.close()
+    with fs.open("/two", block_size=20) as f2:
+        assert f2.read(1) == b"t"
+    assert list(fs._metadata.cached_files[-1]) == ["/two"]
+
+
 def test_metadata_save_blocked(ftp_writable, caplog):
     import logging
 
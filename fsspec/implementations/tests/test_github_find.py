@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from fsspec.implementations import github  # noqa: E402
+
+# tree sha -> members, as paths relative to the tree
+trees = {
+    "main": [("a", "tree", "t1"), ("e", "blob", "b3")],
+    "t1": [("b", "blob", "b1"), ("c", "tree", "t2")],
+    "t2": [("d", "blob", "b2")],
+}
+
+
+def tree_listing(sha, recursive, prefix=""):
+    out = []
+    for name, kind, child in trees[sha]:
+        out.append(
+            {"path": prefix + name, "mode": "100644", "type": kind, "sha": child}
+        )
+        if kind == "blob":
+            out[-1]["size"] = len(name)
+        elif recursive:
+            out.extend(tree_listing(child, True, prefix + name + "/"))
+    return out
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def requests_get(monkeypatch):
+    calls = []
+
+    def get(url, params=None, **kwargs):
+        sha = url.rsplit("/", 1)[-1]
+        recursive = bool(params and params.get("recursive"))
+        calls.append((sha, recursive))
+        return Response({"tree": tree_listing(sha, recursive), "truncated": False})
+
+    monkeypatch.setattr(github.requests, "get", get)
+    return calls
+
+
+def test_find_fills_listings_cache(requests_get):
+    fs = github.GithubFileSystem("org", "repo", sha="main", skip_instance_cache=True)
+    assert requests_get == [("main", False)]
+    assert fs.find("") == ["a/b", "a/c/d", "e"]
+    assert requests_get[1:] == [("main", True)]
+
+    # answered from the listings stored by find
+    assert fs.ls("a/c") == ["a/c/d"]
+    assert fs.info("a/c/d")["size"] == 1
+    assert fs.info("a/c")["type"] == "directory"
+    assert [root for root, _, _ in fs.walk("")] == ["", "a", "a/c"]
+    assert len(requests_get) == 2
+
+    assert fs.find("a", maxdepth=1, withdirs=True) == ["a", "a/b", "a/c"]
+    assert requests_get[2:] == [("t1", True)]
+    assert fs.find("missing") == []
@@ -182,6 +182,15 @@ def test_read(server):
         assert f.read(100) + f.read() == data
 
 
+def test_read_ranges(server):
+    h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true"})
+    with h.open(server.realfile, "rb", block_size=100, cache_type="mmap") as f:
+        out = f.read_ranges([(10, 20), (5000, 5200), (-10, None)])
+        assert out == [data[10:20], data[5000:5200], data[-10:]]
+        assert f.cache.miss_count == 5
+        assert f.tell() == 0
+
+
 def test_file_pickle(server):
     import pickle
 
@@ -327,6 +336,73 @@ def test_download(server, tmpdir):
     assert open(fn, "rb").read() == data
 
 
+@pytest.mark.parametrize("use_206", [True, False])
+def test_download_concurrency(server, tmpdir, use_206, monkeypatch):
+    import threading
+
+    headers = {"give_length": "true", "head_ok": "true"}
+    if use_206:
+        headers["use_206"] = "true"
+    h = fsspec.filesystem("http", headers=headers, skip_instance_cache=True)
+    url = server.realfile
+    fn = os.path.join(tmpdir, "afile")
+    threads = set()
+    pwrite = os.pwrite
+
+    def recording_pwrite(*args):
+        threads.add(threading.current_thread().name)
+        return pwrite(*args)
+
+    monkeypatch.setattr(os, "pwrite", recording_pwrite)
+    cb = fsspec.callbacks.Callback()
+    h.get_file(url, fn, chunk_size=1000, download_concurrency=4, callback=cb)
+    assert open(fn, "rb").read() == data
+    # written off the event loop
+    assert bool(threads) == use_206
+    assert "fsspecIO" not in threads
+    assert cb.size == cb.value == len(data)
+    assert not os.path.exists(fn + ".fsspec-parts")
+
+
+def test_download_concurrency_resume(server, tmpdir):
+    headers = {"give_length": "true", "head_ok": "true", "use_206": "true"}
+    h = fsspec.filesystem("http", headers=headers, skip_instance_cache=True)
+    url = server.realfile
+    fn = os.path.join(tmpdir, "afile")
+    # parts 0 and 2 of a previous attempt are done; here marked with "x"s
+    with open(fn, "wb") as f:
+        f.write(b"x" * 1000 + b"\0" * 1000 + b"x" * 1000)
+        f.write(b"\0" * (len(data) - 3000))
+    state = {
+        "url": url,
+        "size": len(data),
+        "chunk_size": 1000,
+        "ukey": [None, None],
+        "done": [0, 2],
+    }
+    with open(fn + ".fsspec-parts", "w") as f:
+        json.dump(state, f)
+    cb = fsspec.callbacks.Callback()
+    h.get_file(url, fn, chunk_size=1000, download_concurrency=4, callback=cb)
+    out = open(fn, "rb").read()
+    assert out[:1000] == out[2000:3000] == b"x" * 1000
+    assert out[1000:2000] == data[1000:2000]
+    assert out[3000:] == data[3000:]
+    assert cb.value == len(data)
+    assert not os.path.exists(fn + ".fsspec-parts")
+
+    # resuming from a server that now ignores Range streams the whole file
+    with open(fn + ".fsspec-parts", "w") as f:
+        json.dump(state, f)
+    headers = {"give_length": "true", "head_ok": "true"}
+    h = fsspec.filesystem("http", headers=headers, skip_instance_cache=True)
+    cb = fsspec.callbacks.Callback()
+    h.get_file(url, fn, chunk_size=1000, download_concurrency=4, callback=cb)
+    assert open(fn, "rb").read() == data
+    assert cb.value == len(data)
+    assert not os.path.exists(fn + ".fsspec-parts")
+
+
 def test_multi_download(server, tmpdir):
     h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true"})
     urla = server.realfile
@@ -348,6 +424,26 @@ def test_ls(server):
     assert h.glob(server.address + "/data/20020401/*.nc4") == [nc]
 
 
+def test_list_details(server):
+    import datetime
+
+    url = server.address + "/autoindex/"
+    h = fsspec.filesystem("http", listing_details=True, skip_instance_cache=True)
+    out = {o["name"]: o for o in h.ls(url)}
+    names = ["?C=N;O=D", "big", "other", "realfile", "sub/"]
+    assert sorted(out) == [url + n for n in names]
+    assert out[url + "sub/"]["type"] == "directory"
+    assert out[url + "sub/"]["size"] is None
+    assert out[url + "realfile"]["size"] == len(data)
+    assert out[url + "realfile"]["mtime"] == datetime.datetime(2021, 3, 4, 5, 6)
+    assert out[url + "big"]["size"] is None  # rounded
+    assert out[url + "other"]["mtime"] == datetime.datetime(2021, 12, 31, 23, 59, 58)
+    assert "mtime" not in out[url + "?C=N;O=D"]
+
+    h = fsspec.filesystem("http", skip_instance_cache=True)
+    assert all(o["size"] is None for o in h.ls(url))
+
+
 def test_mcat(server):
     h = fsspec.filesystem("http", headers={"give_length": "true", "head_ok": "true"})
     urla = server.realfile
@@ -377,6 +473,37 @@ def test_cat_file_range_numpy(server):
     assert out == [data[1:10], data[5:15]]
 
 
+@pytest.mark.parametrize(
+    "headers",
+    [
+        {"multi_range": "true"},
+        {"ignore_range": "true"},  # whole file
+        {"use_206": "true", "give_range": "true"},  # first range only
+        {"use_206": "true"},  # first range, but no Content-Range
+    ],
+)
+def test_cat_ranges_multi_range(server, headers):
+    h = fsspec.filesystem(
+        "http", headers=headers, multi_range=True, skip_instance_cache=True
+    )
+    urla = server.realfile
+    urlb = server.address + "/index/otherfile"
+    paths = [urla, urlb, urla, urla, urla, urlb]
+    starts = [1, 0, 100, 20, 5, len(data) - 5]
+    ends = [10, 5, 150, 20, 15, len(data) + 5]
+    out = h.cat_ranges(paths, starts, ends)
+    assert out == [data[s:e] for s, e in zip(starts, ends)]
+
+    out = h.cat_ranges(
+        [urla, server.address + "/missing", server.address + "/missing"],
+        [0, 0, 10],
+        [5, 5, 20],
+    )
+    assert out[0] == data[:5]
+    assert isinstance(out[1], FileNotFoundError)
+    assert isinstance(out[2], FileNotFoundError)
+
+
 def test_mcat_cache(server):
     urla = server.realfile
     urlb = server.address + "/index/otherfile"
@@ -404,6 +531,130 @@ def test_info(server):
     assert info["url"] == server.realfile
 
 
+def test_info_cache(server, mocker):
+    import fsspec.implementations.http as http
+
+    spy = mocker.spy(http, "_file_info")
+    headers = {"give_length": "true", "head_ok": "true"}
+    fs = fsspec.filesystem(
+        "http", headers=headers, use_info_cache=True, skip_instance_cache=True
+    )
+    url = server.realfile
+    assert fs.size(url) == len(data)
+    assert fs.exists(url)
+    fs.info(url)["size"] = 0  # a copy
+    with fs.open(url) as f:
+        assert f.read() == data
+    assert fs.info(url)["size"] == len(data)
+    assert spy.call_count == 1
+
+    fs.invalidate_cache(url)
+    fs.info(url)
+    assert spy.call_count == 2
+
+    # a different request is not served from cache
+    fs.info(url, headers=headers)
+    assert spy.call_count == 3
+
+
+def test_info_cache_max_paths(server, mocker):
+    import fsspec.implementations.http as http
+
+    spy = mocker.spy(http, "_file_info")
+    headers = {"give_length": "true", "head_ok": "true"}
+    fs = fsspec.filesystem(
+        "http",
+        headers=headers,
+        use_info_cache=True,
+        max_info_paths=1,
+        skip_instance_cache=True,
+    )
+    urla = server.realfile
+    urlb = server.address + "/index/otherfile"
+    fs.info(urla)
+    fs.info(urlb)
+    assert list(fs._info_cache) == [urlb]
+    fs.info(urla)
+    assert spy.call_count == 3
+
+
+def test_info_cache_expiry(server, mocker):
+    import fsspec.implementations.http as http
+
+    spy = mocker.spy(http, "_file_info")
+    not_modified = mocker.spy(http.HTTPFileSystem, "_not_modified")
+    url = server.realfile
+    for etag, calls in [(True, 1), (False, 2)]:
+        headers = {"give_length": "true", "head_ok": "true"}
+        if etag:
+            headers["give_etag"] = "true"
+        fs = fsspec.filesystem(
+            "http",
+            headers=headers,
+            use_info_cache=True,
+            info_expiry_time=0,
+            skip_instance_cache=True,
+        )
+        spy.reset_mock()
+        assert fs.info(url)["size"] == len(data)
+        assert fs.info(url)["size"] == len(data)
+        assert spy.call_count == calls
+    assert not_modified.call_count == 1
+
+
+def test_info_cache_revalidate_concurrent(server, monkeypatch):
+    headers = {"give_length": "true", "head_ok": "true", "give_etag": "true"}
+    fs = fsspec.filesystem(
+        "http",
+        headers=headers,
+        use_info_cache=True,
+        info_expiry_time=0,
+        max_info_paths=1,
+        skip_instance_cache=True,
+    )
+    urla = server.realfile
+    urlb = server.address + "/index/otherfile"
+    fs.info(urla)
+
+    async def not_modified(url, etag):
+        # meanwhile, another URL is cached
+        await fs._info(urlb)
+        return True
+
+    monkeypatch.setattr(fs, "_not_modified", not_modified)
+    assert fs.info(urla)["size"] == len(data)
+    assert list(fs._info_cache) == [urla]
+
+    async def modified(url, etag):
+        # meanwhile, the entry is dropped
+        fs.invalidate_cache(url)
+        return False
+
+    monkeypatch.setattr(fs, "_not_modified", modified)
+    assert fs.info(urla)["size"] == len(data)
+
+
+def test_infos(server, mocker):
+    import fsspec.implementations.http as http
+
+    spy = mocker.spy(http, "_file_info")
+    headers = {"give_length": "true", "head_ok": "true"}
+    fs = fsspec.filesystem("http", headers=headers, skip_instance_cache=True)
+    urla = server.realfile
+    urlb = server.address + "/index/otherfile"
+    missing = server.address + "/missing"
+    out = fs.infos([urla, urlb, urla], batch_size=2)
+    assert [o["name"] for o in out] == [urla, urlb, urla]
+    assert spy.call_count == 2
+    assert fs.sizes([urla, urlb]) == [len(data)] * 2
+
+    out = fs.infos([urla, missing], on_error="return")
+    assert out[0]["size"] == len(data)
+    assert isinstance(out[1], FileNotFoundError)
+    with pytest.raises(FileNotFoundError):
+        fs.infos([urla, missing])
+
+
 @pytest.mark.parametrize("method", ["POST", "PUT"])
 def test_put_file(server, tmp_path, method, reset_files):
     src_file = tmp_path / "file_1"
@@ -527,6 +778,63 @@ def test_close(get_client):
     fs.close_session(None, asyncio.run(get_client()))
 
 
+def test_connector_kwargs(server):
+    fs = fsspec.filesystem(
+        "http",
+        skip_instance_cache=True,
+        connector_kwargs={"limit": 7, "limit_per_host": 3, "ttl_dns_cache": 60},
+    )
+    session = fsspec.asyn.sync(fs.loop, fs.set_session)
+    assert session.connector.limit == 7
+    assert session.connector.limit_per_host == 3
+    assert "connector_kwargs" not in fs.kwargs
+    assert fs.cat(server.realfile) == data
+
+
+def test_shared_session(server):
+    def session(fs):
+        return fsspec.asyn.sync(fs.loop, fs.set_session)
+
+    fs1 = fsspec.filesystem("http", shared_session=True, headers={"a": "1"})
+    fs2 = fsspec.filesystem("http", shared_session=True, headers={"a": "2"})
+    fs3 = fsspec.filesystem("http", headers={"a": "3"})
+    fs4 = fsspec.filesystem(
+        "http", shared_session=True, connector_kwargs={"limit_per_host": 2}
+    )
+    assert fs1 is not fs2
+    assert session(fs1) is session(fs2)
+    assert session(fs3) is not session(fs1)
+    assert session(fs4) is not session(fs1)
+
+    assert fs1.cat(server.realfile) == data
+    fsspec.asyn.sync(fs1.loop, fs1._session.close)
+    # a closed shared session is replaced, for all its users
+    s = session(fs2)
+    assert not s.closed
+    assert session(fs1) is s
+    assert fs1.cat(server.realfile) == data
+
+    # a single exit hook closes the shared sessions still open
+    import fsspec.implementations.http as http
+
+    http._close_shared_sessions()
+    assert s.closed
+
+
+@pytest.mark.asyncio
+async def test_async_shared_session(server):
+    fs1 = fsspec.filesystem(
+        "http", asynchronous=True, shared_session=True, headers={"a": "1"}
+    )
+    fs2 = fsspec.filesystem(
+        "http", asynchronous=True, shared_session=True, headers={"a": "2"}
+    )
+    session = await fs1.set_session()
+    assert await fs2.set_session() is session
+    assert await fs1._cat_file(server.realfile) == data
+    await session.close()
+
+
 @pytest.mark.asyncio
 async def test_async_file(server):
     fs = fsspec.filesystem("http", asynchronous=True, skip_instance_cache=True)
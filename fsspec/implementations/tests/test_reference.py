@@ -553,6 +553,25 @@ def test_merging(m):
     assert out == {"a": b"e", "b": b"s", "c": other, "d": other[4:10]}
 
 
+def test_merging_many(m):
+    data = bytes(range(256)) * 4
+    m.pipe("/a", data)
+    refs = {f"k{i}": ["memory://a", i * 3, 5] for i in range(300)}
+    refs["whole"] = ["memory://b"]
+    refs["part"] = ["memory://b", 2, 3]
+    m.pipe("/b", b"0123456789")
+    fs = fsspec.filesystem("reference", fo=refs, max_gap=4, max_block=100)
+    out = fs.cat(list(refs))
+    assert out.pop("whole") == b"0123456789"
+    assert out.pop("part") == b"234"
+    assert out == {f"k{i}": data[i * 3 : i * 3 + 5] for i in range(300)}
+
+    out = fs.cat(list(refs), zero_copy=True)
+    assert all(isinstance(v, memoryview) for v in out.values())
+    assert out["k10"] == data[30:35]
+    assert out["part"] == b"234"
+
+
 def test_cat_file_ranges(m):
     other = b"other test data"
     m.pipe("/b", other)
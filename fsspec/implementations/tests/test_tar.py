@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import shutil
+import sys
 import tarfile
 import tempfile
 from io import BytesIO
@@ -291,3 +292,246 @@ def test_ls_with_duplicate_slashes(compression: str, tmp_path: Path):
         # It can be opened both by its normalised name and its original name.
         assert fs.cat("path/with/extra/slash/test.txt") == b"Hello slash!"
         assert fs.cat("path/with/extra/slash//test.txt") == b"Hello slash!"
+
+
+@pytest.mark.parametrize("compression", ["", "gz"], ids=["tar", "tar-gz"])
+def test_index_store(compression, tmp_path, monkeypatch):
+    data = {"a": b"", "b": b"hello", "deeply/nested/path": b"stuff", "c": b"x" * 2000}
+    fn = str(tmp_path / f"test.tar{'.' + compression if compression else ''}")
+    with tarfile.open(fn, mode=f"w:{compression}") as tf:
+        for name, value in data.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(value)
+            tf.addfile(info, BytesIO(value))
+        link = tarfile.TarInfo(name="link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "b"
+        tf.addfile(link)
+    store = str(tmp_path / "index.json")
+
+    fs = TarFileSystem(fn, index_store=store)
+    expected = fs.find("", detail=True)
+    assert os.path.exists(store)
+
+    headers = []
+    next_header = tarfile.TarFile.next
+
+    def counting_next(self):
+        headers.append(1)
+        return next_header(self)
+
+    monkeypatch.setattr(tarfile.TarFile, "next", counting_next)
+    fs = TarFileSystem(fn, index_store=store)
+    assert fs.find("", detail=True) == expected
+    assert fs.cat("c") == data["c"]
+    assert fs.cat("link") == data["b"]
+    # only the first header, read when TarFile is made
+    assert len(headers) == 1
+
+    # changed archive: index is out of date and gets rebuilt
+    with tarfile.open(fn, mode=f"w:{compression}") as tf:
+        info = tarfile.TarInfo(name="new")
+        info.size = 3
+        tf.addfile(info, BytesIO(b"new"))
+    fs = TarFileSystem(fn, index_store=store)
+    assert fs.find("") == ["new"]
+    assert fs.cat("new") == b"new"
+    fs = TarFileSystem(fn, index_store=store)
+    assert fs.cat("new") == b"new"
+
+
+def test_index_store_tmp(tmp_path):
+    fn = str(tmp_path / "test.tar")
+    with temptar(archive_data) as t:
+        shutil.copy(t, fn)
+    fs = TarFileSystem(fn, index_store=True)
+    path = fs._index_path()
+    assert path.startswith(tempfile.gettempdir())
+    assert os.path.exists(path)
+    fs = TarFileSystem(fn, index_store=True)
+    assert fs.cat("deeply/nested/path") == b"stuff"
+    os.remove(path)
+
+    with open(fn, "rb") as f:
+        # no path or filesystem to key the index by
+        fs = TarFileSystem(f, index_store=True)
+        assert fs._index_path() is None
+        assert fs.cat("b") == b"hello"
+
+
+def test_index_store_unkeyed(tmp_path):
+    # open files have no ukey, so an index saved for one could be taken for
+    # that of any other; none is saved or loaded
+    store = str(tmp_path / "index.json")
+    with temptar(archive_data) as t, open(t, "rb") as f:
+        fs = TarFileSystem(f, index_store=store)
+        assert fs.cat("b") == b"hello"
+    assert not os.path.exists(store)
+
+    other = str(tmp_path / "other.tar")
+    with tarfile.open(other, mode="w") as tf:
+        info = tarfile.TarInfo(name="other")
+        info.size = 5
+        tf.addfile(info, BytesIO(b"other"))
+    with open(other, "rb") as f:
+        fs = TarFileSystem(f, index_store=store)
+        assert fs.find("") == ["other"]
+        assert fs.cat("other") == b"other"
+
+
+def compressor(compression):
+    """Function compressing bytes as one gzip member or zstd frame"""
+    if compression == "gzip":
+        import gzip
+
+        return gzip.compress
+    try:
+        if sys.version_info >= (3, 14):
+            from compression import zstd
+        else:
+            from backports import zstd
+        return zstd.compress
+    except ImportError:
+        return pytest.importorskip("zstandard").ZstdCompressor().compress
+
+
+@pytest.mark.parametrize(
+    "compression, members",
+    [("gzip", 1), ("gzip", 4), ("zstd", 4)],
+    ids=["gzip", "multi-gzip", "multi-zstd"],
+)
+def test_seek_index(compression, members, tmp_path, monkeypatch):
+    import random
+
+    from fsspec.implementations.tar import CheckpointedFile
+
+    monkeypatch.setattr(CheckpointedFile, "spacing", 2**16)
+    rng = random.Random(0)
+    data = {f"f{i}": rng.randbytes(50000) for i in range(20)}
+    buf = BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        for name, value in data.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(value)
+            tf.addfile(info, BytesIO(value))
+    raw = buf.getvalue()
+    step = -(-len(raw) // members)
+    compress = compressor(compression)
+    fn = str(tmp_path / ("test.tar.gz" if compression == "gzip" else "test.tar.zst"))
+    with open(fn, "wb") as f:
+        # independently compressed blocks, like bgzip
+        f.writelines(compress(raw[i : i + step]) for i in range(0, len(raw), step))
+    store = str(tmp_path / "index.json")
+
+    fs = TarFileSystem(fn, index_store=store, seek_index=True)
+    assert isinstance(fs.fo, CheckpointedFile)
+    if compression == "gzip":
+        assert len(fs.fo.checkpoints) > 10
+    else:
+        # zstd decompressors cannot be copied, so only frame starts
+        assert len(fs.fo.checkpoints) == members
+    assert len(fs.fo.saved_checkpoints) == members - 1
+    for name in ["f19", "f0", "f10", "f10", "f3"]:
+        assert fs.cat(name) == data[name]
+
+    restarts = []
+    restart = CheckpointedFile._restart
+
+    def recording_restart(self, checkpoint):
+        restarts.append(checkpoint[1])
+        return restart(self, checkpoint)
+
+    monkeypatch.setattr(CheckpointedFile, "_restart", recording_restart)
+    fs = TarFileSystem(fn, index_store=store, seek_index=True)
+    assert fs.cat("f19") == data["f19"]
+    if members > 1:
+        # started from the last saved member start
+        assert restarts[-1] == step * (members - 1)
+    else:
+        assert restarts[-1] == 0
+    assert fs.cat("f18") == data["f18"]
+    assert fs.cat("f19") == data["f19"]
+    # checkpoint taken on the way the first time
+    assert restarts[-1] > len(raw) // 2
+
+
+@pytest.mark.parametrize(
+    "compression, members", [("gzip", 1), ("zstd", 1), ("zstd", 5)]
+)
+def test_checkpointed_file(compression, members):
+    import random
+
+    from fsspec.implementations.tar import CheckpointedFile
+
+    rng = random.Random(1)
+    raw = rng.randbytes(100000) * 5
+    compress = compressor(compression)
+    step = len(raw) // members
+    data = b"".join(compress(raw[i : i + step]) for i in range(0, len(raw), step))
+    f = CheckpointedFile(BytesIO(data), compression, spacing=10000)
+    assert f.read(10) == raw[:10]
+    for _ in range(20):
+        start, size = rng.randrange(len(raw)), rng.randrange(20000)
+        f.seek(start)
+        assert f.read(size) == raw[start : start + size]
+        assert f.tell() == start + len(raw[start : start + size])
+    f.seek(len(raw) - 5)
+    assert f.read() == raw[-5:]
+    assert f.read(10) == b""
+    with pytest.raises(ValueError):
+        f.seek(0, 2)
+    if members > 1:
+        # frame starts, found from the decompressor's eof and unused_data
+        assert f.saved_checkpoints == [
+            [len(compress(raw[:step])) * i, step * i] for i in range(1, members)
+        ]
+
+
+def test_checkpointed_file_max_states(monkeypatch):
+    import gzip
+    import random
+
+    from fsspec.implementations.tar import CheckpointedFile
+
+    monkeypatch.setattr(CheckpointedFile, "max_states", 4)
+    rng = random.Random(2)
+    raw = rng.randbytes(200000)
+    f = CheckpointedFile(BytesIO(gzip.compress(raw)), "gzip", spacing=10000)
+    assert f.read() == raw
+    offsets = [u for _, u, state in f.checkpoints if state is not None]
+    assert 2 <= len(offsets) <= 4
+    assert offsets[-1] > len(raw) // 2
+    for _ in range(10):
+        start = rng.randrange(len(raw))
+        f.seek(start)
+        assert f.read(1000) == raw[start : start + 1000]
+
+
+def test_cat_bulk(tmp_path, monkeypatch):
+    data = {f"dir/{i}": b"member %d " % i * i for i in range(50)}
+    fn = str(tmp_path / "test.tar")
+    with tarfile.open(fn, mode="w") as tf:
+        for name, value in data.items():
+            info = tarfile.TarInfo(name=name)
+            info.size = len(value)
+            tf.addfile(info, BytesIO(value))
+        link = tarfile.TarInfo(name="dir/link")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "0"
+        tf.addfile(link)
+    fs = TarFileSystem(fn)
+    local = fs.of.fs
+
+    calls = []
+    cat_ranges = local.cat_ranges
+
+    def recording_cat_ranges(paths, starts, ends, **kwargs):
+        calls.append(len(paths))
+        return cat_ranges(paths, starts, ends, **kwargs)
+
+    monkeypatch.setattr(local, "cat_ranges", recording_cat_ranges)
+    out = fs.cat(fs.find("dir"))
+    # the link is read through TarFile
+    assert out == dict(data, **{"dir/link": data["dir/0"]})
+    # headers between members are read through, in one range
+    assert calls == [1]
@@ -532,3 +532,100 @@ def test_find_returns_expected_result_recursion_depth_set(zip_file):
 def test_find_generic(zip_file2, args, expected_result):
     zip_file_system = ZipFileSystem(zip_file2)
     assert zip_file_system.find(*args) == expected_result
+
+
+def test_direct_reads(m, monkeypatch):
+    import io
+
+    buf = io.BytesIO()
+    buf.write(b"#!prefix\n")  # as in self-extracting archives
+    with zipfile.ZipFile(buf, "w") as z:
+        z.writestr("a", b"")
+        z.writestr("b", b"hello", compress_type=zipfile.ZIP_DEFLATED)
+        z.writestr("deeply/nested/path", b"stuff" * 100)
+        z.writestr("dir/", b"")
+        z.writestr("bz", b"bzip" * 100, compress_type=zipfile.ZIP_BZIP2)
+        big = os.urandom(10000)
+        z.writestr("big", big)
+        z.writestr("bigz", big, compress_type=zipfile.ZIP_DEFLATED)
+        z.comment = b"comment" * 100
+    m.pipe("/archive.zip", buf.getvalue())
+    ranges = []
+    cat_file = m.cat_file
+
+    def recording_cat_file(path, start=None, end=None, **kwargs):
+        ranges.append((start, end))
+        return cat_file(path, start=start, end=end, **kwargs)
+
+    monkeypatch.setattr(m, "cat_file", recording_cat_file)
+
+    fs = ZipFileSystem("memory://archive.zip", direct_reads=True)
+    assert len(ranges) == 1
+    assert fs.find("", withdirs=True) == [
+        "a",
+        "b",
+        "big",
+        "bigz",
+        "bz",
+        "deeply",
+        "deeply/nested",
+        "deeply/nested/path",
+        "dir",
+    ]
+    assert fs.info("dir")["type"] == "directory"
+    info = fs.info("b")
+    assert info["size"] == 5
+    assert info["compress_type"] == zipfile.ZIP_DEFLATED
+
+    assert fs.cat("b") == b"hello"
+    assert fs.cat("deeply/nested/path") == b"stuff" * 100
+    assert fs.cat("a") == b""
+    assert len(ranges) == 4
+    assert fs._zip is None
+    # not stored or deflated: read by ZipFile
+    assert fs.cat("bz") == b"bzip" * 100
+    assert fs._zip is not None
+
+    # bigger than block_size: inflated as read
+    for name in ["big", "bigz"]:
+        ranges.clear()
+        with fs.open(name, block_size=1000) as f:
+            assert f.size == len(big)
+            assert f.read(10) == big[:10]
+            f.seek(5000)
+            assert f.read() == big[5000:]
+        assert ranges == []
+        assert fs.cat(name) == big
+
+    with pytest.raises(ValueError):
+        ZipFileSystem("memory://archive.zip", mode="a", direct_reads=True)
+
+
+@pytest.mark.parametrize("direct_reads", [True, False])
+def test_cat_bulk(m, monkeypatch, direct_reads):
+    import io
+
+    data = {f"dir/{i}": b"member %d " % i * i for i in range(50)}
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        for name, value in data.items():
+            z.writestr(name, value)
+        z.writestr("bz", b"bzip" * 100, compress_type=zipfile.ZIP_BZIP2)
+    m.pipe("/archive.zip", buf.getvalue())
+    fs = ZipFileSystem("memory://archive.zip", direct_reads=direct_reads)
+
+    calls = []
+    cat_ranges = m.cat_ranges
+
+    def recording_cat_ranges(paths, starts, ends, **kwargs):
+        calls.append(len(paths))
+        return cat_ranges(paths, starts, ends, **kwargs)
+
+    monkeypatch.setattr(m, "cat_ranges", recording_cat_ranges)
+    assert fs.cat(fs.find("dir")) == data
+    # all members merged into one range
+    assert calls == [1]
+
+    out = fs.cat(["dir/3", "bz", "missing"], on_error="omit")
+    # bz is read through ZipFile
+    assert out == {"dir/3": data["dir/3"], "bz": b"bzip" * 100}
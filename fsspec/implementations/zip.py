@@ -1,5 +1,8 @@
+import io
 import os
+import struct
 import zipfile
+import zlib
 
 import fsspec
 from fsspec.archive import AbstractArchiveFileSystem
@@ -16,6 +19,8 @@ class ZipFileSystem(AbstractArchiveFileSystem):
     root_marker = ""
     protocol = "zip"
     cachable = False
+    # end of central directory record, with the longest possible comment
+    tail_size = zipfile.sizeEndCentDir + 2**16
 
     def __init__(
         self,
@@ -26,6 +31,7 @@ class ZipFileSystem(AbstractArchiveFileSystem):
         compression=zipfile.ZIP_STORED,
         allowZip64=True,
         compresslevel=None,
+        direct_reads=False,
         **kwargs,
     ):
         """
@@ -44,6 +50,18 @@ class ZipFileSystem(AbstractArchiveFileSystem):
             a string.
         compression, allowZip64, compresslevel: passed to ZipFile
             Only relevant when creating a ZIP
+        direct_reads: bool
+            For reading an archive on remote storage. If True, the end of
+            the archive and its central directory are fetched with one or
+            two ``cat_file`` calls and parsed into a compact index, and
+            stored or deflated members are read with one ``cat_file`` each,
+            rather than opening the archive with ``ZipFile``, which makes
+            many small reads. Opening a member whose compressed size is
+            bigger than ``block_size`` reads and inflates it as needed,
+            rather than all at once. Encrypted members and other compressions
+            still go through ``ZipFile``. Member details from ``info`` then
+            contain only the fields of the index. Requires mode "r" and
+            ``fo`` to be a URL or ``OpenFile``.
         """
         super().__init__(self, **kwargs)
         if mode not in set("rwa"):
@@ -59,15 +77,33 @@ class ZipFileSystem(AbstractArchiveFileSystem):
             )
         self.force_zip_64 = allowZip64
         self.of = fo
+        self.direct_reads = direct_reads
+        self.dir_cache = None
+        if direct_reads:
+            if mode != "r" or not hasattr(fo, "fs") or not hasattr(fo, "path"):
+                raise ValueError(
+                    "direct_reads requires mode 'r' and fo to be a URL or OpenFile"
+                )
+            self.fo = fo  # opened only if ZipFile is needed
+            self._zip = None
+            self._read_directory()
+            return
+        self._concat = 0  # ZipFile adds it to the offsets it reads
         self.fo = fo.__enter__()  # the whole instance is a context
-        self.zip = zipfile.ZipFile(
+        self._zip = zipfile.ZipFile(
             self.fo,
             mode=mode,
             compression=compression,
             allowZip64=allowZip64,
             compresslevel=compresslevel,
         )
-        self.dir_cache = None
+
+    @property
+    def zip(self):
+        if self._zip is None:
+            # for direct_reads, only made when needed
+            self._zip = zipfile.ZipFile(self.of.__enter__())
+        return self._zip
 
     @classmethod
     def _strip_protocol(cls, path):
@@ -75,17 +111,167 @@ class ZipFileSystem(AbstractArchiveFileSystem):
         return super()._strip_protocol(path).lstrip("/")
 
     def __del__(self):
-        if hasattr(self, "zip"):
+        if getattr(self, "_zip", None) is not None:
             self.close()
-            del self.zip
+            self._zip = None
         if hasattr(self, "of") and hasattr(self.of, "__exit__"):
             self.of.__exit__(None, None, None)
 
     def close(self):
         """Commits any write changes to the file. Done on ``del`` too."""
-        self.zip.close()
+        if self._zip is not None:
+            self._zip.close()
+
+    def _read_directory(self):
+        """Build dir_cache from the central directory, fetched by range"""
+        fs, path = self.of.fs, self.of.path
+        size = fs.size(path)
+        tail_start = max(0, size - self.tail_size)
+        tail = fs.cat_file(path, start=tail_start, end=size)
+        i = tail.rfind(zipfile.stringEndArchive)
+        if i < 0 or len(tail) - i < zipfile.sizeEndCentDir:
+            raise zipfile.BadZipFile("File is not a zip file")
+        *_, cd_size, cd_offset, _ = struct.unpack_from(
+            zipfile.structEndArchive, tail, i
+        )
+        end = tail_start + i
+        loc = i - zipfile.sizeEndCentDir64Locator
+        if loc >= 0 and tail[loc : loc + 4] == zipfile.stringEndArchive64Locator:
+            i = loc - zipfile.sizeEndCentDir64
+            *_, cd_size, cd_offset = struct.unpack_from(
+                zipfile.structEndArchive64, tail, i
+            )
+            end = tail_start + i
+        # bytes prepended to the archive, e.g., for self-extracting ones
+        self._concat = end - cd_size - cd_offset
+        start = cd_offset + self._concat
+        if start >= tail_start:
+            cd = tail[start - tail_start : start - tail_start + cd_size]
+        else:
+            cd = fs.cat_file(path, start=start, end=start + cd_size)
+
+        entries = {}
+        pos = 0
+        while pos + zipfile.sizeCentralDir <= len(cd):
+            rec = struct.unpack_from(zipfile.structCentralDir, cd, pos)
+            if rec[0] != zipfile.stringCentralDir:
+                raise zipfile.BadZipFile("Bad magic number for central directory")
+            flags, method, t, d, crc, csize, usize = rec[5:12]
+            name_len, extra_len, comment_len = rec[12:15]
+            offset = rec[18]
+            pos += zipfile.sizeCentralDir
+            name = cd[pos : pos + name_len]
+            extra = cd[pos + name_len : pos + name_len + extra_len]
+            pos += name_len + extra_len + comment_len
+            name = name.decode("utf-8" if flags & 0x800 else "cp437")
+            if 0xFFFFFFFF in (csize, usize, offset):
+                usize, csize, offset = _zip64_sizes(extra, usize, csize, offset)
+            entries[name.rstrip("/")] = {
+                "name": name.rstrip("/"),
+                "size": usize,
+                "type": "directory" if name.endswith("/") else "file",
+                "filename": name,
+                "compress_size": csize,
+                "compress_type": method,
+                "CRC": crc,
+                "flag_bits": flags,
+                "header_offset": offset,
+                "date_time": (
+                    (d >> 9) + 1980,
+                    (d >> 5) & 0xF,
+                    d & 0x1F,
+                    t >> 11,
+                    (t >> 5) & 0x3F,
+                    (t & 0x1F) * 2,
+                ),
+            }
+        self.dir_cache = {
+            dirname: {"name": dirname, "size": 0, "type": "directory"}
+            for dirname in self._all_dirnames(entries)
+        }
+        self.dir_cache.update(entries)
+
+    def _member_range(self, info):
+        """Range of the local header and data of a member, in the archive"""
+        start = info["header_offset"] + self._concat
+        # the local header's extra field is usually no longer than this
+        guess = zipfile.sizeFileHeader + len(info["filename"].encode()) + 256
+        return start, start + guess + info["compress_size"]
+
+    def _inflate(self, info, data):
+        """Contents of a stored or deflated member, from its range's bytes"""
+        start, _ = self._member_range(info)
+        sig, *_, name_len, extra_len = struct.unpack_from(
+            zipfile.structFileHeader, data
+        )
+        if sig != zipfile.stringFileHeader:
+            raise zipfile.BadZipFile("Bad magic number for file header")
+        data_start = zipfile.sizeFileHeader + name_len + extra_len
+        data = data[data_start : data_start + info["compress_size"]]
+        if len(data) < info["compress_size"]:
+            more = self.of.fs.cat_file(
+                self.of.path,
+                start=start + data_start + len(data),
+                end=start + data_start + info["compress_size"],
+            )
+            data += more
+        if info["compress_type"] == zipfile.ZIP_DEFLATED:
+            data = zlib.decompress(data, -15)
+        if zlib.crc32(data) != info["CRC"]:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {info['name']!r}")
+        return data
+
+    def _cat_member(self, info):
+        """Contents of a stored or deflated member, from one ranged read"""
+        start, end = self._member_range(info)
+        return self._inflate(info, self.of.fs.cat_file(self.of.path, start, end))
+
+    def _stream_member(self, info, block_size=None, cache_options=None):
+        """File-like over a stored or deflated member, read as needed"""
+        f = self.of.fs.open(
+            self.of.path, "rb", block_size=block_size, cache_options=cache_options
+        )
+        start, _ = self._member_range(info)
+        f.seek(start)
+        sig, *_, name_len, extra_len = struct.unpack(
+            zipfile.structFileHeader, f.read(zipfile.sizeFileHeader)
+        )
+        if sig != zipfile.stringFileHeader:
+            f.close()
+            raise zipfile.BadZipFile("Bad magic number for file header")
+        f.seek(name_len + extra_len, 1)
+        zinfo = zipfile.ZipInfo(info["filename"], info["date_time"])
+        zinfo.compress_type = info["compress_type"]
+        zinfo.compress_size = info["compress_size"]
+        zinfo.file_size = info["size"]
+        zinfo.CRC = info["CRC"]
+        zinfo.flag_bits = info["flag_bits"]
+        return zipfile.ZipExtFile(f, "r", zinfo, close_fileobj=True)
+
+    @staticmethod
+    def _direct(info):
+        return (
+            info["type"] == "file"
+            and info["compress_type"] in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+            and not (info["flag_bits"] & 0x1)  # not encrypted
+        )
+
+    def _member_ranges(self, paths):
+        if self.mode != "r" or not hasattr(self.of, "fs"):
+            return {}
+        self._get_dirs()
+        return {
+            path: self._member_range(self.dir_cache[path])
+            for path in paths
+            if path in self.dir_cache and self._direct(self.dir_cache[path])
+        }
+
+    def _decode_member(self, path, data):
+        return self._inflate(self.dir_cache[path], data)
 
     def _get_dirs(self):
+        if self.direct_reads:
+            return
         if self.dir_cache is None or self.mode in set("wa"):
             # when writing, dir_cache is always in the ZipFile's attributes,
             # not read from the file.
@@ -129,6 +315,19 @@ class ZipFileSystem(AbstractArchiveFileSystem):
             raise FileNotFoundError(path)
         if "r" in self.mode and "w" in mode:
             raise OSError("ZipFS can only be open for reading or writing, not both")
+        if self.direct_reads:
+            info = self.info(path)
+            if info["type"] != "file":
+                raise FileNotFoundError(path)
+            if self._direct(info):
+                if info["compress_size"] <= (block_size or self.blocksize):
+                    out = io.BytesIO(self._cat_member(info))
+                else:
+                    out = self._stream_member(info, block_size, cache_options)
+                out.size = info["size"]
+                out.name = info["name"]
+                return out
+            path = info["filename"]
         out = self.zip.open(path, mode.strip("b"), force_zip64=self.force_zip_64)
         if "r" in mode:
             info = self.info(path)
@@ -136,6 +335,13 @@ class ZipFileSystem(AbstractArchiveFileSystem):
             out.name = info["name"]
         return out
 
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        if self.direct_reads and start is None and end is None:
+            info = self.info(path)
+            if self._direct(info):
+                return self._cat_member(info)
+        return super().cat_file(path, start=start, end=end, **kwargs)
+
     def find(self, path, maxdepth=None, withdirs=False, detail=False, **kwargs):
         if maxdepth is not None and maxdepth < 1:
             raise ValueError("maxdepth must be at least 1")
@@ -181,3 +387,21 @@ class ZipFileSystem(AbstractArchiveFileSystem):
                 k: v for k, v in result.items() if k.count("/") < maxdepth + path_depth
             }
         return result if detail else sorted(result)
+
+
+def _zip64_sizes(extra, usize, csize, offset):
+    """Replace the 0xFFFFFFFF placeholders with values from the zip64 extra field"""
+    i = 0
+    while i + 4 <= len(extra):
+        kind, length = struct.unpack_from("<HH", extra, i)
+        if kind == 1:
+            values = iter(struct.unpack_from(f"<{length // 8}Q", extra, i + 4))
+            if usize == 0xFFFFFFFF:
+                usize = next(values)
+            if csize == 0xFFFFFFFF:
+                csize = next(values)
+            if offset == 0xFFFFFFFF:
+                offset = next(values)
+            break
+        i += 4 + length
+    return usize, csize, offset
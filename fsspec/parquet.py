@@ -1,6 +1,9 @@
 import io
 import json
+import threading
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import fsspec
 
@@ -17,6 +20,39 @@ from .utils import merge_offset_ranges
 # on remote file systems.
 
 
+# Bytes needed to read whole footers of the last files read, by dataset
+# directory: {url of directory: deque of sizes}. Only recent files count,
+# so that one unusually large footer does not inflate every later read.
+# Footers are parsed in threads, so access is under _footer_sizes_lock.
+_footer_sizes = {}
+_footer_sizes_lock = threading.Lock()
+_max_footer_sizes = 1024
+_footer_history = 16
+
+
+def _footer_sample_size(fs, path, default):
+    key = fs.unstrip_protocol(fs._parent(path))
+    with _footer_sizes_lock:
+        sizes = _footer_sizes.get(key)
+        if not sizes:
+            return default
+        size = max(sizes)
+    # with some room, as footers in one dataset differ a little
+    return max(default, size + size // 8)
+
+
+def _learn_footer_size(fs, path, size):
+    key = fs.unstrip_protocol(fs._parent(path))
+    with _footer_sizes_lock:
+        sizes = _footer_sizes.pop(key, None)
+        if sizes is None:
+            if len(_footer_sizes) >= _max_footer_sizes:
+                _footer_sizes.pop(next(iter(_footer_sizes)), None)
+            sizes = deque(maxlen=_footer_history)
+        sizes.append(size)
+        _footer_sizes[key] = sizes
+
+
 class AlreadyBufferedFile(AbstractBufferedFile):
     def _fetch_range(self, start, end):
         raise NotImplementedError
@@ -87,7 +123,9 @@ def open_parquet_files(
         Number of bytes to read from the end of the path to look
         for the footer metadata. If the sampled bytes do not contain
         the footer, a second read request will be required, and
-        performance will suffer. Default is 1MB.
+        performance will suffer. Default is 1MB. Footer sizes found
+        in a directory are remembered, and a larger sample is taken
+        from its files next time, if needed.
     filters : list[list], optional
         List of filters to apply to prevent reading row groups, of the
         same format as accepted by the loading engines. Ignored if
@@ -225,29 +263,34 @@ def _get_parquet_byte_ranges(
         data_ends = []
         # Gather file footers.
         # We just take the last `footer_sample_size` bytes of each
-        # file (or the entire file if it is smaller than that)
+        # file (or the entire file if it is smaller than that), or
+        # more, if earlier files in the same directory needed it
         footer_starts = [
-            max(0, file_size - footer_sample_size) for file_size in file_sizes
+            max(0, file_size - _footer_sample_size(fs, path, footer_sample_size))
+            for path, file_size in zip(paths, file_sizes)
         ]
         footer_samples = fs.cat_ranges(paths, footer_starts, file_sizes)
 
-        # Check our footer samples and re-sample if necessary.
+        # Check our footer samples and re-sample if necessary,
+        # all in one more request.
         large_footer = []
         for i, path in enumerate(paths):
             footer_size = int.from_bytes(footer_samples[i][-8:-4], "little")
             real_footer_start = file_sizes[i] - (footer_size + 8)
+            _learn_footer_size(fs, path, footer_size + 8)
             if real_footer_start < footer_starts[i]:
                 large_footer.append((i, real_footer_start))
         if large_footer:
+            needed = max(file_sizes[i] - start for i, start in large_footer)
             warnings.warn(
                 f"Not enough data was used to sample the parquet footer. "
-                f"Try setting footer_sample_size >= {large_footer}."
+                f"Try setting footer_sample_size >= {needed}."
             )
             path0 = [paths[i] for i, _ in large_footer]
             starts = [_[1] for _ in large_footer]
-            ends = [file_sizes[i] - footer_sample_size for i, _ in large_footer]
+            ends = [footer_starts[i] for i, _ in large_footer]
             data = fs.cat_ranges(path0, starts, ends)
-            for i, (path, start, block) in enumerate(zip(path0, starts, data)):
+            for (i, start), block in zip(large_footer, data):
                 footer_samples[i] = block + footer_samples[i]
                 footer_starts[i] = start
         result = {
@@ -257,10 +300,11 @@ def _get_parquet_byte_ranges(
             )
         }
 
-        # Calculate required byte ranges for each path
-        for i, path in enumerate(paths):
+        # Calculate required byte ranges for each path, parsing
+        # footers in threads
+        def plan(i):
             # Use "engine" to collect data byte ranges
-            path_data_starts, path_data_ends = engine._parquet_byte_ranges(
+            return engine._parquet_byte_ranges(
                 columns,
                 row_groups=row_groups,
                 footer=footer_samples[i],
@@ -268,6 +312,12 @@ def _get_parquet_byte_ranges(
                 filters=filters,
             )
 
+        if len(paths) > 1:
+            with ThreadPoolExecutor() as pool:
+                plans = list(pool.map(plan, range(len(paths))))
+        else:
+            plans = list(map(plan, range(len(paths))))
+        for path, (path_data_starts, path_data_ends) in zip(paths, plans):
             data_paths += [path] * len(path_data_starts)
             data_starts += path_data_starts
             data_ends += path_data_ends
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import io
 import json
 import logging
@@ -7,6 +9,8 @@ import os
 import threading
 import warnings
 import weakref
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
 from errno import ESPIPE
 from glob import has_magic
 from hashlib import sha256
@@ -18,6 +22,7 @@ from .dircache import DirCache
 from .transaction import Transaction
 from .utils import (
     _unstrip_protocol,
+    glob_dir_filter,
     glob_translate,
     isfilelike,
     other_paths,
@@ -188,7 +193,8 @@ class AbstractFileSystem(metaclass=_Cached):
 
         Parameters
         ----------
-        use_listings_cache, listings_expiry_time, max_paths:
+        use_listings_cache, listings_expiry_time, max_paths, max_listings_size,
+        compact_listings:
             passed to ``DirCache``, if the implementation supports
             directory listing caching. Pass use_listings_cache=False
             to disable such caching.
@@ -423,6 +429,12 @@ class AbstractFileSystem(metaclass=_Cached):
             return self.dircache[path.rstrip("/")]
         except KeyError:
             pass
+        if isinstance(self.dircache, DirCache):
+            try:
+                # indexed by name, rather than scanning the listing
+                return self.dircache.lookup(parent, path)
+            except KeyError:
+                return None
         try:
             files = [
                 f
@@ -437,7 +449,15 @@ class AbstractFileSystem(metaclass=_Cached):
         except KeyError:
             pass
 
-    def walk(self, path, maxdepth=None, topdown=True, on_error="omit", **kwargs):
+    def walk(
+        self,
+        path,
+        maxdepth=None,
+        topdown=True,
+        on_error="omit",
+        workers=None,
+        **kwargs,
+    ):
         """Return all files under the given path.
 
         List all files, recursing into subdirectories; output is iterator-style,
@@ -468,17 +488,38 @@ class AbstractFileSystem(metaclass=_Cached):
             if omit (default), path with exception will simply be empty;
             If raise, an underlying exception will be raised;
             if callable, it will be called with a single OSError instance as argument
+        workers: int or None
+            If more than one, list up to this many directories at a time in a
+            thread pool, starting on all the subdirectories of each directory
+            once it has been yielded, so that those pruned by the caller are
+            not listed. The output and its order are the same as without;
+            this helps high-latency, blocking filesystems with many
+            directories.
         kwargs: passed to ``ls``
         """
         if maxdepth is not None and maxdepth < 1:
             raise ValueError("maxdepth must be at least 1")
 
         path = self._strip_protocol(path)
-        full_dirs = {}
-        dirs = {}
-        files = {}
-
         detail = kwargs.pop("detail", False)
+        if workers is not None and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                try:
+                    yield from self._walk_listed(
+                        path,
+                        pool.submit(self.ls, path, detail=True, **kwargs),
+                        pool,
+                        maxdepth,
+                        topdown,
+                        on_error,
+                        detail,
+                        **kwargs,
+                    )
+                finally:
+                    # nothing more is needed if the caller stops early
+                    pool.shutdown(wait=False, cancel_futures=True)
+            return
+
         try:
             listing = self.ls(path, detail=True, **kwargs)
         except (FileNotFoundError, OSError) as e:
@@ -488,6 +529,38 @@ class AbstractFileSystem(metaclass=_Cached):
                 on_error(e)
             return
 
+        full_dirs, dirs, files = self._split_listing(path, listing, detail)
+
+        if topdown:
+            # Yield before recursion if walking top down
+            yield path, dirs, files
+
+        if maxdepth is not None:
+            maxdepth -= 1
+            if maxdepth < 1:
+                if not topdown:
+                    yield path, dirs, files
+                return
+
+        for d in dirs:
+            yield from self.walk(
+                full_dirs[d],
+                maxdepth=maxdepth,
+                detail=detail,
+                topdown=topdown,
+                **kwargs,
+            )
+
+        if not topdown:
+            # Yield after recursion if walking bottom up
+            yield path, dirs, files
+
+    @staticmethod
+    def _split_listing(path, listing, detail):
+        """Sort the output of ls into sub-directories and files, for walk"""
+        full_dirs = {}
+        dirs = {}
+        files = {}
         for info in listing:
             # each info name must be at least [path]/part , but here
             # we check also for names like [path]/part/
@@ -506,26 +579,52 @@ class AbstractFileSystem(metaclass=_Cached):
         if not detail:
             dirs = list(dirs)
             files = list(files)
+        return full_dirs, dirs, files
 
-        if topdown:
-            # Yield before recursion if walking top down
-            yield path, dirs, files
+    def _walk_listed(
+        self, path, future, pool, maxdepth, topdown, on_error, detail, **kwargs
+    ):
+        """walk() with workers, given the future listing of ``path``
+
+        The subdirectories left after the caller has seen this directory are
+        all submitted for listing at once, and recursion then follows the
+        same order as the serial walk.
+        """
+        try:
+            listing = future.result()
+        except (FileNotFoundError, OSError) as e:
+            if on_error == "raise":
+                raise
+            if callable(on_error):
+                on_error(e)
+            return
 
+        full_dirs, dirs, files = self._split_listing(path, listing, detail)
         if maxdepth is not None:
             maxdepth -= 1
-            if maxdepth < 1:
-                if not topdown:
-                    yield path, dirs, files
-                return
 
-        for d in dirs:
-            yield from self.walk(
-                full_dirs[d],
-                maxdepth=maxdepth,
-                detail=detail,
-                topdown=topdown,
-                **kwargs,
-            )
+        if topdown:
+            # Yield before recursion if walking top down; as with serial
+            # walk, dirs may then have been changed by the caller
+            yield path, dirs, files
+
+        if maxdepth is None or maxdepth >= 1:
+            futures = {
+                d: pool.submit(self.ls, full_dirs[d], detail=True, **kwargs)
+                for d in dirs
+            }
+            for d, sub in futures.items():
+                yield from self._walk_listed(
+                    full_dirs[d],
+                    sub,
+                    pool,
+                    maxdepth,
+                    topdown,
+                    # as with serial walk, errors below the top are omitted
+                    "omit",
+                    detail,
+                    **kwargs,
+                )
 
         if not topdown:
             # Yield after recursion if walking bottom up
@@ -544,7 +643,8 @@ class AbstractFileSystem(metaclass=_Cached):
         withdirs: bool
             Whether to include directory paths in the output. This is True
             when used by glob, but users usually only want files.
-        kwargs are passed to ``ls``.
+        kwargs are passed to ``walk`` (e.g., ``workers=`` to list directories
+        concurrently) and on to ``ls``.
         """
         # TODO: allow equivalent of -name parameter
         path = self._strip_protocol(path)
@@ -569,6 +669,51 @@ class AbstractFileSystem(metaclass=_Cached):
         else:
             return {name: out[name] for name in names}
 
+    def ifind(self, path, maxdepth=None, withdirs=False, detail=False, **kwargs):
+        """Iterate over all files below path, as each directory is listed
+
+        Like ``find``, but yields each path (or ``(path, info)`` if detail is
+        True) without waiting for the whole tree to be listed, so that memory
+        use does not grow with the number of results, and the caller may stop
+        early. The output is not sorted.
+
+        Parameters
+        ----------
+        path : str
+        maxdepth: int or None
+            If not None, the maximum number of levels to descend
+        withdirs: bool
+            Whether to include directory paths in the output.
+        detail: bool
+            Whether to yield ``(path, info)`` tuples rather than paths.
+        kwargs are passed to ``walk`` and on to ``ls``.
+        """
+        yield from self._iter_find(path, maxdepth, withdirs, detail, **kwargs)
+
+    def _iter_find(self, path, maxdepth, withdirs, detail, may_contain=None, **kwargs):
+        # may_contain: if given, only descend into directories passing this
+        path = self._strip_protocol(path)
+        found = False
+        if withdirs and path != "" and self.isdir(path):
+            found = True
+            yield (path, self.info(path)) if detail else path
+
+        for _, dirs, files in self.walk(path, maxdepth, detail=True, **kwargs):
+            entries = list(files.values())
+            if withdirs:
+                entries.extend(dirs.values())
+            if may_contain is not None:
+                for name, info in list(dirs.items()):
+                    if not may_contain(info["name"]):
+                        del dirs[name]
+            for info in entries:
+                found = True
+                yield (info["name"], info) if detail else info["name"]
+        if not found and self.isfile(path):
+            # walk works on directories, but find should also return [path]
+            # when path happens to be a file
+            yield (path, {}) if detail else path
+
     def du(self, path, total=True, maxdepth=None, withdirs=False, **kwargs):
         """Space used by files and optionally directories within a path
 
@@ -648,22 +793,13 @@ class AbstractFileSystem(metaclass=_Cached):
 
         import re
 
-        seps = (os.path.sep, os.path.altsep) if os.path.altsep else (os.path.sep,)
-        ends_with_sep = path.endswith(seps)  # _strip_protocol strips trailing slash
-        path = self._strip_protocol(path)
-        append_slash_to_dirname = ends_with_sep or path.endswith(
-            tuple(sep + "**" for sep in seps)
-        )
-        idx_star = path.find("*") if path.find("*") >= 0 else len(path)
-        idx_qmark = path.find("?") if path.find("?") >= 0 else len(path)
-        idx_brace = path.find("[") if path.find("[") >= 0 else len(path)
-
-        min_idx = min(idx_star, idx_qmark, idx_brace)
-
         detail = kwargs.pop("detail", False)
         withdirs = kwargs.pop("withdirs", True)
+        path, pattern, root, depth, append_slash_to_dirname = self._glob_plan(
+            path, maxdepth
+        )
 
-        if not has_magic(path):
+        if root is None:
             if self.exists(path, **kwargs):
                 if not detail:
                     return [path]
@@ -674,28 +810,25 @@ class AbstractFileSystem(metaclass=_Cached):
                     return []  # glob of non-existent returns empty
                 else:
                     return {}
-        elif "/" in path[:min_idx]:
-            min_idx = path[:min_idx].rindex("/")
-            root = path[: min_idx + 1]
-            depth = path[min_idx + 1 :].count("/") + 1
-        else:
-            root = ""
-            depth = path[min_idx + 1 :].count("/") + 1
-
-        if "**" in path:
-            if maxdepth is not None:
-                idx_double_stars = path.find("**")
-                depth_double_stars = path[idx_double_stars:].count("/") + 1
-                depth = depth - depth_double_stars + maxdepth
-            else:
-                depth = None
 
-        allpaths = self.find(
-            root, maxdepth=depth, withdirs=withdirs, detail=True, **kwargs
-        )
+        if type(self).find is AbstractFileSystem.find:
+            # find walks the tree; skip directories which cannot match
+            allpaths = dict(
+                self._iter_find(
+                    root,
+                    depth,
+                    withdirs,
+                    True,
+                    may_contain=glob_dir_filter(pattern),
+                    **kwargs,
+                )
+            )
+        else:
+            allpaths = self.find(
+                root, maxdepth=depth, withdirs=withdirs, detail=True, **kwargs
+            )
 
-        pattern = glob_translate(path + ("/" if ends_with_sep else ""))
-        pattern = re.compile(pattern)
+        pattern = re.compile(glob_translate(pattern))
 
         out = {
             p: info
@@ -712,6 +845,81 @@ class AbstractFileSystem(metaclass=_Cached):
         else:
             return list(out)
 
+    def iglob(self, path, maxdepth=None, **kwargs):
+        """Iterate over the paths matching a glob, as directories are listed
+
+        Like ``glob``, but yields each path (or ``(path, info)`` if
+        ``detail=True``) as soon as the directory containing it has been
+        listed, rather than building and sorting the full result, so that the
+        caller may stop early. Directories which cannot contain any match for
+        the pattern, component by component, are not listed at all. The
+        output is not sorted.
+
+        Parameters are as for ``glob``; kwargs are passed to ``ifind``.
+        """
+        if maxdepth is not None and maxdepth < 1:
+            raise ValueError("maxdepth must be at least 1")
+
+        import re
+
+        detail = kwargs.pop("detail", False)
+        withdirs = kwargs.pop("withdirs", True)
+        path, pattern, root, depth, append_slash = self._glob_plan(path, maxdepth)
+        if root is None:
+            if self.exists(path, **kwargs):
+                yield (path, self.info(path, **kwargs)) if detail else path
+            return
+
+        match = re.compile(glob_translate(pattern)).match
+        for p, info in self._iter_find(
+            root,
+            depth,
+            withdirs,
+            True,
+            may_contain=glob_dir_filter(pattern),
+            **kwargs,
+        ):
+            if match(p + "/" if append_slash and info["type"] == "directory" else p):
+                yield (p, info) if detail else p
+
+    def _glob_plan(self, path, maxdepth):
+        """Work out how to traverse for a glob
+
+        Returns the stripped path, the pattern to match, and the root and
+        depth to search from; root is None if the path has no wildcards.
+        Also whether to append "/" to directory names before matching.
+        """
+        seps = (os.path.sep, os.path.altsep) if os.path.altsep else (os.path.sep,)
+        ends_with_sep = path.endswith(seps)  # _strip_protocol strips trailing slash
+        path = self._strip_protocol(path)
+        append_slash_to_dirname = ends_with_sep or path.endswith(
+            tuple(sep + "**" for sep in seps)
+        )
+        pattern = path + ("/" if ends_with_sep else "")
+        if not has_magic(path):
+            return path, pattern, None, None, append_slash_to_dirname
+
+        idx_star = path.find("*") if path.find("*") >= 0 else len(path)
+        idx_qmark = path.find("?") if path.find("?") >= 0 else len(path)
+        idx_brace = path.find("[") if path.find("[") >= 0 else len(path)
+        min_idx = min(idx_star, idx_qmark, idx_brace)
+        if "/" in path[:min_idx]:
+            min_idx = path[:min_idx].rindex("/")
+            root = path[: min_idx + 1]
+            depth = path[min_idx + 1 :].count("/") + 1
+        else:
+            root = ""
+            depth = path[min_idx + 1 :].count("/") + 1
+
+        if "**" in path:
+            if maxdepth is not None:
+                idx_double_stars = path.find("**")
+                depth_double_stars = path[idx_double_stars:].count("/") + 1
+                depth = depth - depth_double_stars + maxdepth
+            else:
+                depth = None
+        return path, pattern, root, depth, append_slash_to_dirname
+
     def exists(self, path, **kwargs):
         """Is there a file at the given path"""
         try:
@@ -744,6 +952,11 @@ class AbstractFileSystem(metaclass=_Cached):
         directory, or something else) and other FS-specific keys.
         """
         path = self._strip_protocol(path)
+        if isinstance(self.dircache, DirCache) and not kwargs.get("refresh"):
+            try:
+                return self.dircache.lookup(self._parent(path), path)[0]
+            except (KeyError, FileNotFoundError):
+                pass
         out = self.ls(self._parent(path), detail=True, **kwargs)
         out = [o for o in out if o["name"].rstrip("/") == path]
         if out:
@@ -1915,6 +2128,7 @@ class AbstractBufferedFile(io.IOBase):
         cache_type="readahead",
         cache_options=None,
         size=None,
+        upload_concurrency=1,
         **kwargs,
     ):
         """
@@ -1940,6 +2154,12 @@ class AbstractBufferedFile(io.IOBase):
             by `cache_type`.
         size: int
             If given and in read mode, suppressed having to look up the file size
+        upload_concurrency: int
+            In write mode, the number of blocks which may be uploading at once.
+            Values above 1 require the class to implement ``_upload_part`` and
+            ``_complete_upload``; full blocks are then handed to a background
+            thread pool (or to the filesystem's event loop, if ``_upload_part``
+            is a coroutine), while writing continues into a new buffer.
         kwargs:
             Gets stored as self.kwargs
         """
@@ -1985,6 +2205,14 @@ class AbstractBufferedFile(io.IOBase):
             self.offset = None
             self.forced = False
             self.location = None
+            self.upload_concurrency = upload_concurrency or 1
+            if self.upload_concurrency > 1 and not self._supports_parts:
+                self.closed = True
+                raise NotImplementedError(
+                    f"{type(self).__name__} does not support concurrent uploads"
+                )
+            self._parts = []
+            self._executor = None
 
     @property
     def details(self):
@@ -2133,6 +2361,10 @@ class AbstractBufferedFile(io.IOBase):
                 self.closed = True
                 raise
 
+        if self.upload_concurrency > 1:
+            self._submit_parts(final=force)
+            return
+
         if self._upload_chunk(final=force) is not False:
             self.offset += self.buffer.seek(0, 2)
             self.buffer = io.BytesIO()
@@ -2148,6 +2380,95 @@ class AbstractBufferedFile(io.IOBase):
         """
         # may not yet have been initialized, may need to call _initialize_upload
 
+    def _upload_part(self, data, part, offset):
+        """Upload one block of a concurrent upload
+
+        Only used when ``upload_concurrency > 1``. May be called from several
+        threads at once, or be a coroutine run on ``self.fs.loop``, and so
+        should not touch the file's buffer.
+
+        Parameters
+        ==========
+        data: bytes
+            Contents of this block
+        part: int
+            Zero-based index of this block within the file
+        offset: int
+            Position of the start of this block within the file
+
+        Returns
+        =======
+        Any value, which is passed on to ``_complete_upload``, in part order
+        """
+        raise NotImplementedError
+
+    def _complete_upload(self, parts):
+        """Finish a concurrent upload, given the outputs of ``_upload_part``"""
+        raise NotImplementedError
+
+    @property
+    def _supports_parts(self):
+        cls = type(self)
+        return (
+            cls._upload_part is not AbstractBufferedFile._upload_part
+            and cls._complete_upload is not AbstractBufferedFile._complete_upload
+        )
+
+    def _submit_parts(self, final=False):
+        """Hand full blocks from the buffer to the background uploader
+
+        Blocks until no more than ``upload_concurrency`` parts are in flight,
+        so that at most that many blocks plus the current buffer are held in
+        memory. If ``final``, all remaining data is sent, every part is waited
+        for, and the upload completed.
+        """
+        self._check_parts()
+        data = self.buffer.getvalue()
+        start = 0
+        while len(data) - start >= self.blocksize or (
+            final and (start < len(data) or not self._parts)
+        ):
+            end = len(data) if final else start + self.blocksize
+            self._wait_parts(self.upload_concurrency - 1)
+            self._parts.append(
+                self._start_part(data[start:end], len(self._parts), self.offset)
+            )
+            self.offset += end - start
+            start = end
+        self.buffer = io.BytesIO()
+        self.buffer.write(data[start:])
+        if final:
+            self._wait_parts(0)
+            self._complete_upload([f.result() for f in self._parts])
+
+    def _start_part(self, data, part, offset):
+        if inspect.iscoroutinefunction(self._upload_part):
+            return asyncio.run_coroutine_threadsafe(
+                self._upload_part(data, part, offset), self.fs.loop
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.upload_concurrency, thread_name_prefix="fsspecUpload"
+            )
+        return self._executor.submit(self._upload_part, data, part, offset)
+
+    def _wait_parts(self, limit):
+        """Wait until no more than ``limit`` parts are still running"""
+        pending = [f for f in self._parts if not f.done()]
+        while len(pending) > limit:
+            wait_futures(pending, return_when=FIRST_COMPLETED)
+            self._check_parts()
+            pending = [f for f in pending if not f.done()]
+        self._check_parts()
+
+    def _check_parts(self):
+        """Raise the first error from any finished part, cancelling the rest"""
+        for f in self._parts:
+            if f.done() and not f.cancelled() and f.exception() is not None:
+                for other in self._parts:
+                    other.cancel()
+                raise f.exception()
+
     def _initiate_upload(self):
         """Create remote file/upload"""
         pass
@@ -2156,6 +2477,22 @@ class AbstractBufferedFile(io.IOBase):
         """Get the specified set of bytes from remote"""
         return self.fs.cat_file(self.path, start=start, end=end)
 
+    def _fetch_ranges(self, ranges):
+        """Get several sets of bytes from remote, concurrently if possible
+
+        Uses the filesystem's ``cat_ranges``, unless ``_fetch_range`` has
+        been specialised by a subclass, in which case that is called for
+        each range.
+        """
+        if type(self)._fetch_range is not AbstractBufferedFile._fetch_range:
+            return [self._fetch_range(start, end) for start, end in ranges]
+        return self.fs.cat_ranges(
+            [self.path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            on_error="raise",
+        )
+
     def read(self, length=-1):
         """
         Return data from cache, or fetch pieces as necessary
@@ -2187,15 +2524,72 @@ class AbstractBufferedFile(io.IOBase):
         self.loc += len(out)
         return out
 
+    def read_ranges(self, ranges):
+        """
+        Read several byte ranges of the file in one call
+
+        The ranges are handed to the cache together, so that overlapping or
+        adjacent ranges are merged and any data not already held is
+        requested in one batch; for async filesystems, the requests run
+        concurrently. The file position is not changed.
+
+        Parameters
+        ----------
+        ranges: list of (int, int)
+            ``(start, end)`` byte offsets, as for ``cat_file``; either may be
+            None, for the start or end of the file.
+
+        Returns
+        -------
+        List of bytes, one for each range, in the order given; ranges beyond
+        the end of the file are truncated.
+        """
+        if self.mode != "rb":
+            raise ValueError("File not in read mode")
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        ranges = [
+            (
+                0 if start is None else start + self.size if start < 0 else start,
+                self.size if end is None else end + self.size if end < 0 else end,
+            )
+            for start, end in ranges
+        ]
+        out = self.cache._fetch_ranges(ranges, self._fetch_ranges)
+        logger.debug(
+            "%s read_ranges: %i ranges %s", self, len(ranges), self.cache._log_stats()
+        )
+        return out
+
     def readinto(self, b):
         """mirrors builtin file's readinto method
 
         https://docs.python.org/3/library/io.html#io.RawIOBase.readinto
         """
         out = memoryview(b).cast("B")
-        data = self.read(out.nbytes)
-        out[: len(data)] = data
-        return len(data)
+        if type(self).read is not AbstractBufferedFile.read:
+            # subclass has its own reading logic
+            data = self.read(out.nbytes)
+            out[: len(data)] = data
+            return len(data)
+        if self.mode != "rb":
+            raise ValueError("File not in read mode")
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        length = min(out.nbytes, self.size - self.loc)
+        if length <= 0:
+            return 0
+        # the cache copies directly into the buffer
+        nbytes = self.cache._fetch_into(self.loc, self.loc + length, out)
+        logger.debug(
+            "%s readinto: %i - %i %s",
+            self,
+            self.loc,
+            self.loc + nbytes,
+            self.cache._log_stats(),
+        )
+        self.loc += nbytes
+        return nbytes
 
     def readuntil(self, char=b"\n", blocks=None):
         """Return data between current position and first occurrence of char
@@ -2281,6 +2675,10 @@ class AbstractBufferedFile(io.IOBase):
                     self.fs.invalidate_cache(self.path)
                     self.fs.invalidate_cache(self.fs._parent(self.path))
         finally:
+            executor = getattr(self, "_executor", None)
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
             self.closed = True
 
     def readable(self):
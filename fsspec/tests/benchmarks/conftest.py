@@ -0,0 +1,111 @@
+import contextlib
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import fsspec
+from fsspec.tests.conftest import HTTPTestHandler
+
+pytest.importorskip("pytest_benchmark")
+
+
+def pytest_collection_modifyitems(config, items):
+    # slow, so only run when asked for
+    if config.getoption("benchmark_only", False):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark-only")
+    here = Path(__file__).parent
+    for item in items:
+        if here in item.path.parents:
+            item.add_marker(skip)
+
+
+FILE_SIZE = 4 * 2**20
+payload = random.Random(0).randbytes(FILE_SIZE)
+
+
+def access_pattern(name, size=FILE_SIZE, n=64):
+    """List of (start, end) reads typical of some kind of workload"""
+    rng = random.Random(42)
+    if name == "sequential":
+        step = size // n
+        return [(i, i + step) for i in range(0, size, step)]
+    if name == "random":
+        return [
+            (off, off + 4096) for off in (rng.randrange(size - 4096) for _ in range(n))
+        ]
+    if name == "strided":
+        stride = size // n
+        return [(i, i + 4096) for i in range(0, size, stride)]
+    if name == "parquet-footer":
+        # length marker, then footer, then a few column chunks
+        chunks = sorted(rng.sample(range(0, size - 2**17, 2**16), 4))
+        return [(size - 8, size), (size - 2**16 - 8, size - 8)] + [
+            (c, c + 2**16) for c in chunks
+        ]
+    raise ValueError(name)
+
+
+patterns = ["sequential", "random", "strided", "parquet-footer"]
+
+
+class LatencyHandler(HTTPTestHandler):
+    """Serves ``payload`` at /payload, sleeping before every response"""
+
+    delay = 0.002
+    files = {"/payload": payload}
+    count = 0
+    lock = threading.Lock()
+
+    def _respond(self, *args, **kwargs):
+        with self.lock:
+            type(self).count += 1
+        time.sleep(self.delay)
+        super()._respond(*args, **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+
+class LatencyServer(ThreadingHTTPServer):
+    # accept bursts of concurrent connections without dropping any
+    request_queue_size = 128
+    daemon_threads = True
+
+
+@contextlib.contextmanager
+def serve_with_latency():
+    httpd = LatencyServer(("", 0), LatencyHandler)
+    th = threading.Thread(target=httpd.serve_forever)
+    th.daemon = True
+    th.start()
+    try:
+        yield f"http://127.0.0.1:{httpd.server_port}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        th.join()
+
+
+@pytest.fixture(scope="module")
+def latency_server():
+    """HTTP server with a fixed delay per request, for concurrency benchmarks"""
+    with serve_with_latency() as address:
+        yield SimpleNamespace(
+            address=address, url=f"{address}/payload", handler=LatencyHandler
+        )
+
+
+@pytest.fixture
+def http_fs():
+    """HTTP filesystem for reading from ``latency_server``"""
+    return fsspec.filesystem(
+        "http",
+        skip_instance_cache=True,
+        headers={"give_length": "true", "head_ok": "true", "use_206": "true"},
+    )
@@ -0,0 +1,69 @@
+import asyncio
+import random
+
+import pytest
+
+import fsspec
+from fsspec.asyn import _run_coros_in_chunks
+from fsspec.tests.benchmarks.conftest import FILE_SIZE, access_pattern, payload
+from fsspec.utils import merge_offset_ranges
+
+
+@pytest.mark.parametrize("n", [1000, 100_000])
+@pytest.mark.parametrize("sort", [True, False])
+def test_merge_offset_ranges(benchmark, n, sort):
+    rng = random.Random(0)
+    paths = [f"file{rng.randrange(10)}" for _ in range(n)]
+    starts = [rng.randrange(2**30) for _ in range(n)]
+    ends = [s + rng.randrange(1, 2**16) for s in starts]
+    benchmark(merge_offset_ranges, paths, starts, ends, max_gap=2**12, sort=sort)
+
+
+@pytest.mark.parametrize("batch_size", [8, 64, 1000, "adaptive"])
+def test_run_coros_in_chunks(benchmark, batch_size):
+    async def work():
+        await asyncio.sleep(0.001)
+
+    def run():
+        return asyncio.run(
+            _run_coros_in_chunks([work() for _ in range(1000)], batch_size=batch_size)
+        )
+
+    benchmark.pedantic(run, rounds=3)
+
+
+@pytest.mark.parametrize("batch_size", [4, 32, "adaptive"])
+def test_http_cat_ranges(benchmark, http_fs, latency_server, batch_size):
+    ranges = access_pattern("random", n=128)
+    n = len(ranges)
+
+    def run():
+        return http_fs.cat_ranges(
+            [latency_server.url] * n,
+            [s for s, _ in ranges],
+            [e for _, e in ranges],
+            batch_size=batch_size,
+        )
+
+    out = benchmark.pedantic(run, rounds=3)
+    assert out[0] == payload[ranges[0][0] : ranges[0][1]]
+
+
+@pytest.mark.parametrize("max_gap", [0, 2**16])
+@pytest.mark.parametrize("pattern", ["sequential", "random", "strided"])
+def test_reference_cat(benchmark, m, pattern, max_gap):
+    m.pipe("/payload", payload)
+    refs = {
+        f"k{i}": ["memory://payload", start, end - start]
+        for i, (start, end) in enumerate(access_pattern(pattern, n=4096))
+    }
+    fs = fsspec.filesystem(
+        "reference",
+        fo=refs,
+        max_gap=max_gap,
+        max_block=FILE_SIZE,
+        skip_instance_cache=True,
+    )
+    keys = list(refs)
+    out = benchmark(fs.cat, keys)
+    assert len(out) == len(keys)
@@ -0,0 +1,112 @@
+import pytest
+
+from fsspec.caching import SharedBlockStore
+from fsspec.spec import AbstractBufferedFile
+from fsspec.tests.benchmarks.conftest import (
+    FILE_SIZE,
+    access_pattern,
+    patterns,
+    payload,
+)
+
+cache_types = ["none", "bytes", "readahead", "blockcache", "background", "mmap"]
+
+
+def read_all(f, ranges):
+    for start, end in ranges:
+        f.seek(start)
+        f.read(end - start)
+
+
+@pytest.mark.parametrize("pattern", patterns)
+@pytest.mark.parametrize("cache_type", cache_types)
+def test_memory_read(benchmark, m, cache_type, pattern):
+    m.pipe("/payload", payload)
+    ranges = access_pattern(pattern)
+
+    def run():
+        with AbstractBufferedFile(
+            m, "/payload", block_size=2**16, cache_type=cache_type
+        ) as f:
+            read_all(f, ranges)
+            return f.cache
+
+    cache = benchmark(run)
+    benchmark.extra_info["requested_bytes"] = cache.total_requested_bytes
+    benchmark.extra_info["misses"] = cache.miss_count
+
+
+@pytest.mark.parametrize("pattern", patterns)
+@pytest.mark.parametrize("cache_type", cache_types)
+def test_memory_read_ranges(benchmark, m, cache_type, pattern):
+    m.pipe("/payload", payload)
+    ranges = access_pattern(pattern)
+
+    def run():
+        with AbstractBufferedFile(
+            m, "/payload", block_size=2**16, cache_type=cache_type
+        ) as f:
+            return f.read_ranges(ranges)
+
+    benchmark(run)
+
+
+@pytest.mark.parametrize("cache_type", ["none", "blockcache", "mmap", "all"])
+def test_memory_readinto(benchmark, m, cache_type):
+    m.pipe("/payload", payload)
+    out = bytearray(FILE_SIZE)
+
+    def run():
+        with AbstractBufferedFile(
+            m, "/payload", block_size=2**20, cache_type=cache_type
+        ) as f:
+            return f.readinto(out)
+
+    assert benchmark(run) == FILE_SIZE
+
+
+@pytest.mark.parametrize("pattern", patterns)
+@pytest.mark.parametrize("cache_type", ["bytes", "blockcache", "background", "mmap"])
+def test_http_read(benchmark, http_fs, latency_server, cache_type, pattern):
+    ranges = access_pattern(pattern, n=16)
+
+    def run():
+        with http_fs.open(
+            latency_server.url, block_size=2**16, cache_type=cache_type
+        ) as f:
+            read_all(f, ranges)
+
+    before = latency_server.handler.count
+    benchmark.pedantic(run, rounds=3)
+    benchmark.extra_info["requests_per_round"] = (
+        latency_server.handler.count - before
+    ) / 3
+
+
+@pytest.mark.parametrize("pattern", patterns)
+def test_http_read_ranges(benchmark, http_fs, latency_server, pattern):
+    ranges = access_pattern(pattern, n=16)
+
+    def run():
+        with http_fs.open(latency_server.url, block_size=2**16, cache_type="mmap") as f:
+            f.read_ranges(ranges)
+
+    benchmark.pedantic(run, rounds=3)
+
+
+def test_http_shared_cache(benchmark, http_fs, latency_server):
+    # several handles on the same file, as when many tasks read one dataset
+    ranges = access_pattern("parquet-footer")
+
+    def run():
+        store = SharedBlockStore()
+        for _ in range(4):
+            with http_fs.open(
+                latency_server.url,
+                block_size=2**16,
+                cache_type="shared",
+                cache_options={"store": store},
+            ) as f:
+                read_all(f, ranges)
+
+    benchmark.pedantic(run, rounds=3)
@@ -35,6 +35,19 @@ def _make_listing(*paths):
     return _make_listing_port
 
 
+def _make_autoindex(baseurl):
+    # Apache, then nginx style
+    return (
+        b'<html><body><pre><a href="?C=N;O=D">Name</a>\n'
+        b'<a href="../">Parent Directory</a>                  -\n'
+        b'<a href="sub/">sub/</a>        2021-03-04 05:06    -\n'
+        b'<a href="realfile">realfile</a>        2021-03-04 05:06  %d\n'
+        b'<a href="big">big</a>        2021-03-04 05:06  1.2M\n'
+        b'<a href="other">other</a>        31-Dec-2021 23:59:58     %d\n'
+        b"</pre></body></html>" % (len(data), len(data))
+    )
+
+
 @pytest.fixture
 def reset_files():
     yield
@@ -54,6 +67,7 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
         "/simple/file": data,
         "/simple/dir/": _make_listing("/simple/dir/file"),
         "/simple/dir/file": data,
+        "/autoindex/": _make_autoindex,
         "/unauthorized": AssertionError("shouldn't access"),
     }
     dynamic_files = {}
@@ -96,7 +110,10 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
         if ("Range" in self.headers) and ("ignore_range" not in self.headers):
             ran = self.headers["Range"]
             b, ran = ran.split("=")
-            start, end = ran.split("-")
+            if "," in ran and "multi_range" in self.headers:
+                return self._respond_multi_range(ran.split(","), file_data)
+            # servers that do not do multiple ranges just serve the first
+            start, end = ran.split(",")[0].split("-")
             if start:
                 content_range = f"bytes {start}-{end}/{len(file_data)}"
                 file_data = file_data[int(start) : (int(end) + 1) if end else None]
@@ -126,6 +143,22 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
         else:
             self._respond(status, data=file_data)
 
+    def _respond_multi_range(self, ranges, file_data):
+        boundary = "THIS_STRING_SEPARATES"
+        body = []
+        for ran in ranges:
+            start, end = (int(x) for x in ran.split("-"))
+            end = min(end, len(file_data) - 1)
+            body.append(
+                f"--{boundary}\r\nContent-Type: text/plain\r\n"
+                f"Content-Range: bytes {start}-{end}/{len(file_data)}\r\n\r\n".encode()
+                + file_data[start : end + 1]
+                + b"\r\n"
+            )
+        body.append(f"--{boundary}--\r\n".encode())
+        headers = {"Content-Type": f"multipart/byteranges; boundary={boundary}"}
+        self._respond(206, headers, b"".join(body))
+
     def do_POST(self):
         length = self.headers.get("Content-Length")
         file_path = self.path.rstrip("/")
@@ -173,7 +206,9 @@ class HTTPTestHandler(BaseHTTPRequestHandler):
                 r_headers["Content-Length"] = len(file_data)
         elif "give_range" in self.headers:
             r_headers["Content-Range"] = f"0-{len(file_data) - 1}/{len(file_data)}"
-        elif "give_etag" in self.headers:
+        if "give_etag" in self.headers:
+            if self.headers.get("If-None-Match") == "xxx":
+                return self._respond(304, {"ETag": "xxx"})
             r_headers["ETag"] = "xxx"
 
         if self.headers.get("accept_range") == "none":
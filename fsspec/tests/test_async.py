@@ -138,6 +138,69 @@ def test_run_coros_in_chunks(monkeypatch):
     assert sum(asyncio.run(main())) == 32  # override
 
 
+def test_run_coros_in_chunks_adaptive(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def runner(i, fail=False):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if fail:
+            raise asyncio.TimeoutError
+        return i
+
+    async def main(coros, **kwargs):
+        nonlocal peak
+        peak = 0
+        return await _run_coros_in_chunks(coros, batch_size="adaptive", **kwargs)
+
+    monkeypatch.setitem(fsspec.config.conf, "gather_batch_size", 64)
+    out = asyncio.run(main([runner(i) for i in range(500)]))
+    assert out == list(range(500))
+    assert 8 < peak <= 64
+
+    # every coroutine is throttled, so the limit never grows
+    coros = [runner(i, fail=True) for i in range(100)]
+    out = asyncio.run(main(coros, return_exceptions=True))
+    assert all(isinstance(o, asyncio.TimeoutError) for o in out)
+    assert peak == 8
+
+    monkeypatch.setitem(fsspec.config.conf, "gather_batch_size", "adaptive")
+    out = asyncio.run(_run_coros_in_chunks([runner(i) for i in range(50)]))
+    assert out == list(range(50))
+
+    # still bounded by the default batch size
+    monkeypatch.setattr(fsspec.asyn, "_default_batch_size", lambda nofiles: 16)
+    peak = 0
+    out = asyncio.run(_run_coros_in_chunks([runner(i) for i in range(500)]))
+    assert out == list(range(500))
+    assert 8 < peak <= 16
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit():
+    limit = fsspec.asyn._AdaptiveLimit(maximum=100, initial=4)
+    for _ in range(4):
+        limit.record(0.01)
+    assert limit.limit == 8
+    limit.record(0.01, asyncio.TimeoutError())
+    assert limit.limit == 4
+    limit.record(0.01, asyncio.TimeoutError())
+    assert limit.limit == 4  # at most once per window
+    assert not limit.slow_start
+    for _ in range(4):
+        limit.record(0.01)
+    assert limit.limit == 5
+    for _ in range(5):
+        limit.record(1)  # latency far above best
+    assert limit.limit == 2
+    limit.record(0.01, ValueError())
+    assert limit.limit == 2
+
+
 def test_running_async():
     assert not fsspec.asyn.running_async()
 
@@ -438,3 +501,62 @@ async def test_expand_path_with_magic_input_async():
         "bucket/file?.txt",
     ]
     assert sorted(paths) == sorted(expected)
+
+
+class _TreeFS(fsspec.asyn.AsyncFileSystem):
+    """AsyncFileSystem over a fixed set of file paths, recording listings"""
+
+    protocol = "treemock"
+    files = ["a/x/1.csv", "a/x/2.txt", "a/y/1.csv", "b/1.csv", "top.csv"]
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.listed = []
+
+    async def _ls(self, path, detail=True, **kwargs):
+        self.listed.append(path)
+        prefix = path.rstrip("/") + "/" if path else ""
+        names = {
+            prefix + f[len(prefix) :].split("/", 1)[0]
+            for f in self.files
+            if f.startswith(prefix)
+        }
+        out = [await self._info(n) for n in sorted(names)]
+        return out if detail else [o["name"] for o in out]
+
+    async def _info(self, path, **kwargs):
+        if path in self.files:
+            return {"name": path, "type": "file", "size": 0}
+        if any(f.startswith(path + "/") for f in self.files):
+            return {"name": path, "type": "directory", "size": 0}
+        raise FileNotFoundError(path)
+
+
+@pytest.mark.asyncio
+async def test_async_ifind_iglob():
+    fs = _TreeFS(skip_instance_cache=True, asynchronous=True)
+    out = [p async for p in fs._ifind("a")]
+    assert sorted(out) == await fs._find("a")
+
+    fs.listed.clear()
+    out = [p async for p in fs._iglob("a/x/*.csv")]
+    assert out == ["a/x/1.csv"]
+    assert fs.listed == ["a/x"]
+
+    fs.listed.clear()
+    out = {p: info async for p, info in fs._iglob("*/x/*.csv", detail=True)}
+    assert fs.listed == ["", "a", "a/x", "b"]
+    assert out == await fs._glob("*/x/*.csv", detail=True)
+
+    gen = fs._iglob("**/*.csv")
+    assert await gen.__anext__() == "top.csv"
+    await gen.aclose()
+
+
+def test_glob_prunes_listing():
+    fs = _TreeFS(skip_instance_cache=True)
+    assert fs.glob("*/y/*.csv") == ["a/y/1.csv"]
+    assert fs.listed == ["", "a", "a/y", "b"]
+    fs.listed.clear()
+    assert fs.glob("a/**/1.csv") == ["a/x/1.csv", "a/y/1.csv"]
+    assert fs.listed == ["a", "a/x", "a/y"]
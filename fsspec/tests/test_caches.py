@@ -9,8 +9,11 @@ from fsspec.caching import (
     FirstChunkCache,
     MMapCache,
     ReadAheadCache,
+    SharedBlockCache,
+    SharedBlockStore,
     caches,
     register_cache,
+    shared_block_store,
 )
 from fsspec.implementations.cached import WholeFileCacheFileSystem
 
@@ -247,6 +250,111 @@ def test_cache_basic(Cache_imp, blocksize, size_requests):
         assert result == expected
 
 
+def test_cache_fetch_ranges(Cache_imp, mocker):
+    size = len(string.ascii_letters)
+    fetcher = mocker.Mock(wraps=letters_fetcher)
+    multi_fetcher = mocker.Mock(wraps=multi_letters_fetcher)
+    cache = Cache_imp(5, fetcher, size)
+    if Cache_imp is BackgroundBlockCache:
+        # don't count reading ahead
+        cache._thread_executor.submit = mocker.Mock()
+    fetcher.reset_mock()
+    ranges = [(3, 12), (40, 45), (8, 10), (50, 60), (20, 20), (60, 70)]
+    out = cache._fetch_ranges(ranges, multi_fetcher)
+    assert out == [string.ascii_letters[s:e].encode() for s, e in ranges]
+    # everything comes from at most one batch
+    assert fetcher.call_count == 0
+    assert multi_fetcher.call_count <= 1
+
+
+def test_cache_fetch_into(Cache_imp):
+    cache = Cache_imp(5, letters_fetcher, len(string.ascii_letters))
+    # second time around, from cache
+    for start, end in [(0, 5), (3, 17), (40, 52), (51, 52)] * 2:
+        out = bytearray(20)
+        n = cache._fetch_into(start, end, memoryview(out)[1:])
+        assert n == end - start
+        assert out[1 : n + 1] == letters_fetcher(start, end)
+        assert out[0] == out[n + 1] == 0
+
+
+@pytest.mark.parametrize("cache_type", ["all", "blockcache", "bytes", "mmap", "parts"])
+def test_cache_fetch_into_no_copy(cache_type, mocker):
+    kw = (
+        {"data": {(0, 52): string.ascii_letters.encode()}}
+        if cache_type == "parts"
+        else {}
+    )
+    cache = caches[cache_type](20, letters_fetcher, len(string.ascii_letters), **kw)
+    cache._fetch(0, 5)  # fill in cache
+    mocker.patch.object(cache, "_fetch", side_effect=AssertionError)
+    out = bytearray(10)
+    assert cache._fetch_into(2, 12, memoryview(out)) == 10
+    assert out == letters_fetcher(2, 12)
+
+
+def test_block_cache_fetch_into_counts():
+    reads = [(0, 2), (0, 2), (3, 9), (12, 13), (0, 2)]
+    by_fetch = BlockCache(4, letters_fetcher, 52, maxblocks=2)
+    by_fetch_into = BlockCache(4, letters_fetcher, 52, maxblocks=2)
+    for start, end in reads:
+        by_fetch._fetch(start, end)
+        by_fetch_into._fetch_into(start, end, memoryview(bytearray(end - start)))
+    assert (by_fetch_into.hit_count, by_fetch_into.miss_count) == (5, 5)
+    assert (by_fetch.hit_count, by_fetch.miss_count) == (5, 5)
+
+
+def test_bytes_cache_fetch_into_to_end(mocker):
+    fetcher = mocker.Mock(wraps=letters_fetcher)
+    cache = caches["bytes"](5, fetcher, 52)
+    cache._fetch(0, 5)  # buffer holds 0:10
+    assert cache.end == 10
+    out = bytearray(5)
+    assert cache._fetch_into(5, 10, memoryview(out)) == 5
+    assert out == letters_fetcher(5, 10)
+    assert fetcher.call_count == 1
+    assert cache.hit_count == 1
+
+
+@pytest.mark.parametrize("Cache_imp", [BlockCache, MMapCache, SharedBlockCache])
+def test_cache_fetch_ranges_keeps_blocks(Cache_imp, mocker):
+    fetcher = mocker.Mock(wraps=letters_fetcher)
+    multi_fetcher = mocker.Mock(wraps=multi_letters_fetcher)
+    cache = Cache_imp(5, fetcher, len(string.ascii_letters))
+    cache._fetch(0, 4)
+    cache._fetch_ranges([(3, 12), (22, 24), (26, 29)], multi_fetcher)
+    # only blocks not already held are requested, one range per run of blocks
+    assert multi_fetcher.call_args[0][0] == [(5, 15), (20, 30)]
+    assert cache._fetch(4, 14) == letters_fetcher(4, 14)
+    assert cache._fetch(21, 29) == letters_fetcher(21, 29)
+    assert fetcher.call_count == 1
+    assert cache._fetch_ranges([(6, 7)], multi_fetcher) == [b"g"]
+    assert multi_fetcher.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "cache_type, kw, later",
+    [
+        ("readahead", {}, (46, 49)),
+        ("bytes", {}, (46, 49)),
+        ("first", {}, (1, 4)),
+        ("blockcache", {"maxblocks": 2}, (46, 49)),
+        ("background", {"maxblocks": 2}, (46, 49)),
+    ],
+)
+def test_cache_fetch_ranges_then_read(cache_type, kw, later, mocker):
+    fetcher = mocker.Mock(wraps=letters_fetcher)
+    cache = caches[cache_type](5, fetcher, len(string.ascii_letters), **kw)
+    if cache_type == "background":
+        cache._thread_executor.submit = mocker.Mock()
+    ranges = [(1, 3), (22, 24), (45, 50)]
+    out = cache._fetch_ranges(ranges, multi_letters_fetcher)
+    assert out == [letters_fetcher(start, end) for start, end in ranges]
+    # more blocks were needed than maxblocks, but the last ones were kept
+    assert cache._fetch(*later) == letters_fetcher(*later)
+    assert fetcher.call_count == 0
+
+
 @pytest.mark.parametrize("strict", [True, False])
 @pytest.mark.parametrize("sort", [True, False])
 def test_known(strict, sort):
@@ -338,6 +446,76 @@ def test_background_shutdown_on_close():
     assert cache_ref() is None
 
 
+def test_shared_cache_single_flight():
+    import threading
+    import time
+
+    store = SharedBlockStore(max_bytes=20)
+    calls = []
+
+    def slow_fetcher(start, end):
+        calls.append((start, end))
+        time.sleep(0.05)
+        return letters_fetcher(start, end)
+
+    size = len(string.ascii_letters)
+    results = []
+
+    def read():
+        cache = SharedBlockCache(5, slow_fetcher, size, key="letters", store=store)
+        results.append(cache._fetch(3, 12))
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert results == [letters_fetcher(3, 12)] * 8
+    assert sorted(calls) == [(0, 5), (5, 10), (10, 15)]
+    assert store.cache_info().currbytes == 15
+
+    # LRU eviction by bytes: the oldest block is dropped
+    cache = SharedBlockCache(5, slow_fetcher, size, key="letters", store=store)
+    assert cache._fetch(15, 22) == letters_fetcher(15, 22)
+    info = store.cache_info()
+    assert info.currbytes <= 20
+    assert info.currsize == 4
+    calls.clear()
+    assert cache._fetch(5, 15) == letters_fetcher(5, 15)
+    assert calls == []
+    assert cache._fetch(0, 2) == letters_fetcher(0, 2)
+    assert calls == [(0, 5)]
+
+    # other keys are separate
+    other = SharedBlockCache(5, _fetcher, 100, key="zeros", store=store)
+    assert other._fetch(0, 5) == b"00000"
+
+
+def test_shared_cache_errors():
+    store = SharedBlockStore()
+
+    def bad_fetcher(start, end):
+        raise OSError("nope")
+
+    cache = SharedBlockCache(5, bad_fetcher, 50, key="bad", store=store)
+    with pytest.raises(OSError):
+        cache._fetch(0, 5)
+    cache.fetcher = _fetcher
+    assert cache._fetch(0, 5) == b"00000"
+
+
+def test_shared_cache_files(server):
+    import fsspec
+
+    shared_block_store.clear()
+    h = fsspec.filesystem("http", headers={"head_ok": "true", "give_length": "true"})
+    f1 = h.open(server.realfile, block_size=10, cache_type="shared")
+    f2 = h.open(server.realfile, block_size=10, cache_type="shared")
+    assert f1.cache.key == f2.cache.key
+    assert f1.read(25) == f2.read(25)
+    assert f1.cache.miss_count == 3
+    assert f2.cache.miss_count == 0
+    assert f2.cache.hit_count == 3
+
+
 def test_register_cache():
     # just test that we have them populated and fail to re-add again unless overload
     with pytest.raises(ValueError):
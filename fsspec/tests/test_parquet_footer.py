@@ -0,0 +1,57 @@
+"""Tests of fsspec.parquet which need no parquet engine"""
+
+import pytest
+
+from fsspec import parquet
+from fsspec.implementations.memory import MemoryFileSystem
+from fsspec.parquet import _get_parquet_byte_ranges
+
+
+@pytest.mark.filterwarnings("ignore:.*Not enough data.*")
+def test_footer_sample_size_learned(monkeypatch):
+    monkeypatch.setattr(parquet, "_footer_sizes", {})
+
+    class RecordingEngine:
+        footers = []
+
+        def _parquet_byte_ranges(self, columns, footer=None, **kwargs):
+            self.footers.append(footer)
+            return [4], [8]
+
+    fs = MemoryFileSystem()
+    footer = b"footer" * 100
+    files = {}
+    for i in range(3):
+        path = f"/learned/part.{i}.parquet"
+        files[path] = b"PAR1data" + footer + len(footer).to_bytes(4, "little") + b"PAR1"
+        fs.pipe(path, files[path])
+    calls = []
+    cat_ranges = fs.cat_ranges
+
+    def recording_cat_ranges(paths, starts, ends, **kwargs):
+        calls.append(paths)
+        return cat_ranges(paths, starts, ends, **kwargs)
+
+    monkeypatch.setattr(fs, "cat_ranges", recording_cat_ranges)
+    paths = list(files)
+    _get_parquet_byte_ranges(
+        paths[:2], fs, columns=["x"], engine=RecordingEngine(), footer_sample_size=8
+    )
+    # footers, footers again in full for both files, then data
+    assert calls == [paths[:2]] * 3
+    assert all(f.endswith(files[paths[0]][8:]) for f in RecordingEngine.footers)
+
+    calls.clear()
+    result = _get_parquet_byte_ranges(
+        paths, fs, columns=["x"], engine=RecordingEngine(), footer_sample_size=8
+    )
+    # the larger size is used from the start
+    assert calls == [paths, paths]
+    assert result[paths[2]][(4, 8)] == b"data"
+
+    # the learned size is forgotten once enough files with small footers follow
+    assert parquet._footer_sample_size(fs, paths[0], 16) > len(footer)
+    for _ in range(parquet._footer_history):
+        parquet._learn_footer_size(fs, paths[0], 16)
+    assert parquet._footer_sample_size(fs, paths[0], 16) == 18
+    fs.rm("/learned", recursive=True)
@@ -1,9 +1,12 @@
+import asyncio
 import glob
 import json
 import os
 import pickle
 import subprocess
 import sys
+import threading
+import time
 from collections import defaultdict
 from pathlib import Path
 
@@ -11,6 +14,7 @@ import numpy as np
 import pytest
 
 import fsspec
+from fsspec.dircache import DirCache
 from fsspec.implementations.ftp import FTPFileSystem
 from fsspec.implementations.http import HTTPFileSystem
 from fsspec.implementations.local import LocalFileSystem
@@ -733,6 +737,61 @@ def test_find_file():
     assert test_fs.find(filename, detail=True) == {filename: {}}
 
 
+class SlowListingFS(DummyTestFS):
+    """Sleeps in ls, recording the most calls ever in flight"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.active = self.most = 0
+        self.listed = []
+
+    def ls(self, path, detail=True, **kwargs):
+        if path == "missing":
+            raise FileNotFoundError(path)
+        with self.lock:
+            self.listed.append(path)
+            self.active += 1
+            self.most = max(self.most, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return super().ls(path, detail=detail, **kwargs)
+
+
+@pytest.mark.parametrize("topdown", [True, False])
+@pytest.mark.parametrize("maxdepth", [None, 1, 2])
+@pytest.mark.parametrize("detail", [True, False])
+def test_walk_workers(topdown, maxdepth, detail):
+    fs = SlowListingFS(skip_instance_cache=True)
+    kw = {"topdown": topdown, "maxdepth": maxdepth, "detail": detail}
+    expected = list(fs.walk("", **kw))
+    assert fs.most == 1
+    assert list(fs.walk("", workers=4, **kw)) == expected
+    if maxdepth != 1:
+        assert fs.most > 1
+    assert fs.find("", workers=4) == fs.find("")
+
+
+def test_walk_workers_prune_and_errors():
+    fs = SlowListingFS(skip_instance_cache=True)
+    out = []
+    for path, dirs, _ in fs.walk("", workers=4):
+        out.append(path)
+        time.sleep(0.02)  # any listing already submitted would start
+        if "second_level" in dirs:
+            dirs.remove("second_level")
+    assert out == ["", "misc", "top_level"]
+    # pruned before being listed
+    assert sorted(fs.listed) == ["", "misc", "top_level"]
+
+    with pytest.raises(FileNotFoundError):
+        list(fs.walk("missing", workers=4, on_error="raise"))
+    errors = []
+    assert list(fs.walk("missing", workers=4, on_error=errors.append)) == []
+    assert isinstance(errors[0], FileNotFoundError)
+
+
 def test_cache():
     fs = DummyTestFS()
     fs2 = DummyTestFS()
@@ -995,6 +1054,87 @@ def tests_file_open_error(monkeypatch):
             stream.write(b"hello" * stream.blocksize * 2)
 
 
+class PartsBufferedFile(AbstractBufferedFile):
+    fail_part = None
+
+    def _initiate_upload(self):
+        self.uploaded = {}
+        self.completed = None
+
+    def _upload_part(self, data, part, offset):
+        time.sleep(0.01 * (part % 3))
+        if part == self.fail_part:
+            raise ValueError(part)
+        self.uploaded[part] = (offset, data)
+        return part
+
+    def _complete_upload(self, parts):
+        self.completed = parts
+
+
+def test_upload_concurrency():
+    fs = DummyTestFS()
+    f = PartsBufferedFile(
+        fs, "misc/foo.txt", mode="wb", block_size=10, upload_concurrency=3
+    )
+    for i in range(7):
+        f.write(bytes([i]) * 7)
+    f.close()
+    assert f.completed == list(range(5))
+    out = b"".join(f.uploaded[i][1] for i in f.completed)
+    assert out == b"".join(bytes([i]) * 7 for i in range(7))
+    assert [f.uploaded[i][0] for i in f.completed] == [0, 10, 20, 30, 40]
+    assert f._executor is None
+
+
+def test_upload_concurrency_empty():
+    fs = DummyTestFS()
+    f = PartsBufferedFile(fs, "misc/foo.txt", mode="wb", upload_concurrency=2)
+    f.close()
+    assert f.completed == [0]
+    assert f.uploaded == {0: (0, b"")}
+
+
+def test_upload_concurrency_error():
+    fs = DummyTestFS()
+    with pytest.raises(ValueError, match="2"):
+        with PartsBufferedFile(
+            fs, "misc/foo.txt", mode="wb", block_size=10, upload_concurrency=2
+        ) as f:
+            f.fail_part = 2
+            f.write(b"0" * 100)
+    assert f.closed
+    assert f.completed is None
+
+
+def test_upload_concurrency_async():
+    from fsspec.asyn import get_loop
+
+    class AsyncPartsFile(PartsBufferedFile):
+        async def _upload_part(self, data, part, offset):
+            await asyncio.sleep(0.01 * (part % 3))
+            return offset, data
+
+    fs = DummyTestFS()
+    fs.loop = get_loop()
+    with AsyncPartsFile(
+        fs, "misc/foo.txt", mode="wb", block_size=10, upload_concurrency=4
+    ) as f:
+        f.write(b"0123456789" * 3 + b"abc")
+    assert f.completed == [
+        (0, b"0123456789"),
+        (10, b"0123456789"),
+        (20, b"0123456789"),
+        (30, b"abc"),
+    ]
+
+
+def test_upload_concurrency_unsupported():
+    fs = DummyTestFS()
+    with pytest.raises(NotImplementedError):
+        AbstractBufferedFile(fs, "misc/foo.txt", mode="wb", upload_concurrency=2)
+
+
 def test_eq():
     fs = DummyTestFS()
     result = fs == 1
@@ -1240,6 +1380,136 @@ def test_ls_from_cache():
     )
 
 
+def test_dircache_lookup():
+    dc = DirCache()
+    with pytest.raises(KeyError):
+        dc.lookup("a", "a/b")
+    dc["a"] = [
+        {"name": "a/b", "type": "file", "size": 1},
+        {"name": "a/c", "type": "directory", "size": 0},
+    ]
+    assert dc.lookup("a", "a/b")[0]["size"] == 1
+    assert dc.lookup("a", "a/c/")[0]["type"] == "directory"
+    with pytest.raises(FileNotFoundError):
+        dc.lookup("a", "a/b/")
+    with pytest.raises(FileNotFoundError):
+        dc.lookup("a", "a/d")
+
+    # a listing changed in place is seen once stored again, even if its
+    # length is unchanged
+    listing = dc["a"]
+    listing[0] = {"name": "a/d", "type": "file", "size": 2}
+    dc["a"] = listing
+    assert dc.lookup("a", "a/d")[0]["size"] == 2
+    with pytest.raises(FileNotFoundError):
+        dc.lookup("a", "a/b")
+
+
+def test_dircache_invalidate_subtree():
+    dc = DirCache()
+    for key in ["", "a", "a/b", "a/b/c", "a-b", "a0", "ab"]:
+        dc[key] = []
+    dc.invalidate("a/")
+    assert sorted(dc) == ["", "a-b", "a0", "ab"]
+    dc["a/b"] = []
+    assert "a/b" in dc
+    dc.invalidate()
+    assert not list(dc)
+
+
+def test_dircache_update_tree():
+    from fsspec.implementations.memory import MemoryFileSystem
+
+    fs = MemoryFileSystem()
+    fs.mkdir("/tree/empty")
+    fs.pipe({"/tree/a/b/c": b"data", "/tree/d": b"da"})
+    entries = fs.find("/tree", withdirs=True, detail=True).values()
+    # as if from a backend that only lists files, with directories implied
+    files = [e for e in entries if e["type"] == "file"]
+
+    dc = DirCache()
+    dc.update_tree("/tree", files, fs._parent)
+    assert sorted(dc) == ["/tree", "/tree/a", "/tree/a/b"]
+    assert {e["name"] for e in dc["/tree"]} == {"/tree/a", "/tree/d"}
+    assert dc.lookup("/tree/a", "/tree/a/b")[0]["type"] == "directory"
+
+    dc.update_tree("/tree", entries, fs._parent)
+    assert dc["/tree/empty"] == []
+    assert dc.lookup("/tree/a/b", "/tree/a/b/c")[0]["size"] == 4
+
+
+def test_dircache_lru_on_read():
+    dc = DirCache(max_paths=2)
+    dc["a"] = []
+    dc["b"] = []
+    dc["a"]  # now b is least recently used
+    dc["c"] = []
+    assert sorted(dc) == ["a", "c"]
+    assert "b" not in dc
+    dc.invalidate("a")
+    assert list(dc) == ["c"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_dircache_max_listings_size(compact):
+    def listing(path, n):
+        return [
+            {"name": f"{path}/file{i}", "size": i, "type": "file"} for i in range(n)
+        ]
+
+    dc = DirCache(max_listings_size=2**40, compact_listings=compact)
+    dc["small"] = listing("small", 10)
+    small = dc.nbytes
+    dc["big"] = listing("big", 1000)
+    big = dc.nbytes - small
+    assert big > 50 * small
+
+    dc = DirCache(max_listings_size=big + 2 * small, compact_listings=compact)
+    dc["s1"] = listing("s1", 10)
+    dc["big"] = listing("big", 1000)
+    dc["s1"]
+    dc["s2"] = listing("s2", 10)
+    dc["s3"] = listing("s3", 10)  # over budget: drops "big", not "s1"
+    assert sorted(dc) == ["s1", "s2", "s3"]
+    assert dc.nbytes <= dc.max_listings_size
+    assert dc["s1"] == listing("s1", 10)
+    assert dc.lookup("s2", "s2/file3") == [listing("s2", 10)[3]]
+
+    dc["huge"] = listing("huge", 10000)  # never fits
+    assert "huge" not in dc
+    assert "s1" in dc
+
+
+def test_dircache_compact_listings():
+    dc = DirCache(compact_listings=True)
+    entries = [
+        {"name": "a/b", "type": "file", "size": 1},
+        {"name": "a/c", "type": "directory", "size": 0, "extra": None},
+    ]
+    dc["a"] = entries
+    assert dc["a"] == entries
+    assert dc["a"] is not dc["a"]
+    assert dc.lookup("a", "a/c/") == [entries[1]]
+    with pytest.raises(FileNotFoundError):
+        dc.lookup("a", "a/d")
+    dc2 = pickle.loads(pickle.dumps(dc))
+    assert dc2.compact_listings
+    assert not list(dc2)
+
+
+def test_info_from_dircache(mocker):
+    fs = DummyTestFS()
+    fs.ls("top_level/second_level/")
+    spy = mocker.spy(fs, "ls")
+    info = fs.info("top_level/second_level/date=2019-10-01")
+    assert info["type"] == "directory"
+    assert spy.call_count == 0
+    with pytest.raises(FileNotFoundError):
+        fs.info("top_level/second_level/missing")
+    fs.info("top_level/second_level/date=2019-10-01", refresh=True)
+    assert spy.call_count > 0
+
+
 @pytest.mark.parametrize(
     "dt",
     [
@@ -1297,6 +1567,37 @@ def test_readinto_with_multibyte(ftp_writable, tmpdir, dt):
     assert np.array_equal(arr, arr2)
 
 
+@pytest.mark.parametrize("cache_type", ["none", "bytes", "blockcache", "mmap"])
+def test_read_ranges(m, mocker, cache_type):
+    m.pipe("/afile", data)
+    spy = mocker.spy(m, "cat_ranges")
+    f = AbstractBufferedFile(m, "/afile", block_size=100, cache_type=cache_type)
+    f.seek(5)
+    ranges = [(10, 20), (15, 30), (500, 520), (-4, None), (None, 3), (10**6, None)]
+    out = f.read_ranges(ranges)
+    assert out == [data[10:20], data[15:30], data[500:520], data[-4:], data[:3], b""]
+    assert spy.call_count == 1
+    assert f.tell() == 5
+    f.mode = "wb"
+    with pytest.raises(ValueError):
+        f.read_ranges(ranges)
+
+
+@pytest.mark.parametrize("cache_type", ["none", "bytes", "blockcache", "mmap", "all"])
+def test_readinto_cache(m, cache_type):
+    arr = np.arange(1000, dtype="int32")
+    m.pipe("/arr", arr.tobytes())
+    f = AbstractBufferedFile(m, "/arr", block_size=300, cache_type=cache_type)
+    f.seek(400)
+    arr2 = np.zeros(500, dtype="int32")
+    assert f.readinto(arr2) == 2000
+    assert (arr2 == arr[100:600]).all()
+    assert f.tell() == 2400
+    assert f.readinto(arr2) == 1600
+    assert (arr2[:400] == arr[600:]).all()
+    assert f.readinto(arr2) == 0
+
+
 class DummyOpenFS(DummyTestFS):
     blocksize = 10
 
@@ -1541,6 +1842,78 @@ def test_glob_posix_rules(path, expected, glob_fs):
         assert info == glob_fs[name]
 
 
+@pytest.mark.parametrize(
+    GLOB_POSIX_TESTS["argnames"],
+    GLOB_POSIX_TESTS["argvalues"],
+)
+def test_iglob_posix_rules(path, expected, glob_fs):
+    assert sorted(glob_fs.iglob(path=f"mock://{path}")) == glob_fs.glob(
+        path=f"mock://{path}"
+    )
+    detailed = dict(glob_fs.iglob(path=f"mock://{path}", detail=True, withdirs=False))
+    assert detailed == glob_fs.glob(path=f"mock://{path}", detail=True, withdirs=False)
+
+
+def test_ifind_iglob_early_stop(mocker):
+    fs = DummyTestFS()
+    assert sorted(fs.ifind("")) == fs.find("")
+    assert sorted(fs.ifind("", withdirs=True)) == fs.find("", withdirs=True)
+    assert dict(fs.ifind("top_level", detail=True)) == fs.find("top_level", detail=True)
+    assert list(fs.ifind("misc/foo.txt")) == ["misc/foo.txt"]
+
+    spy = mocker.spy(fs, "ls")
+    it = fs.ifind("")
+    assert next(it) == "misc/foo.txt"
+    it.close()
+    # "" and "misc" only
+    assert spy.call_count == 2
+
+    # only directories which may match are listed
+    spy.reset_mock()
+    pattern = "top_level/*/date=2019-10-0[12]/*.parquet"
+    out = sorted(fs.iglob(pattern))
+    listed = [c.args[0] for c in spy.call_args_list]
+    assert out == fs.glob(pattern)
+    assert "misc" not in listed
+    assert "top_level/second_level/date=2019-10-04" not in listed
+
+
+def test_glob_prunes_listing(mocker):
+    fs = DummyTestFS()
+    spy = mocker.spy(fs, "ls")
+    assert fs.glob("*/*/date=2019-10-0[12]/*.parquet") == [
+        "top_level/second_level/date=2019-10-01/a.parquet",
+        "top_level/second_level/date=2019-10-01/b.parquet",
+        "top_level/second_level/date=2019-10-02/a.parquet",
+    ]
+    assert [c.args[0] for c in spy.call_args_list] == [
+        "",
+        "misc",
+        "top_level",
+        "top_level/second_level",
+        "top_level/second_level/date=2019-10-01",
+        "top_level/second_level/date=2019-10-02",
+    ]
+
+
+def test_glob_prunes_listing_workers():
+    fs = SlowListingFS(skip_instance_cache=True)
+    pattern = "*/*/date=2019-10-0[12]/*.parquet"
+    assert fs.glob(pattern, workers=4) == fs.glob(pattern)
+    # both times, only the directories which may match
+    assert sorted(fs.listed) == sorted(
+        [
+            "",
+            "misc",
+            "top_level",
+            "top_level/second_level",
+            "top_level/second_level/date=2019-10-01",
+            "top_level/second_level/date=2019-10-02",
+        ]
+        * 2
+    )
+
+
 @pytest.fixture(scope="function")
 def tmpfs(tmpdir):
     get_files(tmpdir)
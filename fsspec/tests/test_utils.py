@@ -450,6 +450,36 @@ def test_merge_offset_ranges(max_gap, max_block):
     assert expect_ends == result_ends
 
 
+def test_merge_offset_ranges_index():
+    paths = ["foo", "bar", "bar", "bar", "foo", "bar"]
+    starts = [0, 0, 512, 64, 32, 100]
+    ends = [32, 32, 1024, 256, 64, 200]
+    out = merge_offset_ranges(paths, starts, ends, max_gap=32, return_index=True)
+    assert out == (
+        ["bar", "bar", "foo"],
+        [0, 512, 0],
+        [256, 1024, 64],
+        [(2, 0), (0, 0), (1, 0), (0, 64), (2, 32), (0, 100)],
+    )
+
+    # duplicates are kept once
+    out = merge_offset_ranges(["a", "a"], [0, 0], [10, 10], return_index=True)
+    assert out == (["a"], [0], [10], [(0, 0), (0, 0)])
+
+    # open-ended ranges swallow later ones
+    out = merge_offset_ranges(
+        ["a", "a", "a"], [5, 0, 20], [None, 10, 30], return_index=True
+    )
+    assert out == (["a"], [0], [None], [(0, 5), (0, 0), (0, 20)])
+
+    assert merge_offset_ranges(["a"], [None], [5], return_index=True) == (
+        ["a"],
+        [None],
+        [5],
+        [(0, 0)],
+    )
+
+
 def test_size():
     f = io.BytesIO(b"hello")
     assert fsspec.utils.file_size(f) == 5
@@ -542,13 +542,24 @@ def merge_offset_ranges(
     max_gap: int = 0,
     max_block: int | None = None,
     sort: bool = True,
-) -> tuple[list[str], list[int], list[int]]:
+    return_index: bool = False,
+) -> (
+    tuple[list[str], list[int], list[int]]
+    | tuple[list[str], list[int], list[int], list[tuple[int, int]]]
+):
     """Merge adjacent byte-offset ranges when the inter-range
     gap is <= `max_gap`, and when the merged byte range does not
     exceed `max_block` (if specified). By default, this function
     will re-order the input paths and byte ranges to ensure sorted
     order. If the user can guarantee that the inputs are already
     sorted, passing `sort=False` will skip the re-ordering.
+
+    Ranges contained within another range for the same path are dropped.
+    An end of None means "to the end of the file".
+
+    If `return_index` is True, a fourth list is returned which gives, for
+    each input range in its original order, a tuple of the index of the
+    merged range it falls in, and its start offset within that range.
     """
     # Check input
     if not isinstance(paths, list):
@@ -562,57 +573,61 @@ def merge_offset_ranges(
 
     # Early Return
     if len(starts) <= 1:
+        if return_index:
+            return paths, starts, ends, [(0, 0)] * len(paths)
         return paths, starts, ends
 
     starts = [s or 0 for s in starts]
-    # Sort by paths and then ranges if `sort=True`
+    order: Iterable[int]
     if sort:
-        paths, starts, ends = (
-            list(v)
-            for v in zip(
-                *sorted(
-                    zip(paths, starts, ends),
-                )
-            )
+        # Sort by path, then start, with the largest range first for equal
+        # starts, so that containment only needs checking against the block
+        # currently being built
+        order = sorted(
+            range(len(paths)),
+            key=lambda i: (
+                paths[i],
+                starts[i],
+                -math.inf if ends[i] is None else -ends[i],
+            ),
         )
-    remove = []
-    for i, (path, start, end) in enumerate(zip(paths, starts, ends)):
-        if any(
-            e is not None and p == path and start >= s and end <= e and i != i2
-            for i2, (p, s, e) in enumerate(zip(paths, starts, ends))
-        ):
-            remove.append(i)
-    paths = [p for i, p in enumerate(paths) if i not in remove]
-    starts = [s for i, s in enumerate(starts) if i not in remove]
-    ends = [e for i, e in enumerate(ends) if i not in remove]
-
-    if paths:
-        # Loop through the coupled `paths`, `starts`, and
-        # `ends`, and merge adjacent blocks when appropriate
-        new_paths = paths[:1]
-        new_starts = starts[:1]
-        new_ends = ends[:1]
-        for i in range(1, len(paths)):
-            if paths[i] == paths[i - 1] and new_ends[-1] is None:
+    else:
+        order = range(len(paths))
+
+    new_paths: list[str] = []
+    new_starts: list[int] = []
+    new_ends: list[Any] = []
+    index: list[tuple[int, int]] = [(0, 0)] * len(paths)
+    for i in order:
+        path, start, end = paths[i], starts[i], ends[i]
+        if new_paths and new_paths[-1] == path:
+            block_start, block_end = new_starts[-1], new_ends[-1]
+            if block_end is None or (
+                start >= block_start and end is not None and end <= block_end
+            ):
+                # Contained in the current block
+                index[i] = (len(new_paths) - 1, start - block_start)
                 continue
-            elif (
-                paths[i] != paths[i - 1]
-                or ((starts[i] - new_ends[-1]) > max_gap)
-                or (max_block is not None and (ends[i] - new_starts[-1]) > max_block)
+            if start == block_start or (
+                start - block_end <= max_gap
+                and (
+                    max_block is None
+                    or (end is not None and end - block_start <= max_block)
+                )
             ):
-                # Cannot merge with previous block.
-                # Add new `paths`, `starts`, and `ends` elements
-                new_paths.append(paths[i])
-                new_starts.append(starts[i])
-                new_ends.append(ends[i])
-            else:
-                # Merge with the previous block by updating the
-                # last element of `ends`
-                new_ends[-1] = ends[i]
-        return new_paths, new_starts, new_ends
+                # Contains or can be merged with the current block
+                new_ends[-1] = end
+                index[i] = (len(new_paths) - 1, start - block_start)
+                continue
+        # Cannot merge with previous block: start a new one
+        new_paths.append(path)
+        new_starts.append(start)
+        new_ends.append(end)
+        index[i] = (len(new_paths) - 1, 0)
 
-    # `paths` is empty. Just return input lists
-    return paths, starts, ends
+    if return_index:
+        return new_paths, new_starts, new_ends, index
+    return new_paths, new_starts, new_ends
 
 
 def file_size(filelike: IO[bytes]) -> int:
@@ -755,3 +770,37 @@ def glob_translate(pat):
             results.append(any_sep)
     res = "".join(results)
     return rf"(?s:{res})\Z"
+
+
+def glob_dir_filter(pat):
+    """Make a test of whether a directory may contain matches for a glob
+
+    The returned function takes a directory path, and is False only if no
+    path below that directory can match ``pat``, component by component, so
+    that a traversal need not list it.
+    """
+    if os.path.altsep:
+        seps = os.path.sep + os.path.altsep
+    else:
+        seps = os.path.sep
+    any_sep = f"[{''.join(map(re.escape, seps))}]"
+    parts = re.split(any_sep, pat)
+    if parts and parts[-1] == "":
+        # trailing separator: only directories match, not their contents
+        parts.pop()
+    matchers = [
+        None if part == "**" else re.compile(glob_translate(part)).match
+        for part in parts
+    ]
+
+    def may_contain(path):
+        components = re.split(any_sep, path.rstrip(seps))
+        for comp, match in zip(components, matchers):
+            if match is None:
+                # "**" matches any number of levels
+                return True
+            if not match(comp):
+                return False
+        return len(components) < len(matchers)
+
+    return may_contain